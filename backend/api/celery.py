@@ -1,8 +1,30 @@
 import os
 from celery import Celery
+from kombu import Queue
 
 os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api.settings")
 app = Celery("api")
 app.config_from_object("django.conf:settings", namespace="CELERY")
-app.autodiscover_tasks()
 
+# ---------- Queues ----------
+# "interactive": work a user is waiting on (resume parsing, per-user recompute).
+# "bulk": job fan-out and rebuilds. Run separate workers per queue so a large
+# import can never starve an upload, e.g.
+#   celery -A api worker -Q interactive --concurrency 4 --prefetch-multiplier 1
+#   celery -A api worker -Q bulk --concurrency 2 --prefetch-multiplier 8
+INTERACTIVE_QUEUE = os.getenv("CELERY_INTERACTIVE_QUEUE", "interactive")
+BULK_QUEUE = os.getenv("CELERY_BULK_QUEUE", "bulk")
+
+# Priorities follow the Redis transport convention: 0 is served first.
+app.conf.task_queues = (Queue(INTERACTIVE_QUEUE), Queue(BULK_QUEUE))
+app.conf.task_default_queue = BULK_QUEUE
+app.conf.task_default_priority = 5
+app.conf.task_routes = {
+    "core.tasks.parse_resume_if_needed": {"queue": INTERACTIVE_QUEUE, "priority": 0},
+    "core.tasks.compute_match_scores_for_user": {"queue": INTERACTIVE_QUEUE, "priority": 0},
+    "core.tasks.compute_match_scores_for_job": {"queue": BULK_QUEUE, "priority": 6},
+    "core.tasks.rebuild_*": {"queue": BULK_QUEUE, "priority": 9},
+    "core.tasks.archive_expired_jobs": {"queue": BULK_QUEUE, "priority": 9},
+}
+
+app.autodiscover_tasks()
@@ -24,6 +24,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.instrumentation.QueryMetricsMiddleware",
 ]
 
 ROOT_URLCONF = "api.urls"
@@ -50,19 +51,65 @@ DATABASES = {
     }
 }
 
+# Connection reuse, set per tier on each service (web / worker):
+#   DB_POOL=1  psycopg's built-in pool (best fit for ASGI and threaded servers)
+#   DB_POOL=0  persistent connections kept DB_CONN_MAX_AGE seconds, checked before reuse
+DB_POOL = os.getenv("DB_POOL", "0") == "1"
+if DB_POOL:
+    DATABASES["default"]["OPTIONS"] = {"pool": {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),  # max wait for a free connection
+    }}
+else:
+    DATABASES["default"]["CONN_MAX_AGE"] = int(os.getenv("DB_CONN_MAX_AGE", "60"))
+    DATABASES["default"]["CONN_HEALTH_CHECKS"] = True
+
+# Read replicas (core.routing): listing/detail reads and bulk scoring scans go
+# to DB_REPLICA_HOSTS (comma-separated; same credentials, DB_REPLICA_NAME
+# defaults to DB_NAME). A user's reads stay on the primary for
+# DB_REPLICA_STICKY_SECONDS after an upload, upgrade or score recompute.
+DATABASE_ROUTERS = ["core.routing.ReplicaRouter"]
+DATABASE_REPLICAS = []
+for i, host in enumerate(h.strip() for h in os.getenv("DB_REPLICA_HOSTS", "").split(",") if h.strip()):
+    alias = os.getenv("DB_REPLICA_ALIAS", "replica") + (f"_{i + 1}" if i else "")
+    DATABASES[alias] = {**DATABASES["default"], "HOST": host, "TEST": {"MIRROR": "default"},
+                        "NAME": os.getenv("DB_REPLICA_NAME", DATABASES["default"]["NAME"])}
+    DATABASE_REPLICAS.append(alias)
+DB_REPLICA_STICKY_SECONDS = int(os.getenv("DB_REPLICA_STICKY_SECONDS", "15"))
+
+# Hash-partition MatchScore by user into this many tables when migrating
+# (core.partitions; 0 keeps one table, `manage.py partition_matchscores` converts later)
+MATCHSCORE_PARTITIONS = int(os.getenv("MATCHSCORE_PARTITIONS", "0"))
+
 AUTH_USER_MODEL = "core.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.tokens.PremiumClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.AllowAny",),
 }
+# FAST_JSON=1: orjson renderer/parser (same output; falls back to DRF's if orjson is missing)
+if os.getenv("FAST_JSON", "0") == "1":
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = (
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = (
+        "core.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    )
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=6),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
+    "TOKEN_OBTAIN_SERIALIZER": "core.tokens.PremiumTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "core.tokens.PremiumTokenRefreshSerializer",
 }
+# Embed is_premium + a token version in access tokens so gating needs no user lookup
+JWT_PREMIUM_CLAIMS = os.getenv("JWT_PREMIUM_CLAIMS", "0") == "1"
 
 CORS_ALLOW_ALL_ORIGINS = True  # dev only
 
@@ -93,9 +140,78 @@ if CELERY_BROKER == "sqs":
     }
 else:
     CELERY_BROKER_URL = os.getenv("REDIS_URL", "redis://localhost:6379/0")
+    # Honour per-task priorities within a queue (see api/celery.py routes)
+    CELERY_BROKER_TRANSPORT_OPTIONS = {
+        "priority_steps": list(range(10)),
+        "sep": ":",
+        "queue_order_strategy": "priority",
+    }
 
 CELERY_RESULT_BACKEND = os.getenv("REDIS_URL", "redis://localhost:6379/0")
 CELERY_TASK_ALWAYS_EAGER = os.getenv("CELERY_EAGER", "0") == "1"  # for tests
+# Workers reserve one message at a time unless overridden per worker
+# (celery worker --prefetch-multiplier N), so priorities aren't defeated by prefetch.
+CELERY_WORKER_PREFETCH_MULTIPLIER = int(os.getenv("CELERY_PREFETCH_MULTIPLIER", "1"))
+
+# ---------- Cache ----------
+# Shared across web and worker processes (task locks etc.); local memory for tests
+if CELERY_TASK_ALWAYS_EAGER:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+else:
+    CACHES = {"default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL", "redis://localhost:6379/0"),
+    }}
+# Seconds a crashed task's per-user/per-job lock outlives it; running tasks keep re-extending theirs
+TASK_LOCK_TTL = int(os.getenv("TASK_LOCK_TTL", "900"))
+# Rows per keyset page when scoring tasks stream jobs/resumes
+SCORING_PAGE_SIZE = int(os.getenv("SCORING_PAGE_SIZE", "2000"))
+# Resume texts loaded at once while a scoring pass walks the users
+SCORING_TEXT_CHUNK = int(os.getenv("SCORING_TEXT_CHUNK", "100"))
+# Seconds between checks for catalog changes by the in-process snapshot
+CATALOG_REFRESH_INTERVAL = float(os.getenv("CATALOG_REFRESH_INTERVAL", "1.0"))
+# Optional snapshot file (built by `manage.py build_catalog`), mmapped by every process.
+# Celery workers rewrite it after job changes, so it must live on storage every
+# web and worker host shares (e.g. one volume); leave it empty otherwise.
+CATALOG_SNAPSHOT_PATH = os.getenv("CATALOG_SNAPSHOT_PATH", "")
+# Filtered facet counts look at this many matching jobs at most (then "approximate")
+FACET_SCAN_LIMIT = int(os.getenv("FACET_SCAN_LIMIT", "5000"))
+# Periodic full recount of FacetCount (celery beat), seconds
+CELERY_BEAT_SCHEDULE = {
+    "rebuild-facet-counts": {
+        "task": "core.tasks.rebuild_facet_counts",
+        "schedule": float(os.getenv("FACET_REBUILD_INTERVAL", "3600")),
+    },
+    "archive-expired-jobs": {
+        "task": "core.tasks.archive_expired_jobs",
+        "schedule": float(os.getenv("JOB_ARCHIVE_INTERVAL", "3600")),
+    },
+}
+# Job lifecycle (core.lifecycle): jobs without a feed expiry expire this many
+# days after posting (0 = never); expired jobs move to ArchivedJob in batches
+JOB_MAX_AGE_DAYS = int(os.getenv("JOB_MAX_AGE_DAYS", "0"))
+JOB_ARCHIVE_BATCH_SIZE = int(os.getenv("JOB_ARCHIVE_BATCH_SIZE", "500"))
+SCORE_PURGE_CHUNK = int(os.getenv("SCORE_PURGE_CHUNK", "5000"))
+
+# Resume parsing (core.parsing): worker processes per web/Celery process
+# (0 = parse in-process, no limits), per-document wall-time and RSS limits,
+# and documents a worker handles before it is replaced. PARSER_WORKERS is a
+# per-process limit: a host can run PARSER_WORKERS x (gunicorn workers +
+# Celery pool processes) parsers of up to PARSER_MAX_RSS_MB each.
+PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", "2"))
+PARSER_TIMEOUT_SECONDS = float(os.getenv("PARSER_TIMEOUT_SECONDS", "20"))
+PARSER_MAX_RSS_MB = int(os.getenv("PARSER_MAX_RSS_MB", "512"))
+PARSER_MAX_DOCS_PER_WORKER = int(os.getenv("PARSER_MAX_DOCS_PER_WORKER", "50"))
+
+# ---------- ASGI ----------
+# ASGI=1: gunicorn runs uvicorn workers on api.asgi (see gunicorn.conf.py) and
+# the job read endpoints use the async views in core.async_views
+ASYNC_VIEWS = os.getenv("ASGI", "0") == "1"
+# Score-progress events (SSE at /api/events/scores/): Redis pub/sub between
+# workers and web processes; None uses the in-process broker (eager/tests)
+EVENTS_REDIS_URL = None if CELERY_TASK_ALWAYS_EAGER else os.getenv("REDIS_URL", "redis://localhost:6379/0")
+# Longest a score-events stream stays open (seconds)
+SCORE_EVENTS_TIMEOUT = int(os.getenv("SCORE_EVENTS_TIMEOUT", "300"))
 
 # ---------- Stripe ----------
 STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY", "")
@@ -105,3 +221,16 @@ FRONTEND_BASE_URL = os.getenv("FRONTEND_BASE_URL", "http://localhost:5173")
 
 # Optional: premium visibility toggle (per spec)
 SHOW_MATCH_TO_FREE = os.getenv("SHOW_MATCH_TO_FREE", "0") == "1"
+
+# ---------- Instrumentation ----------
+# /api/metrics/ and /api/health/db/ require "Authorization: Bearer <METRICS_TOKEN>"; unset, only with DEBUG
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        # One JSON line per request/task: query count, SQL ms, Python ms, bytes
+        "jobhack.perf": {"handlers": ["console"], "level": os.getenv("PERF_LOG_LEVEL", "INFO"), "propagate": False},
+    },
+}
@@ -30,6 +30,7 @@ MIDDLEWARE = [
     "django.contrib.auth.middleware.AuthenticationMiddleware",
     "django.contrib.messages.middleware.MessageMiddleware",
     "django.middleware.clickjacking.XFrameOptionsMiddleware",
+    "core.instrumentation.QueryMetricsMiddleware",
 ]
 
 ROOT_URLCONF = "api.urls"
@@ -51,15 +52,30 @@ AUTH_USER_MODEL = "core.User"
 
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": (
-        "rest_framework_simplejwt.authentication.JWTAuthentication",
+        "core.tokens.PremiumClaimsJWTAuthentication",
     ),
     "DEFAULT_PERMISSION_CLASSES": ("rest_framework.permissions.AllowAny",),
 }
+# FAST_JSON=1: orjson renderer/parser (same output; falls back to DRF's if orjson is missing)
+if os.getenv("FAST_JSON", "0") == "1":
+    REST_FRAMEWORK["DEFAULT_RENDERER_CLASSES"] = (
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    )
+    REST_FRAMEWORK["DEFAULT_PARSER_CLASSES"] = (
+        "core.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    )
 
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(hours=6),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=7),
+    "TOKEN_OBTAIN_SERIALIZER": "core.tokens.PremiumTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "core.tokens.PremiumTokenRefreshSerializer",
 }
+# Embed is_premium + a token version in access tokens so gating needs no user lookup
+JWT_PREMIUM_CLAIMS = os.getenv("JWT_PREMIUM_CLAIMS", "0") == "1"
 
 CORS_ALLOW_ALL_ORIGINS = True
 
@@ -92,12 +108,77 @@ if USE_REDIS:
     CELERY_BROKER_URL = os.getenv("REDIS_URL")
     CELERY_RESULT_BACKEND = os.getenv("REDIS_URL")
     CELERY_TASK_ALWAYS_EAGER = False
+    CELERY_BROKER_TRANSPORT_OPTIONS = {
+        "priority_steps": list(range(10)),
+        "sep": ":",
+        "queue_order_strategy": "priority",
+    }
+    CELERY_WORKER_PREFETCH_MULTIPLIER = int(os.getenv("CELERY_PREFETCH_MULTIPLIER", "1"))
 else:
     # Safe defaults for web dyno without Redis
     CELERY_BROKER_URL = "memory://"
     CELERY_RESULT_BACKEND = "cache+memory://"
     CELERY_TASK_ALWAYS_EAGER = True
 
+# Cache - shared Redis when available so task locks work across processes
+if USE_REDIS:
+    CACHES = {"default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.getenv("REDIS_URL"),
+    }}
+else:
+    CACHES = {"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+# Seconds a crashed task's per-user/per-job lock outlives it; running tasks keep re-extending theirs
+TASK_LOCK_TTL = int(os.getenv("TASK_LOCK_TTL", "900"))
+# Rows per keyset page when scoring tasks stream jobs/resumes
+SCORING_PAGE_SIZE = int(os.getenv("SCORING_PAGE_SIZE", "2000"))
+# Resume texts loaded at once while a scoring pass walks the users
+SCORING_TEXT_CHUNK = int(os.getenv("SCORING_TEXT_CHUNK", "100"))
+# Seconds between checks for catalog changes by the in-process snapshot
+CATALOG_REFRESH_INTERVAL = float(os.getenv("CATALOG_REFRESH_INTERVAL", "1.0"))
+# Optional snapshot file (built by `manage.py build_catalog`), mmapped by every process.
+# Celery workers rewrite it after job changes, so it must live on storage every
+# web and worker host shares (e.g. one volume); leave it empty otherwise.
+CATALOG_SNAPSHOT_PATH = os.getenv("CATALOG_SNAPSHOT_PATH", "")
+# Filtered facet counts look at this many matching jobs at most (then "approximate")
+FACET_SCAN_LIMIT = int(os.getenv("FACET_SCAN_LIMIT", "5000"))
+# Periodic full recount of FacetCount (celery beat), seconds
+CELERY_BEAT_SCHEDULE = {
+    "rebuild-facet-counts": {
+        "task": "core.tasks.rebuild_facet_counts",
+        "schedule": float(os.getenv("FACET_REBUILD_INTERVAL", "3600")),
+    },
+    "archive-expired-jobs": {
+        "task": "core.tasks.archive_expired_jobs",
+        "schedule": float(os.getenv("JOB_ARCHIVE_INTERVAL", "3600")),
+    },
+}
+# Job lifecycle (core.lifecycle): jobs without a feed expiry expire this many
+# days after posting (0 = never); expired jobs move to ArchivedJob in batches
+JOB_MAX_AGE_DAYS = int(os.getenv("JOB_MAX_AGE_DAYS", "0"))
+JOB_ARCHIVE_BATCH_SIZE = int(os.getenv("JOB_ARCHIVE_BATCH_SIZE", "500"))
+SCORE_PURGE_CHUNK = int(os.getenv("SCORE_PURGE_CHUNK", "5000"))
+
+# Resume parsing (core.parsing): worker processes per web/Celery process
+# (0 = parse in-process, no limits), per-document wall-time and RSS limits,
+# and documents a worker handles before it is replaced. PARSER_WORKERS is a
+# per-process limit: a host can run PARSER_WORKERS x (gunicorn workers +
+# Celery pool processes) parsers of up to PARSER_MAX_RSS_MB each.
+PARSER_WORKERS = int(os.getenv("PARSER_WORKERS", "2"))
+PARSER_TIMEOUT_SECONDS = float(os.getenv("PARSER_TIMEOUT_SECONDS", "20"))
+PARSER_MAX_RSS_MB = int(os.getenv("PARSER_MAX_RSS_MB", "512"))
+PARSER_MAX_DOCS_PER_WORKER = int(os.getenv("PARSER_MAX_DOCS_PER_WORKER", "50"))
+
+# ---------- ASGI ----------
+# ASGI=1: gunicorn runs uvicorn workers on api.asgi (see gunicorn.conf.py) and
+# the job read endpoints use the async views in core.async_views
+ASYNC_VIEWS = os.getenv("ASGI", "0") == "1"
+# Score-progress events (SSE at /api/events/scores/): Redis pub/sub between
+# workers and web processes; None uses the in-process broker (eager/tests)
+EVENTS_REDIS_URL = os.getenv("REDIS_URL") if USE_REDIS else None
+# Longest a score-events stream stays open (seconds)
+SCORE_EVENTS_TIMEOUT = int(os.getenv("SCORE_EVENTS_TIMEOUT", "300"))
+
 # Stripe Configuration
 STRIPE_SECRET_KEY = os.getenv("STRIPE_SECRET_KEY", "")
 STRIPE_PRICE_ID = os.getenv("STRIPE_PRICE_ID", "")
@@ -119,8 +200,48 @@ if not DATABASE_URL:
         "DATABASE_URL is not set. Link the Postgres service to this service in Render."
     )
 
+# Connection reuse per tier: DB_POOL=1 for psycopg's pool, else persistent
+# connections (DB_CONN_MAX_AGE seconds) with health checks
+DB_POOL = os.getenv("DB_POOL", "0") == "1"
 DATABASES = {
     "default": dj_database_url.parse(
-        DATABASE_URL, conn_max_age=600, ssl_require=True
+        DATABASE_URL,
+        conn_max_age=0 if DB_POOL else int(os.getenv("DB_CONN_MAX_AGE", "600")),
+        conn_health_checks=not DB_POOL,
+        ssl_require=True,
     )
 }
+if DB_POOL:
+    DATABASES["default"].setdefault("OPTIONS", {})["pool"] = {
+        "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+        "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+        "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+    }
+
+# Read replicas (core.routing): DB_REPLICA_URLS is a comma-separated list of
+# database URLs, each getting the primary's connection settings
+DATABASE_ROUTERS = ["core.routing.ReplicaRouter"]
+DATABASE_REPLICAS = []
+for i, url in enumerate(u.strip() for u in os.getenv("DB_REPLICA_URLS", "").split(",") if u.strip()):
+    alias = os.getenv("DB_REPLICA_ALIAS", "replica") + (f"_{i + 1}" if i else "")
+    replica = dj_database_url.parse(url, conn_max_age=DATABASES["default"]["CONN_MAX_AGE"],
+                                    conn_health_checks=not DB_POOL, ssl_require=True)
+    replica["OPTIONS"] = {**replica.get("OPTIONS", {}), **DATABASES["default"].get("OPTIONS", {})}
+    replica["TEST"] = {"MIRROR": "default"}
+    DATABASES[alias] = replica
+    DATABASE_REPLICAS.append(alias)
+DB_REPLICA_STICKY_SECONDS = int(os.getenv("DB_REPLICA_STICKY_SECONDS", "15"))
+MATCHSCORE_PARTITIONS = int(os.getenv("MATCHSCORE_PARTITIONS", "0"))
+
+# ---------- Instrumentation ----------
+# /api/metrics/ and /api/health/db/ require "Authorization: Bearer <METRICS_TOKEN>"; unset, only with DEBUG
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+LOGGING = {
+    "version": 1,
+    "disable_existing_loggers": False,
+    "handlers": {"console": {"class": "logging.StreamHandler"}},
+    "loggers": {
+        # One JSON line per request/task: query count, SQL ms, Python ms, bytes
+        "jobhack.perf": {"handlers": ["console"], "level": os.getenv("PERF_LOG_LEVEL", "INFO"), "propagate": False},
+    },
+}
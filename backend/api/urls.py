@@ -1,11 +1,18 @@
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
-from core.views import health, register, upgrade, resume_upload, jobs_list, job_detail, create_checkout, stripe_webhook
+from core.views import health, db_health, metrics, register, upgrade, resume_upload, score_status, jobs_list, jobs_batch, jobs_facets, job_suggest, job_detail, create_checkout, stripe_webhook
+
+if settings.ASYNC_VIEWS:
+    # Same endpoints served by async views (use under an ASGI server)
+    from core.async_views import jobs_list, job_detail, score_events  # noqa: F811
 
 urlpatterns = [
     path("admin/", admin.site.urls),
     path("api/health/", health),
+    path("api/health/db/", db_health),
+    path("api/metrics/", metrics),
 
     # Auth
     path("api/auth/register/", register),
@@ -15,12 +22,20 @@ urlpatterns = [
 
     # Resumes
     path("api/resumes/upload/", resume_upload),
+    path("api/scores/status/", score_status),
 
     # Jobs
     path("api/jobs/", jobs_list),
+    path("api/jobs/batch/", jobs_batch),
+    path("api/jobs/suggest/", job_suggest),
+    path("api/jobs/facets/", jobs_facets),
     path("api/jobs/<int:pk>/", job_detail),
 
     # Billing
     path("api/billing/checkout-session/", create_checkout),
     path("api/billing/webhook/", stripe_webhook),
 ]
+
+if settings.ASYNC_VIEWS:
+    # Score-ready stream (SSE); long-lived, so only on the ASGI stack
+    urlpatterns.append(path("api/events/scores/", score_events))
@@ -0,0 +1,12 @@
+"""
+Performance scripts. Run from backend/ against a real Postgres/Redis:
+
+    python -m benchmarks.<name> --help
+"""
+import os
+
+
+def setup():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api.settings")
+    import django
+    django.setup()
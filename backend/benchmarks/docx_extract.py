@@ -0,0 +1,107 @@
+"""
+DOCX text extraction: core.docx_text (streaming) vs python-docx's
+Document(path).paragraphs, the old extract_text_from_upload path.
+
+    pip install python-docx   # only needed for the comparison
+    python -m benchmarks.docx_extract --files 200 --lines 80
+
+Writes a corpus of synthetic resumes shaped like real exports (body
+paragraphs, a skills table, a sidebar text box, a page header) and reports
+per-file p50/p95 time, peak Python allocation (tracemalloc) for the largest
+file (python-docx's lxml tree lives in C memory tracemalloc does not see,
+so its figure is a floor), total characters extracted, and how many of the
+planted skill tokens each extractor recovers. Without python-docx only the streaming side runs.
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import tempfile
+import time
+import tracemalloc
+
+from benchmarks.suite import _minimal_docx
+
+SKILLS = ["python", "django", "postgresql", "redis", "celery", "react", "typescript", "docker",
+          "kubernetes", "aws", "terraform", "graphql", "kafka", "spark", "golang", "rust"]
+WORDS = ("led built shipped migrated designed owned scaled reduced latency cost platform team "
+         "service pipeline customers api billing search ingestion reporting").split()
+
+
+def _resume(rng, n_lines):
+    body = [" ".join(rng.choices(WORDS, k=rng.randint(6, 18))).capitalize() + "." for _ in range(n_lines)]
+    table = [(s, f"{rng.randint(1, 9)} years") for s in rng.sample(SKILLS, 6)]
+    sidebar = rng.sample([s for s in SKILLS if s not in dict(table)], 4)
+    return body, table, sidebar
+
+
+def _stdlib_extract(path):
+    from core.docx_text import docx_text
+    return docx_text(path)
+
+
+def _python_docx_extract(path):
+    from docx import Document
+    return "\n".join(p.text for p in Document(path).paragraphs)
+
+
+def _measure(fn, files, planted):
+    samples, chars, found = [], 0, 0
+    for path in files:
+        t0 = time.perf_counter()
+        text = fn(path)
+        samples.append(time.perf_counter() - t0)
+        chars += len(text)
+        lowered = text.lower()
+        found += sum(1 for s in planted[path] if s in lowered)
+    largest = max(files, key=os.path.getsize)
+    tracemalloc.start()
+    fn(largest)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    samples.sort()
+    ms = lambda s: round(s * 1000, 3)
+    return {
+        "p50_ms": ms(samples[len(samples) // 2]),
+        "p95_ms": ms(samples[min(len(samples) - 1, int(0.95 * len(samples)))]),
+        "mean_ms": ms(statistics.fmean(samples)),
+        "peak_alloc_kb_largest": round(peak / 1024, 1),
+        "chars": chars,
+        "skills_found": found,
+        "skills_planted": sum(len(v) for v in planted.values()),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--files", type=int, default=200)
+    ap.add_argument("--lines", type=int, default=80, help="body paragraphs per resume")
+    ap.add_argument("--seed", type=int, default=7)
+    args = ap.parse_args()
+
+    rng = random.Random(args.seed)
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        files, planted = [], {}
+        for i in range(args.files):
+            body, table, sidebar = _resume(rng, rng.randint(args.lines // 2, args.lines * 2))
+            path = os.path.join(tmp, f"resume{i}.docx")
+            with open(path, "wb") as f:
+                f.write(_minimal_docx(body, table=table, textbox=sidebar, header=f"Candidate {i} - Resume"))
+            files.append(path)
+            planted[path] = [s for s, _ in table] + sidebar
+        _stdlib_extract(files[0])  # warm imports
+        results["streaming"] = _measure(_stdlib_extract, files, planted)
+        try:
+            _python_docx_extract(files[0])
+        except ImportError:
+            results["python_docx"] = None
+        else:
+            results["python_docx"] = _measure(_python_docx_extract, files, planted)
+
+    print(json.dumps({"bench": "docx_extract", "files": args.files, "results": results}, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+"""
+Closed-loop HTTP load generator (stdlib asyncio, HTTP/1.1 keep-alive).
+
+Compare the sync and async stacks at 200 concurrent clients:
+
+    gunicorn --workers 2 &                 # WSGI, sync views
+    python -m benchmarks.http_load --url http://127.0.0.1:8000/api/jobs/ -c 200
+    ASGI=1 gunicorn --workers 2 &          # uvicorn workers, async views
+    python -m benchmarks.http_load --url http://127.0.0.1:8000/api/jobs/ -c 200
+
+Prints one JSON line: requests/sec, latency percentiles (ms), error count
+and mean response size.
+"""
+import argparse
+import asyncio
+import json
+import time
+from urllib.parse import urlsplit
+
+
+async def _request(reader, writer, host, path, headers):
+    head = f"GET {path} HTTP/1.1\r\nHost: {host}\r\nConnection: keep-alive\r\n"
+    head += "".join(f"{k}: {v}\r\n" for k, v in headers.items())
+    writer.write((head + "\r\n").encode())
+    await writer.drain()
+    status_line = await reader.readline()
+    status = int(status_line.split()[1])
+    length, chunked, keep_alive = 0, False, True
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        if name.lower() == "content-length":
+            length = int(value)
+        elif name.lower() == "transfer-encoding" and "chunked" in value.lower():
+            chunked = True
+        elif name.lower() == "connection" and "close" in value.lower():
+            keep_alive = False  # e.g. gunicorn sync workers
+    if not chunked:
+        await reader.readexactly(length)
+        return status, length, keep_alive
+    total = 0
+    while True:
+        size = int((await reader.readline()).strip(), 16)
+        await reader.readexactly(size + 2)
+        if size == 0:
+            return status, total, keep_alive
+        total += size
+
+
+async def _client(url, headers, deadline, latencies, sizes, errors):
+    parts = urlsplit(url)
+    path = parts.path + (f"?{parts.query}" if parts.query else "")
+    conn = None
+    while time.perf_counter() < deadline:
+        try:
+            if conn is None:
+                conn = await asyncio.open_connection(parts.hostname, parts.port or 80)
+            t0 = time.perf_counter()
+            status, size, keep_alive = await _request(*conn, parts.netloc, path, headers)
+            latencies.append(time.perf_counter() - t0)
+            if not keep_alive:
+                conn[1].close()
+                conn = None
+            sizes.append(size)
+            if status >= 400:
+                errors.append(status)
+        except (OSError, asyncio.IncompleteReadError, ValueError, IndexError) as e:
+            errors.append(type(e).__name__)
+            if conn:
+                conn[1].close()
+            conn = None
+    if conn:
+        conn[1].close()
+
+
+def _pct(sorted_vals, p):
+    if not sorted_vals:
+        return None
+    return round(1000 * sorted_vals[min(len(sorted_vals) - 1, int(p / 100.0 * len(sorted_vals)))], 2)
+
+
+async def run(url, concurrency, duration, headers):
+    latencies, sizes, errors = [], [], []
+    deadline = time.perf_counter() + duration
+    t0 = time.perf_counter()
+    await asyncio.gather(*(_client(url, headers, deadline, latencies, sizes, errors) for _ in range(concurrency)))
+    elapsed = time.perf_counter() - t0
+    latencies.sort()
+    return {
+        "bench": "http_load",
+        "url": url,
+        "concurrency": concurrency,
+        "requests": len(latencies),
+        "rps": round(len(latencies) / elapsed, 1),
+        "p50_ms": _pct(latencies, 50),
+        "p95_ms": _pct(latencies, 95),
+        "p99_ms": _pct(latencies, 99),
+        "max_ms": round(1000 * latencies[-1], 2) if latencies else None,
+        "errors": len(errors),
+        "mean_bytes": round(sum(sizes) / len(sizes)) if sizes else 0,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--url", required=True)
+    ap.add_argument("-c", "--concurrency", type=int, default=200)
+    ap.add_argument("-d", "--duration", type=float, default=30.0, help="seconds")
+    ap.add_argument("-H", "--header", action="append", default=[], help="'Name: value', repeatable")
+    args = ap.parse_args()
+    headers = dict(h.split(":", 1) for h in args.header)
+    headers = {k.strip(): v.strip() for k, v in headers.items()}
+    print(json.dumps(asyncio.run(run(args.url, args.concurrency, args.duration, headers))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+?location= filtering: the old `location__icontains` scan vs the normalized
+location_* columns (core.locations.location_filter). Runs against whatever
+catalog is loaded, so generate a large one first:
+
+    python manage.py generate_corpus --jobs 200000 --users 10 --replace
+    python -m benchmarks.location_filter --explain
+
+For each query reports the best time to fetch the first listing page and to
+count all matches on each path, how many rows only one path matches
+(icontains over-matches: "CA" also hits "Chicago"), and with --explain the
+query plans.
+"""
+import argparse
+import json
+import time
+
+from benchmarks import setup
+
+QUERIES = ["CA", "Chicago", "San Francisco", "san francisco, ca", "NY", "Remote", "Portland, OR"]
+
+
+def _best(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return round(best * 1000, 3)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--query", action="append", help="location query to test (repeatable)")
+    ap.add_argument("--page-size", type=int, default=200)
+    ap.add_argument("--repeat", type=int, default=20)
+    ap.add_argument("--explain", action="store_true", help="include each path's query plan")
+    args = ap.parse_args()
+
+    setup()
+    from django.db import connection
+    from core.locations import location_filter
+    from core.models import JobListing
+
+    jobs = JobListing.objects.order_by("-created_at")
+    paths = {
+        "icontains": lambda q: jobs.filter(location__icontains=q),
+        "normalized": lambda q: jobs.filter(location_filter(q)),
+    }
+    results = {}
+    for q in args.query or QUERIES:
+        row = {}
+        for name, build in paths.items():
+            qs = build(q)
+            row[name] = {
+                "matches": qs.count(),
+                "page_ms": _best(lambda: list(qs.values_list("id", flat=True)[:args.page_size]), args.repeat),
+                "count_ms": _best(qs.count, args.repeat),
+            }
+            if args.explain:
+                row[name]["plan"] = qs.values_list("id", flat=True)[:args.page_size].explain()
+        old, new = paths["icontains"](q), paths["normalized"](q)
+        row["only_icontains"] = old.exclude(pk__in=new.values("pk")).count()
+        row["only_normalized"] = new.exclude(pk__in=old.values("pk")).count()
+        results[q] = row
+
+    print(json.dumps({
+        "bench": "location_filter",
+        "database": connection.vendor,
+        "jobs": JobListing.objects.count(),
+        "page_size": args.page_size,
+        "results": results,
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
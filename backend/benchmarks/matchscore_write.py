@@ -0,0 +1,122 @@
+"""
+MatchScore write throughput and table/index size, PostgreSQL only.
+
+Builds three scratch tables with the same upsert workload (per-user batches
+of SCORING_PAGE_SIZE rows, like tasks._compute_for_user) and reports rows/s
+for the first load and for a full re-score (the update path), plus table and
+index bytes before and after VACUUM:
+
+    old          unique (user, job) + index (user, job) + FK indexes on user and job
+    plain        unique (user, job) + index (job)        (current schema)
+    hash         plain, hash-partitioned by user_id      (core.partitions)
+
+    python -m benchmarks.matchscore_write --users 500 --jobs 5000 --partitions 16
+
+The tables are dropped afterwards unless --keep is given. The current
+core_matchscore sizes are included too (partitions.sizes()).
+"""
+import argparse
+import json
+import random
+import time
+
+from benchmarks import setup
+
+DDL = {
+    "old": [
+        "CREATE TABLE {t} (id bigserial PRIMARY KEY, score_percentage smallint NOT NULL, "
+        "updated_at timestamptz NOT NULL, job_id bigint NOT NULL, user_id bigint NOT NULL, UNIQUE (user_id, job_id))",
+        "CREATE INDEX ON {t} (user_id, job_id)",
+        "CREATE INDEX ON {t} (user_id)",
+        "CREATE INDEX ON {t} (job_id)",
+    ],
+    "plain": [
+        "CREATE TABLE {t} (id bigserial PRIMARY KEY, score_percentage smallint NOT NULL, "
+        "updated_at timestamptz NOT NULL, job_id bigint NOT NULL, user_id bigint NOT NULL, UNIQUE (user_id, job_id))",
+        "CREATE INDEX ON {t} (job_id)",
+    ],
+    "hash": [
+        "CREATE TABLE {t} (id bigserial, score_percentage smallint NOT NULL, updated_at timestamptz NOT NULL, "
+        "job_id bigint NOT NULL, user_id bigint NOT NULL, PRIMARY KEY (user_id, id), UNIQUE (user_id, job_id)) "
+        "PARTITION BY HASH (user_id)",
+        "CREATE INDEX ON {t} (job_id)",
+    ],
+}
+
+
+def _sizes(cur, table):
+    cur.execute(
+        "SELECT coalesce(sum(pg_table_size(c.oid)), 0), coalesce(sum(pg_indexes_size(c.oid)), 0) "
+        "FROM pg_partition_tree(%s::regclass) t JOIN pg_class c ON c.oid = t.relid", [table])
+    table_bytes, index_bytes = cur.fetchone()
+    return {"table_bytes": int(table_bytes), "index_bytes": int(index_bytes)}
+
+
+def _load(cur, table, users, jobs, batch, rng):
+    """Upsert every (user, job) score in per-user batches; returns rows/s."""
+    rows = 0
+    t0 = time.perf_counter()
+    for user_id in users:
+        for start in range(0, len(jobs), batch):
+            chunk = jobs[start:start + batch]
+            values = ", ".join(["(%s, now(), %s, %s)"] * len(chunk))
+            params = [v for job_id in chunk for v in (rng.randint(0, 100), job_id, user_id)]
+            cur.execute(
+                f"INSERT INTO {table} (score_percentage, updated_at, job_id, user_id) VALUES {values} "
+                "ON CONFLICT (user_id, job_id) DO UPDATE "
+                "SET score_percentage = EXCLUDED.score_percentage, updated_at = EXCLUDED.updated_at",
+                params,
+            )
+            rows += len(chunk)
+    return round(rows / (time.perf_counter() - t0))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--users", type=int, default=500)
+    ap.add_argument("--jobs", type=int, default=5000)
+    ap.add_argument("--partitions", type=int, default=16)
+    ap.add_argument("--keep", action="store_true", help="leave the scratch tables in place")
+    args = ap.parse_args()
+
+    setup()
+    from django.conf import settings
+    from django.db import connection
+    from core import partitions
+
+    if connection.vendor != "postgresql":
+        raise SystemExit("matchscore_write needs PostgreSQL")
+    batch = getattr(settings, "SCORING_PAGE_SIZE", 2000)
+    users, jobs = list(range(1, args.users + 1)), list(range(1, args.jobs + 1))
+    results = {}
+    with connection.cursor() as cur:
+        for name, ddl in DDL.items():
+            table = f"bench_matchscore_{name}"
+            cur.execute(f"DROP TABLE IF EXISTS {table} CASCADE")
+            for stmt in ddl:
+                cur.execute(stmt.format(t=table))
+            if name == "hash":
+                for r in range(args.partitions):
+                    cur.execute(f"CREATE TABLE {table}_p{r} PARTITION OF {table} "
+                                f"FOR VALUES WITH (MODULUS {args.partitions}, REMAINDER {r})")
+            rng = random.Random(7)
+            results[name] = {"insert_rows_per_s": _load(cur, table, users, jobs, batch, rng)}
+            results[name]["update_rows_per_s"] = _load(cur, table, users, jobs, batch, rng)
+            results[name]["after_update"] = _sizes(cur, table)
+            cur.execute(f"VACUUM {table}")
+            results[name]["after_vacuum"] = _sizes(cur, table)
+            if not args.keep:
+                cur.execute(f"DROP TABLE {table} CASCADE")
+
+    print(json.dumps({
+        "bench": "matchscore_write",
+        "rows": args.users * args.jobs,
+        "batch": batch,
+        "partitions": args.partitions,
+        "results": results,
+        "core_matchscore": partitions.sizes(),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Render/parse time of a 200-item jobs_list body: DRF's stdlib JSONRenderer vs
+the orjson-backed core.renderers classes (FAST_JSON=1). No database needed;
+the listing is built in memory from the seed jobs with full descriptions.
+"""
+import argparse
+import io
+import json
+import time
+from datetime import datetime, timedelta, timezone
+
+from benchmarks import setup
+
+
+def _listing(n):
+    from core.management.commands.seed_jobs import SEED_JOBS
+    from core.models import JobListing
+    from core.serializers import JobListingSerializer
+    now = datetime.now(timezone.utc)
+    items = []
+    for i in range(n):
+        tpl = SEED_JOBS[i % len(SEED_JOBS)]
+        job = JobListing(id=i + 1, created_at=now - timedelta(minutes=i), **tpl)
+        data = JobListingSerializer(job).data
+        data.update(match_score=None, matched_keywords=[], score_hint=80, locked=True)
+        items.append(data)
+    return items
+
+
+def _best(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return round(best * 1000, 3)
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--items", type=int, default=200)
+    ap.add_argument("--repeat", type=int, default=200)
+    args = ap.parse_args()
+
+    setup()
+    from rest_framework.parsers import JSONParser
+    from rest_framework.renderers import JSONRenderer
+    from core.renderers import ORJSONRenderer, ORJSONParser, orjson
+
+    body = _listing(args.items)
+    std, fast = JSONRenderer().render(body), ORJSONRenderer().render(body)
+    report = {
+        "bench": "render_json",
+        "items": args.items,
+        "bytes": len(std),
+        "orjson_installed": orjson is not None,
+        "identical_bytes": std == fast,
+        "render_ms": {"stdlib": _best(lambda: JSONRenderer().render(body), args.repeat),
+                      "orjson": _best(lambda: ORJSONRenderer().render(body), args.repeat)},
+        "parse_ms": {"stdlib": _best(lambda: JSONParser().parse(io.BytesIO(std)), args.repeat),
+                     "orjson": _best(lambda: ORJSONParser().parse(io.BytesIO(std)), args.repeat)},
+    }
+    print(json.dumps(report))
+
+
+if __name__ == "__main__":
+    main()
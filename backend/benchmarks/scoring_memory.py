@@ -0,0 +1,81 @@
+"""
+Worker memory while scoring a large catalog.
+
+Generates --jobs listings (tagged so they can be removed afterwards), then runs
+the per-user and per-job scoring passes in-process and reports wall time plus
+peak Python allocations (tracemalloc) and process RSS growth. With keyset
+paging the peak should track SCORING_PAGE_SIZE, not the catalog size.
+"""
+import argparse
+import json
+import resource
+import time
+import tracemalloc
+import uuid
+
+from benchmarks import setup
+
+
+def _rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024.0
+
+
+def _measure(fn):
+    rss0 = _rss_mb()
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"seconds": round(elapsed, 2), "py_peak_mb": round(peak / 2**20, 1),
+            "rss_growth_mb": round(_rss_mb() - rss0, 1)}
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--jobs", type=int, default=1_000_000)
+    ap.add_argument("--users", type=int, default=1000)
+    ap.add_argument("--keep", action="store_true")
+    args = ap.parse_args()
+
+    setup()
+    from django.conf import settings
+    from core import vocabulary
+    from core.models import User, Resume, JobListing, MatchScore
+    from core.tasks import _compute_for_user, _compute_for_job
+
+    tag = f"bench-{uuid.uuid4().hex[:8]}"
+    for start in range(0, args.jobs, 10_000):
+        vocabulary.link_jobs(JobListing.objects.bulk_create([
+            JobListing(title=f"Engineer {i}", company=tag, location="Remote", description="benchmark",
+                       keywords=["python", "django", "aws", "sql", "react", "docker"])
+            for i in range(start, min(args.jobs, start + 10_000))
+        ]))
+    users = User.objects.bulk_create([
+        User(username=f"{tag}-{i}", email=f"{tag}-{i}@example.com") for i in range(args.users)
+    ])
+    Resume.objects.bulk_create([
+        Resume(user=u, file="resumes/bench.pdf", file_format="pdf", text="python django aws engineer " * 200)
+        for u in users
+    ])
+    job_id = JobListing.objects.filter(company=tag).values_list("id", flat=True).first()
+
+    report = {
+        "bench": "scoring_memory",
+        "jobs": args.jobs,
+        "users": args.users,
+        "page_size": settings.SCORING_PAGE_SIZE,
+        "for_user": _measure(lambda: _compute_for_user(users[0].id)),
+        "for_job": _measure(lambda: _compute_for_job(job_id)),
+    }
+    print(json.dumps(report))
+
+    if not args.keep:
+        MatchScore.objects.filter(job__company=tag).delete()
+        JobListing.objects.filter(company=tag).delete()
+        User.objects.filter(username__startswith=tag).delete()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Process startup: what a web worker imports, and time to first served request.
+
+    python -m benchmarks.startup --top 20
+    python -m benchmarks.startup --cold-start --boot serve --runs 3
+
+The import report runs `python -X importtime` over what a gunicorn worker
+loads (django.setup() plus the URLconf, which imports every view) and lists
+the modules with the largest cumulative import time, plus whether the heavy
+optional libraries (PDF parsing, Stripe) were pulled in at boot.
+
+--cold-start launches boot.sh (BOOT_MODE from --boot, one gunicorn worker on
+a free local port) and measures the time until /api/health/ first answers
+200, so the cost of migrate/seed_jobs in BOOT_MODE=full shows up next to
+BOOT_MODE=serve.
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import statistics
+import subprocess
+import sys
+import time
+import urllib.request
+
+BACKEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WEB_IMPORTS = "import django; django.setup(); import api.urls"
+WATCH = ("PyPDF2", "stripe", "core.docx_text")
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def importtime(code=WEB_IMPORTS):
+    """Run `code` in a fresh interpreter under -X importtime; returns wall seconds and {module: (self_us, cumulative_us, depth)}."""
+    t0 = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=BACKEND,
+                          capture_output=True, text=True, env=os.environ.copy())
+    wall = time.perf_counter() - t0
+    if proc.returncode:
+        raise RuntimeError(proc.stderr[-2000:])
+    modules = {}
+    for m in _LINE.finditer(proc.stderr):
+        modules[m.group(4)] = (int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2)
+    return wall, modules
+
+
+def import_report(top=15):
+    wall, modules = importtime()
+    slowest = sorted(modules.items(), key=lambda kv: kv[1][1], reverse=True)[:top]
+    return {
+        "wall_ms": round(wall * 1000, 1),
+        "imports_ms": round(sum(s for s, _, _ in modules.values()) / 1000, 1),
+        "modules": len(modules),
+        "loaded_at_boot": {name: name in modules for name in WATCH},
+        "slowest_cumulative_ms": {name: round(c / 1000, 1) for name, (_, c, _) in slowest},
+    }
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def cold_start(boot="serve", timeout=120.0):
+    """Seconds from launching boot.sh until GET /api/health/ returns 200."""
+    port = _free_port()
+    env = dict(os.environ, BOOT_MODE=boot, PORT=str(port))
+    t0 = time.perf_counter()
+    proc = subprocess.Popen(["sh", "boot.sh", "--workers", "1"], cwd=BACKEND, env=env,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - t0 < timeout:
+            if proc.poll() is not None:
+                raise RuntimeError(f"boot.sh exited with {proc.returncode}")
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/api/health/", timeout=1) as r:
+                    if r.status == 200:
+                        return time.perf_counter() - t0
+            except OSError:
+                time.sleep(0.02)
+        raise RuntimeError(f"no 200 from /api/health/ within {timeout}s")
+    finally:
+        proc.terminate()
+        proc.wait()
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    ap.add_argument("--cold-start", action="store_true", help="also time boot.sh to the first 200")
+    ap.add_argument("--boot", choices=("full", "serve"), default="serve", help="BOOT_MODE for --cold-start")
+    ap.add_argument("--runs", type=int, default=3)
+    args = ap.parse_args()
+
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "api.settings")
+    report = {"bench": "startup", "imports": import_report(args.top)}
+    if args.cold_start:
+        samples = [cold_start(args.boot) for _ in range(args.runs)]
+        report["cold_start"] = {
+            "boot_mode": args.boot,
+            "runs": args.runs,
+            "median_ms": round(statistics.median(samples) * 1000, 1),
+            "min_ms": round(min(samples) * 1000, 1),
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
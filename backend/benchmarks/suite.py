@@ -0,0 +1,312 @@
+"""
+Benchmark suite over a synthetic corpus.
+
+    python manage.py generate_corpus --jobs 50000 --users 2000 --replace
+    python -m benchmarks.suite --out before.json
+    ... change things ...
+    python -m benchmarks.suite --out after.json --compare before.json
+
+Covers keyword_score (on strings and on Keyword ids), the per-user and per-job scoring passes, jobs_list
+(anonymous, free, premium, premium sort=match, sparse ?fields=, through the
+full middleware stack in-process), autocomplete, resume parsing (PDF and
+DOCX), the ATS analysis of parsed text, and a fresh web process's imports
+(-X importtime; `python -m benchmarks.startup` has the full report). Prints
+and optionally writes one JSON document; --compare exits non-zero when any
+benchmark's p50 regressed by more than --threshold.
+"""
+import argparse
+import io
+import json
+import logging
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import zipfile
+from datetime import datetime, timezone
+
+from benchmarks import setup
+
+BENCHES = ("keyword_score", "scores_for_user", "scores_for_job", "jobs_list", "suggest", "parse_resume", "startup")
+
+
+def _stats(samples, **extra):
+    samples = sorted(samples)
+    ms = lambda s: round(s * 1000, 3)
+    return {
+        "n": len(samples),
+        "mean_ms": ms(statistics.fmean(samples)),
+        "p50_ms": ms(samples[len(samples) // 2]),
+        "p95_ms": ms(samples[min(len(samples) - 1, int(0.95 * len(samples)))]),
+        "min_ms": ms(samples[0]),
+        **extra,
+    }
+
+
+def _time(fn, repeat, warmup=1):
+    for _ in range(warmup):
+        fn()
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - t0)
+    return samples
+
+
+def _minimal_pdf(text):
+    """One-page PDF with `text` in Helvetica, enough for PdfReader.extract_text()."""
+    lines = [text[i:i + 90] for i in range(0, len(text), 90)][:60]
+    esc = lambda s: s.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+    stream = "BT /F1 10 Tf 40 800 Td 12 TL " + " ".join(f"({esc(l)}) '" for l in lines) + " ET"
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        "<< /Type /Pages /Kids [3 0 R] /Count 1 >>",
+        "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] /Contents 4 0 R "
+        "/Resources << /Font << /F1 5 0 R >> >> >>",
+        f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream",
+        "<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    out, offsets = io.BytesIO(), []
+    out.write(b"%PDF-1.4\n")
+    for i, body in enumerate(objects, 1):
+        offsets.append(out.tell())
+        out.write(f"{i} 0 obj\n{body}\nendobj\n".encode("latin-1"))
+    xref = out.tell()
+    out.write(f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode())
+    out.write("".join(f"{o:010d} 00000 n \n" for o in offsets).encode())
+    out.write(f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n".encode())
+    return out.getvalue()
+
+
+_DOCX_NS = ('xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+            'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006" '
+            'xmlns:wps="http://schemas.microsoft.com/office/word/2010/wordprocessingShape"')
+
+
+def _minimal_docx(lines, table=(), textbox=(), header=""):
+    """
+    A .docx (bytes) shaped like an exported resume: `lines` as body paragraphs,
+    `table` rows as a w:tbl, `textbox` lines inside a text box (with Word's
+    mc:Fallback copy), and an optional page header.
+    """
+    esc = lambda s: s.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
+    para = lambda s: f'<w:p><w:r><w:t xml:space="preserve">{esc(s)}</w:t></w:r></w:p>'
+    body = "".join(para(l) for l in lines)
+    if table:
+        cells = lambda row: "".join(f"<w:tc>{para(c)}</w:tc>" for c in row)
+        body += "<w:tbl>" + "".join(f"<w:tr>{cells(row)}</w:tr>" for row in table) + "</w:tbl>"
+    if textbox:
+        box = "".join(para(l) for l in textbox)
+        body += ("<w:p><w:r><mc:AlternateContent><mc:Choice Requires=\"wps\"><w:drawing><wps:wsp><wps:txbx>"
+                 f"<w:txbxContent>{box}</w:txbxContent></wps:txbx></wps:wsp></w:drawing></mc:Choice>"
+                 f"<mc:Fallback><w:pict><w:txbxContent>{box}</w:txbxContent></w:pict></mc:Fallback>"
+                 "</mc:AlternateContent></w:r></w:p>")
+    parts = {
+        "[Content_Types].xml":
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/word/document.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.wordprocessingml.document.main+xml"/>'
+            '<Override PartName="/word/header1.xml" ContentType="application/'
+            'vnd.openxmlformats-officedocument.wordprocessingml.header+xml"/></Types>',
+        "_rels/.rels":
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships/officeDocument" Target="word/document.xml"/></Relationships>',
+        "word/_rels/document.xml.rels":
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/'
+            'relationships/header" Target="header1.xml"/></Relationships>',
+        "word/document.xml": f"<w:document {_DOCX_NS}><w:body>{body}<w:sectPr/></w:body></w:document>",
+        "word/header1.xml": f"<w:hdr {_DOCX_NS}>{para(header)}</w:hdr>",
+    }
+    out = io.BytesIO()
+    with zipfile.ZipFile(out, "w", zipfile.ZIP_DEFLATED) as z:
+        for name, xml in parts.items():
+            z.writestr(name, '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>' + xml)
+    return out.getvalue()
+
+
+def bench_keyword_score(ctx, repeat):
+    from core import vocabulary
+    from core.models import JobListing
+    from core.scoring import keyword_score, keyword_score_ids
+    jobs = list(JobListing.objects.order_by("id").values_list("id", "title", "keywords")[:1000])
+    terms = vocabulary.job_terms(j for j, _, _ in jobs)
+    text = ctx["resume_text"].lower()
+    vocab = vocabulary.Vocabulary.load()
+    per_call = lambda samples: [s / max(1, len(jobs)) for s in samples]
+    return {
+        "keyword_score": _stats(per_call(_time(lambda: [keyword_score(text, t, k or []) for _, t, k in jobs],
+                                               repeat)), calls_per_sample=len(jobs)),
+        # includes the one vocabulary scan per resume
+        "keyword_score_ids": _stats(per_call(_time(
+            lambda: [keyword_score_ids(text, t, terms.get(j, []), p) for p in [vocab.present(text)]
+                     for j, t, _ in jobs], repeat)), calls_per_sample=len(jobs), vocabulary=len(vocab.forms)),
+    }
+
+
+def bench_scores_for_user(ctx, repeat):
+    from core.models import JobListing
+    from core.tasks import _compute_for_user
+    jobs = JobListing.objects.count()
+    return {"scores_for_user": _stats(_time(lambda: _compute_for_user(ctx["premium"].id), repeat), jobs=jobs)}
+
+
+def bench_scores_for_job(ctx, repeat):
+    from core.models import JobListing, Resume
+    from core.tasks import _compute_for_job
+    job_id = JobListing.objects.order_by("-id").values_list("id", flat=True).first()
+    users = Resume.objects.values("user_id").distinct().count()
+    return {"scores_for_job": _stats(_time(lambda: _compute_for_job(job_id), repeat), users=users)}
+
+
+def bench_jobs_list(ctx, repeat):
+    from django.db import connections
+    from django.test import Client
+    from django.test.utils import CaptureQueriesContext
+    from core.tasks import _compute_for_user
+    from core.tokens import access_token_for
+
+    _compute_for_user(ctx["premium"].id)  # premium reads stored scores
+    cases = {
+        "jobs_list_anonymous": (None, ""),
+        "jobs_list_free": (ctx["free"], ""),
+        "jobs_list_premium": (ctx["premium"], ""),
+        "jobs_list_premium_sort_match": (ctx["premium"], "?sort=match"),
+        # sparse fieldsets: what the list page actually renders
+        "jobs_list_anonymous_sparse": (None, "?fields=title,company,location"),
+        "jobs_list_premium_sparse": (ctx["premium"], "?fields=title,company,location,match_score"),
+    }
+    results = {}
+    for name, (user, query) in cases.items():
+        headers = {"HTTP_AUTHORIZATION": f"Bearer {access_token_for(user.id)}"} if user else {}
+        client = Client(**headers)
+        url = f"/api/jobs/{query}"
+        sizes = []
+        samples = _time(lambda: sizes.append(len(client.get(url).content)), repeat)
+        with CaptureQueriesContext(connections["default"]) as queries:
+            status = client.get(url).status_code
+        results[name] = _stats(samples, status=status, bytes=sizes[-1], queries=len(queries))
+    return results
+
+
+def bench_suggest(ctx, repeat):
+    from django.test import Client
+    client = Client()
+    prefixes = ["s", "se", "sen", "senior", "eng", "re", "san f"]
+    samples = _time(lambda: [client.get(f"/api/jobs/suggest/?q={p}") for p in prefixes], repeat)
+    return {"suggest": _stats([s / len(prefixes) for s in samples], requests_per_sample=len(prefixes))}
+
+
+def bench_parse_resume(ctx, repeat):
+    from core import ats
+    from core.scoring import extract_text_from_upload
+    results = {"ats_analyze": _stats(_time(lambda: ats.analyze(ctx["resume_text"], "pdf"), repeat),
+                                     chars=len(ctx["resume_text"]))}
+    with tempfile.TemporaryDirectory() as tmp:
+        pdf = os.path.join(tmp, "resume.pdf")
+        with open(pdf, "wb") as f:
+            f.write(_minimal_pdf(ctx["resume_text"].replace("\n", " ")))
+        docx = os.path.join(tmp, "resume.docx")
+        with open(docx, "wb") as f:
+            f.write(_minimal_docx(ctx["resume_text"].splitlines()))
+        for fmt, path in (("pdf", pdf), ("docx", docx)):
+            chars = len(extract_text_from_upload(path, fmt))
+            results[f"parse_resume_{fmt}"] = _stats(_time(lambda: extract_text_from_upload(path, fmt), repeat),
+                                                   chars=chars)
+    return results
+
+
+def bench_startup(ctx, repeat):
+    """Fresh-interpreter web imports under -X importtime (see benchmarks.startup); capped at 5 runs."""
+    from benchmarks.startup import WATCH, importtime
+    runs = [importtime() for _ in range(min(repeat, 5))]
+    modules = runs[-1][1]
+    imports_us = statistics.median(sum(s for s, _, _ in m.values()) for _, m in runs)
+    return {"web_imports": _stats([wall for wall, _ in runs], imports_ms=round(imports_us / 1000, 1),
+                                  loaded_at_boot=[name for name in WATCH if name in modules])}
+
+
+def _context(prefix):
+    from core.models import User, Resume
+    users = User.objects.filter(username__startswith=f"{prefix}-", resume__isnull=False).distinct()
+    premium = users.filter(is_premium=True).order_by("id").first()
+    free = users.filter(is_premium=False).order_by("id").first()
+    if not (premium and free):
+        sys.exit(f"no generated users found; run `manage.py generate_corpus --prefix {prefix}` first")
+    text = Resume.objects.filter(user=premium).order_by("-uploaded_at").values_list("text", flat=True).first()
+    return {"premium": premium, "free": free, "resume_text": text or ""}
+
+
+def _environment():
+    from django.db import connection
+    from core.models import User, Resume, JobListing
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": commit or None,
+        "python": platform.python_version(),
+        "database": connection.vendor,
+        "corpus": {"jobs": JobListing.objects.count(), "users": User.objects.count(),
+                   "resumes": Resume.objects.count()},
+    }
+
+
+def _compare(results, baseline_path, threshold):
+    with open(baseline_path) as f:
+        baseline = json.load(f)["results"]
+    regressed = []
+    for name, stats in sorted(results.items()):
+        before = baseline.get(name)
+        if not before or not before["p50_ms"]:
+            continue
+        ratio = stats["p50_ms"] / before["p50_ms"]
+        flag = " REGRESSION" if ratio > 1 + threshold else ""
+        print(f"{name:32} {before['p50_ms']:>10.3f} -> {stats['p50_ms']:>10.3f} ms  x{ratio:.2f}{flag}",
+              file=sys.stderr)
+        if flag:
+            regressed.append(name)
+    return regressed
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    ap.add_argument("--only", action="append", choices=BENCHES, help="run just these (repeatable)")
+    ap.add_argument("--repeat", type=int, default=20, help="timed runs per benchmark")
+    ap.add_argument("--prefix", default="synthetic", help="username prefix used by generate_corpus")
+    ap.add_argument("--out", help="also write the JSON results here")
+    ap.add_argument("--compare", help="baseline JSON from an earlier run")
+    ap.add_argument("--threshold", type=float, default=0.10, help="allowed p50 slowdown (0.10 = 10%%)")
+    args = ap.parse_args()
+
+    setup()
+    from django.test.utils import setup_test_environment
+    setup_test_environment()  # test client host + in-memory email
+    logging.getLogger("jobhack.perf").setLevel(logging.WARNING)
+
+    ctx = _context(args.prefix)
+    results = {}
+    for name in args.only or BENCHES:
+        results.update(globals()[f"bench_{name}"](ctx, args.repeat))
+
+    report = {"bench": "suite", **_environment(), "repeat": args.repeat, "results": results}
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        with open(args.out, "w") as f:
+            f.write(text + "\n")
+    if args.compare and _compare(results, args.compare, args.threshold):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Upload-to-scores latency while a bulk job import is fanning out.
+
+Requires running workers for both queues (see api/celery.py). Enqueues one
+compute_match_scores_for_job per imported job, then the per-user recompute a
+resume upload triggers, and reports how long the user waited and how much of
+the bulk backlog was still outstanding when their scores landed.
+"""
+import argparse
+import json
+import time
+import uuid
+
+from benchmarks import setup
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__)
+    ap.add_argument("--jobs", type=int, default=1000, help="size of the simulated import")
+    ap.add_argument("--timeout", type=float, default=600)
+    ap.add_argument("--keep", action="store_true", help="don't delete the generated rows")
+    args = ap.parse_args()
+
+    setup()
+    from core import vocabulary
+    from core.models import User, Resume, JobListing
+    from core.tasks import compute_match_scores_for_job, compute_match_scores_for_user
+
+    tag = uuid.uuid4().hex[:8]
+    # bulk_create skips post_save, so the fan-out below is the only one
+    jobs = JobListing.objects.bulk_create([
+        JobListing(title=f"Bench Engineer {i}", company=f"bench-{tag}", location="Remote",
+                   description="benchmark", keywords=["python", "django", "aws", "sql"])
+        for i in range(args.jobs)
+    ])
+    vocabulary.link_jobs(jobs)
+    user = User.objects.create(username=f"bench-{tag}", email=f"bench-{tag}@example.com")
+    Resume.objects.create(user=user, file="resumes/bench.pdf", file_format="pdf",
+                          text="python django postgres aws engineer")
+
+    t0 = time.perf_counter()
+    bulk = [compute_match_scores_for_job.delay(j.id) for j in jobs]
+    enqueue_s = time.perf_counter() - t0
+
+    t1 = time.perf_counter()
+    compute_match_scores_for_user.delay(user.id).get(timeout=args.timeout)
+    latency_s = time.perf_counter() - t1
+    bulk_pending = sum(1 for r in bulk if not r.ready())
+
+    print(json.dumps({
+        "bench": "upload_latency",
+        "jobs": args.jobs,
+        "bulk_enqueue_s": round(enqueue_s, 3),
+        "upload_to_scores_s": round(latency_s, 3),
+        "bulk_pending_at_completion": bulk_pending,
+    }))
+
+    if not args.keep:
+        for r in bulk:
+            r.get(timeout=args.timeout)
+        JobListing.objects.filter(company=f"bench-{tag}").delete()
+        user.delete()
+
+
+if __name__ == "__main__":
+    main()
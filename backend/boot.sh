@@ -0,0 +1,27 @@
+#!/bin/sh
+# Web process boot. BOOT_MODE=full (default) applies migrations and seeds the
+# demo jobs only when there are none, then serves; BOOT_MODE=serve goes straight
+# to gunicorn (restarts, extra replicas, or when migrations run as a separate
+# release step). Extra arguments are passed to gunicorn.
+set -e
+cd "$(dirname "$0")"
+
+host=${DATABASE_URL#*@}
+echo "DATABASE_URL present: $([ -n "$DATABASE_URL" ] && echo True || echo False)"
+echo "DJANGO_SETTINGS_MODULE: $DJANGO_SETTINGS_MODULE"
+[ -n "$DATABASE_URL" ] && echo "DB HOST: ${host%%[:/]*}"
+
+case "${BOOT_MODE:-full}" in
+  full)
+    python manage.py migrate --no-input
+    python manage.py seed_jobs --if-empty
+    ;;
+  serve)
+    ;;
+  *)
+    echo "unknown BOOT_MODE '$BOOT_MODE' (expected full or serve)" >&2
+    exit 1
+    ;;
+esac
+
+exec gunicorn --bind "0.0.0.0:${PORT:-8000}" "$@"
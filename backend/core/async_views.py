@@ -0,0 +1,148 @@
+"""
+Async variants of the read endpoints, for ASGI deployments (ASGI=1).
+
+They share filtering, scoring and the visibility gate with core.views and
+only swap the database calls for Django's async ORM, so one process can
+keep many listing requests in flight while others wait on Postgres. The
+score-events stream lives here too: it holds a connection open for minutes,
+which only an async worker can afford.
+"""
+import asyncio
+import json
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth.models import AnonymousUser
+from django.http import HttpResponse, StreamingHttpResponse
+from django.views.decorators.http import require_GET
+from rest_framework.exceptions import AuthenticationFailed, ValidationError
+from rest_framework.settings import api_settings
+
+from . import catalog, events, vocabulary
+from .instrumentation import query_budget
+from .models import Resume, JobListing
+from .routing import replica
+from .views import (LISTING_LIMIT, Projection, _listing_queryset, _resolve_skill, _score_queries,
+                    _fallback_resume, _scored_off_snapshot, _listing_body, _listing_response, _detail_body)
+
+def _json(body, status: int = 200) -> HttpResponse:
+    # Same renderer (and so the same bytes) as the DRF views
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    return HttpResponse(renderer.render(body), status=status, content_type=renderer.media_type)
+
+def _authenticate_sync(request, query_token=False):
+    if query_token and "token" in request.GET and "HTTP_AUTHORIZATION" not in request.META:
+        # EventSource can't set headers; accept the access token as ?token=
+        auth = api_settings.DEFAULT_AUTHENTICATION_CLASSES[0]()
+        return auth.get_user(auth.get_validated_token(request.GET["token"]))
+    for auth_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        result = auth_class().authenticate(request)
+        if result is not None:
+            return result[0]
+    return AnonymousUser()
+
+async def _authenticate(request, query_token=False):
+    """Run the configured DRF authenticators; sets request.user like DRF would."""
+    request.user = await sync_to_async(_authenticate_sync)(request, query_token)
+
+def _auth_failed(exc: AuthenticationFailed) -> HttpResponse:
+    # Same body DRF's exception handler would produce
+    body = exc.detail if isinstance(exc.detail, dict) else {"detail": exc.detail}
+    return _json(body, status=exc.status_code)
+
+@query_budget(5)
+@require_GET
+async def jobs_list(request):
+    try:
+        await _authenticate(request)
+        projection = Projection(request.GET)
+    except AuthenticationFailed as e:
+        return _auth_failed(e)
+    except ValidationError as e:
+        return _json(e.detail, status=e.status_code)
+
+    skill = await sync_to_async(_resolve_skill)(request.GET)  # the alias map may need a query
+    qs, filtered = _listing_queryset(request.GET, projection, skill)
+    snap = await sync_to_async(catalog.get_snapshot)()
+    user = request.user if request.user.is_authenticated else None
+    # The async ORM hops to a worker thread; asgiref carries this context with it
+    with replica(user and user.id):
+        if filtered:
+            page = [job async for job in qs[:LISTING_LIMIT]]
+        else:
+            ids = snap.newest(LISTING_LIMIT)
+            by_id = await projection.jobs().ain_bulk(ids)
+            page = [by_id[i] for i in ids if i in by_id]
+
+        stored_query, resume_query = _score_queries(user, page, projection)
+        stored = {job_id: score async for job_id, score in stored_query} if stored_query is not None else {}
+        resume_query = _fallback_resume(resume_query, stored)
+        latest_resume = await resume_query.afirst() if resume_query is not None else None
+    # A cached lookup, but a cold cache means a query
+    groups = await sync_to_async(vocabulary.alias_forms)() if _scored_off_snapshot(page, snap, latest_resume) else {}
+
+    return _json(_listing_response(*_listing_body(request, page, stored, latest_resume, snap, projection, groups)))
+
+@query_budget(3)
+@require_GET
+async def job_detail(request, pk: int):
+    try:
+        await _authenticate(request)
+        projection = Projection(request.GET)
+    except AuthenticationFailed as e:
+        return _auth_failed(e)
+    except ValidationError as e:
+        return _json(e.detail, status=e.status_code)
+
+    with replica(request.user.id if request.user.is_authenticated else None):
+        try:
+            job = await projection.jobs().aget(pk=pk)
+        except JobListing.DoesNotExist:
+            return _json({"detail": "Not found"}, status=404)
+
+        resume = None
+        if request.user.is_authenticated and projection.scoring:
+            resume = await Resume.objects.filter(user_id=request.user.id).order_by("-uploaded_at").afirst()
+    groups = await sync_to_async(vocabulary.alias_forms)() if resume else {}
+    return _json(_detail_body(request, job, resume, projection, groups))
+
+# ---------- Score events (SSE) ----------
+HEARTBEAT_SECONDS = 15
+
+def _sse(event: dict) -> bytes:
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode()
+
+async def _score_stream(user_id):
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + getattr(settings, "SCORE_EVENTS_TIMEOUT", 300)
+    async with events.listen(user_id) as next_event:
+        event = await sync_to_async(events.current_status)(user_id)
+        while True:
+            if event:
+                yield _sse(event)
+                if event["type"] == "ready":
+                    return
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return
+            event = await next_event(min(HEARTBEAT_SECONDS, remaining))
+            if event is None:
+                yield b": keep-alive\n\n"
+
+@query_budget(1)
+@require_GET
+async def score_events(request):
+    """
+    Server-sent events for the caller's score recompute: the current status,
+    then progress until "ready" (the stream then ends) or SCORE_EVENTS_TIMEOUT.
+    """
+    try:
+        await _authenticate(request, query_token=True)
+    except AuthenticationFailed as e:
+        return _auth_failed(e)
+    if not request.user.is_authenticated:
+        return _json({"detail": "Authentication credentials were not provided."}, status=401)
+
+    response = StreamingHttpResponse(_score_stream(request.user.id), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"  # don't let nginx buffer the stream
+    return response
@@ -0,0 +1,142 @@
+"""
+ATS-friendliness analysis of an uploaded resume.
+
+analyze() makes one pass over the extracted text, line by line, feeding every
+check that is still undecided; a check stops looking once its outcome is
+settled (enough spacing gaps or columnar lines to fail, every section heading
+or contact detail found), and the pass ends early when all of them are.
+PDF page metadata from the parser (characters and images per page) feeds the
+image-page check without touching the file again.
+
+Checks, in report order:
+
+    extractable      any text came out at all (or the parser's own failure)
+    image_pages      share of PDF pages with images and almost no text (scans)
+    spacing          runs of 3+ spaces/tabs inside lines (PDF only)
+    columns          lines split into 3+ cells by wide gaps: multi-column or table layout (PDF only)
+    sections         experience, education and skills headings present
+    contact          an email address and a phone number present
+"""
+import re
+from typing import Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+SPACING_GAPS = 50       # more horizontal gaps than this fails `spacing`
+COLUMN_LINES = 10       # this many columnar lines fails `columns`
+IMAGE_PAGE_CHARS = 50   # a page with images and fewer characters counts as an image page
+IMAGE_PAGE_RATIO = 0.5
+
+SECTIONS = {
+    "experience": ("experience", "work experience", "professional experience", "employment", "work history",
+                   "employment history", "career history"),
+    "education": ("education", "academic background", "qualifications", "education and training"),
+    "skills": ("skills", "technical skills", "core skills", "key skills", "competencies", "core competencies",
+               "technologies", "tech stack", "skills and tools"),
+}
+_HEADING_NAMES = {name: section for section, names in SECTIONS.items() for name in names}
+_HEADING_MAX_CHARS = 40
+
+_GAP = re.compile(r"[ \t\xa0]{3,}")
+_EMAIL = re.compile(r"[\w.+-]+@[\w-]+(?:\.[\w-]+)+")
+_PHONE = re.compile(r"(?<!\d)(?:\+?\d[\s.\-()]{0,2}){9,14}\d(?!\d)")
+_DIGITS = re.compile(r"\d+")
+_YEAR = re.compile(r"(?:19|20)\d\d")
+_HEADING_STRIP = re.compile(r"[^a-z& ]+")
+
+class Check(NamedTuple):
+    name: str
+    passed: bool
+    message: str = ""  # why it failed; "" when passed
+
+    def as_dict(self) -> dict:
+        return {"check": self.name, "passed": self.passed, "message": self.message}
+
+class Report(NamedTuple):
+    checks: Tuple[Check, ...]
+
+    @property
+    def ok(self) -> bool:
+        return all(c.passed for c in self.checks)
+
+    @property
+    def issues(self) -> List[str]:
+        return [c.message for c in self.checks if not c.passed]
+
+def _heading(line: str) -> Optional[str]:
+    """The section a heading-like line names ("EXPERIENCE", "Skills:"), else None."""
+    if len(line) > _HEADING_MAX_CHARS:
+        return None
+    key = " ".join(_HEADING_STRIP.sub(" ", line.lower().replace(" and ", " & ")).split()).replace("&", "and")
+    return _HEADING_NAMES.get(key)
+
+def _image_pages(pages: Sequence[Tuple[int, int]]) -> Optional[Check]:
+    if not pages:
+        return None
+    scanned = sum(1 for chars, images in pages if images and chars < IMAGE_PAGE_CHARS)
+    if scanned / len(pages) > IMAGE_PAGE_RATIO:
+        return Check("image_pages", False,
+                     f"{scanned} of {len(pages)} pages are images with little or no text (scanned resume?).")
+    return Check("image_pages", True)
+
+def _has_phone(line: str) -> bool:
+    """A phone-shaped digit run; "2015-2019 2020-2022" is a run of years, not a number."""
+    for m in _PHONE.finditer(line):
+        if sum(1 for g in _DIGITS.findall(m.group()) if _YEAR.fullmatch(g)) < 2:
+            return True
+    return False
+
+def _lines(text: str) -> Iterable[str]:
+    start, n = 0, len(text)
+    while start < n:
+        end = text.find("\n", start)
+        if end < 0:
+            end = n
+        yield text[start:end]
+        start = end + 1
+
+def analyze(text: str, file_format: str, pages: Sequence[Tuple[int, int]] = (), parse_issue: str = "") -> Report:
+    """Run every check over `text` (and PDF `pages` as (chars, images)); see the module docstring."""
+    if parse_issue:
+        return Report((Check("extractable", False, parse_issue),))
+    if not text.strip():
+        return Report((Check("extractable", False, "Text not extractable (scanned image or unsupported PDF)."),))
+
+    layout = file_format.lower() == "pdf"
+    gaps = columnar = 0
+    spacing_open = columns_open = layout
+    missing = set(SECTIONS)
+    email = phone = False
+    for line in _lines(text):
+        stripped = line.strip()
+        if not stripped:
+            continue
+        if spacing_open or columns_open:
+            n = len(_GAP.findall(stripped))
+            gaps += n
+            columnar += n >= 2
+            spacing_open = spacing_open and gaps <= SPACING_GAPS
+            columns_open = columns_open and columnar < COLUMN_LINES
+        if missing:
+            section = _heading(stripped)
+            missing.discard(section)
+        if not email:
+            email = "@" in stripped and _EMAIL.search(stripped) is not None
+        if not phone:
+            phone = _has_phone(stripped)
+        if not (spacing_open or columns_open or missing) and email and phone:
+            break
+
+    checks = [Check("extractable", True)]
+    image_pages = _image_pages(pages) if layout else None
+    if image_pages:
+        checks.append(image_pages)
+    if layout:
+        checks.append(Check("spacing", True) if gaps <= SPACING_GAPS else
+                      Check("spacing", False, "Irregular spacing detected (possible multi-column/table layout)."))
+        checks.append(Check("columns", True) if columnar < COLUMN_LINES else
+                      Check("columns", False, "Multi-column or table layout detected; ATS may read it out of order."))
+    checks.append(Check("sections", True) if not missing else Check(
+        "sections", False, "Missing section headings: " + ", ".join(s for s in SECTIONS if s in missing) + "."))
+    absent = [name for name, found in (("email address", email), ("phone number", phone)) if not found]
+    checks.append(Check("contact", True) if not absent else
+                  Check("contact", False, "No " + " or ".join(absent) + " found."))
+    return Report(tuple(checks))
@@ -1,13 +1,14 @@
-import stripe
 from django.conf import settings
 
 def init_stripe():
+    import stripe  # deferred: only checkout and webhook requests pay for the SDK (and requests) import
     if not settings.STRIPE_SECRET_KEY:
         raise RuntimeError("STRIPE_SECRET_KEY not set")
     stripe.api_key = settings.STRIPE_SECRET_KEY
+    return stripe
 
 def create_checkout_session(user_id: int):
-    init_stripe()
+    stripe = init_stripe()
     if not settings.STRIPE_PRICE_ID:
         raise RuntimeError("STRIPE_PRICE_ID not set")
     session = stripe.checkout.Session.create(
@@ -20,7 +21,7 @@ def create_checkout_session(user_id: int):
     return session
 
 def parse_webhook(payload: bytes, sig: str):
-    init_stripe()
+    stripe = init_stripe()
     whsec = settings.STRIPE_WEBHOOK_SECRET
     event = stripe.Webhook.construct_event(payload, sig, whsec)
     return event
@@ -0,0 +1,373 @@
+import logging
+import mmap
+import os
+import struct
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Optional, Set
+from django.conf import settings
+from django.core.cache import cache
+
+from .routing import primary
+from .scoring import title_tokens
+
+logger = logging.getLogger(__name__)
+
+# Bumped on every job write; the generation only on updates/deletes, which
+# can't be applied by appending and force a full reload.
+VERSION_KEY = "jobhack:catalog:version"
+GENERATION_KEY = "jobhack:catalog:generation"
+REBUILD_PENDING_KEY = "jobhack:catalog:rebuild-pending"
+
+# New rows are picked up by id; look back this far for ids that committed late.
+APPEND_LOOKBACK = 1000
+
+# Resumes whose per-term answers a snapshot remembers (oldest dropped first).
+PRESENCE_MEMO = 256
+
+# A keyword's term is its vocabulary forms (name, then aliases) joined by this;
+# the term occurs in a resume when any one form does, as in Vocabulary.present.
+FORM_SEP = "\0"
+
+def _occurs(term: str, resume_text: str) -> bool:
+    if FORM_SEP not in term:
+        return term in resume_text
+    return any(f in resume_text for f in term.split(FORM_SEP))
+
+class _CatalogBase:
+    """Scoring/ordering over the column arrays shared by both snapshot kinds."""
+
+    ids: "array"
+    terms: List[str]
+    term_ids: Dict[str, int]
+    form_ids: Dict[str, int]  # canonical keyword form -> term id
+    _presence: Dict[object, Dict[int, bool]]  # resume key -> {term id: occurs}
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, job_id: int) -> bool:
+        return self._row(job_id) is not None
+
+    def present_terms(self, resume_text: str, job_ids: Iterable[int], key=None) -> Set[int]:
+        """
+        Ids of the terms referenced by `job_ids`' rows that occur in the
+        (lowercased) resume text. Only those terms are tested, each at most once
+        per resume and snapshot when a `key` identifying the resume is given.
+        """
+        checked = self._checked(key)
+        present = set()
+        for job_id in job_ids:
+            row = self._row(job_id)
+            if row is None:
+                continue
+            for tids in (self.kw_terms[self.kw_offsets[row]:self.kw_offsets[row + 1]],
+                         self.title_terms[self.title_offsets[row]:self.title_offsets[row + 1]]):
+                for tid in tids:
+                    hit = checked.get(tid)
+                    if hit is None:
+                        hit = checked[tid] = _occurs(self.terms[tid], resume_text)
+                    if hit:
+                        present.add(tid)
+        return present
+
+    def _checked(self, key) -> Dict[int, bool]:
+        if key is None:
+            return {}
+        memo = self._presence
+        checked = memo.get(key)
+        if checked is None:
+            if len(memo) >= PRESENCE_MEMO:
+                memo.pop(next(iter(memo), None), None)
+            checked = memo[key] = {}
+        return checked
+
+    def score(self, job_id: int, present: Set[int]) -> Optional[int]:
+        """Same result as scoring.keyword_score_ids, computed on interned term ids."""
+        row = self._row(job_id)
+        if row is None:
+            return None
+        kw = self.kw_terms[self.kw_offsets[row]:self.kw_offsets[row + 1]]
+        title = self.title_terms[self.title_offsets[row]:self.title_offsets[row + 1]]
+        total = max(1, len(kw) + 2)
+        score = sum(1 for t in kw if t in present) + min(2, sum(1 for t in title if t in present))
+        return min(100, max(0, int(round(100 * score / total))))
+
+    def has_term(self, form: str, present: Set[int]) -> bool:
+        """Whether the keyword `form` (vocabulary.canonical; a name or an alias) is among `present`."""
+        tid = self.form_ids.get(form)
+        return tid is not None and tid in present
+
+    def _index_forms(self, tid: int, term: str):
+        # Every form of a keyword points at its term; a plain term (no aliases,
+        # or a title token) only claims a form no keyword has taken
+        forms = term.split(FORM_SEP)
+        if len(forms) > 1:
+            self.form_ids.update(dict.fromkeys(forms, tid))
+        else:
+            self.form_ids.setdefault(term, tid)
+
+class CatalogSnapshot(_CatalogBase):
+    """
+    Read-mostly, per-process copy of the scoring-relevant catalog data.
+
+    Rows are stored column-wise in flat arrays; keywords (by Keyword id, with
+    their aliases) and title tokens are interned into one term dictionary so a
+    resume only has to be scanned once per distinct term instead of once per
+    job keyword.
+    """
+
+    def __init__(self, version: int = 0, generation: int = 0):
+        self.version = version
+        self.generation = generation
+        self.terms = []
+        self.term_ids = {}
+        self.form_ids = {}
+        self.ids = array("q")
+        self.created = array("d")  # epoch seconds
+        self.kw_offsets = array("q", [0])
+        self.kw_terms = array("q")
+        self.title_offsets = array("q", [0])
+        self.title_terms = array("q")
+        self.rows: Dict[int, int] = {}  # job id -> row
+        self.max_id = 0
+        self._newest: Optional[List[int]] = None
+        self._presence = {}
+
+    def _row(self, job_id: int) -> Optional[int]:
+        return self.rows.get(job_id)
+
+    def _term(self, term: str) -> int:
+        tid = self.term_ids.get(term)
+        if tid is None:
+            tid = self.term_ids[term] = len(self.terms)
+            self.terms.append(term)
+            self._index_forms(tid, term)
+        return tid
+
+    def append(self, job_id: int, created_at, title: str, keywords: Iterable[str]):
+        """Add a job; `keywords` are its keyword terms (see FORM_SEP)."""
+        if job_id in self.rows:
+            return
+        self.kw_terms.extend(dict.fromkeys(self._term(k) for k in keywords))
+        self.title_terms.extend(self._term(t) for t in title_tokens(title))
+        self.kw_offsets.append(len(self.kw_terms))
+        self.title_offsets.append(len(self.title_terms))
+        self.created.append(created_at.timestamp())
+        # ids last: readers only look at rows below len(ids)
+        self.rows[job_id] = len(self.ids)
+        self.ids.append(job_id)
+        self.max_id = max(self.max_id, job_id)
+        self._newest = None
+
+    def newest_rows(self) -> List[int]:
+        if self._newest is None:
+            self._newest = sorted(range(len(self.ids)), key=lambda r: (self.created[r], self.ids[r]), reverse=True)
+        return self._newest
+
+    def newest(self, limit: int) -> List[int]:
+        """Job ids ordered by created_at desc, like the default listing."""
+        return [self.ids[r] for r in self.newest_rows()[:limit]]
+
+# ---------- Snapshot file ----------
+# One file on storage shared by web and worker hosts (the workers rewrite it),
+# in native byte order: header, then 8-byte aligned sections,
+# rows sorted by id:
+#   ids q[n] | created d[n] | newest q[n] (rows by created desc)
+#   kw_offsets q[n+1] | kw_terms q[nk] | title_offsets q[n+1] | title_terms q[nt]
+#   term_offsets q[v+1] | term blob (utf-8)
+MAGIC = b"JHCAT002"
+HEADER = struct.Struct("=8sqqqqqqq")  # magic, version, generation, n, nk, nt, v, blob
+
+def write_snapshot_file(snap: CatalogSnapshot, path: str):
+    """Write `snap` to `path` atomically: readers see the old file or the new one, never a mix."""
+    n = len(snap.ids)
+    order = sorted(range(n), key=snap.ids.__getitem__)
+    pos = {r: i for i, r in enumerate(order)}
+
+    ids, created, kw_offsets, kw_terms = array("q"), array("d"), array("q", [0]), array("q")
+    title_offsets, title_terms = array("q", [0]), array("q")
+    for r in order:
+        ids.append(snap.ids[r])
+        created.append(snap.created[r])
+        kw_terms.extend(snap.kw_terms[snap.kw_offsets[r]:snap.kw_offsets[r + 1]])
+        kw_offsets.append(len(kw_terms))
+        title_terms.extend(snap.title_terms[snap.title_offsets[r]:snap.title_offsets[r + 1]])
+        title_offsets.append(len(title_terms))
+    newest = array("q", (pos[r] for r in snap.newest_rows()))
+
+    encoded = [t.encode("utf-8") for t in snap.terms]
+    term_offsets = array("q", [0])
+    for b in encoded:
+        term_offsets.append(term_offsets[-1] + len(b))
+    blob = b"".join(encoded)
+
+    tmp = f"{path}.tmp-{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(HEADER.pack(MAGIC, snap.version, snap.generation, n, len(kw_terms),
+                            len(title_terms), len(snap.terms), len(blob)))
+        for arr in (ids, created, newest, kw_offsets, kw_terms, title_offsets, title_terms, term_offsets):
+            arr.tofile(f)
+        f.write(blob)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+class MappedCatalog(_CatalogBase):
+    """
+    Read-only view over a snapshot file. The column arrays are memoryviews
+    into one shared mmap, so every process on the host uses the same page
+    cache copy; only the term dictionary is decoded per process.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            self.stamp = (st.st_ino, st.st_mtime_ns, st.st_size)
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.version, self.generation, n, nk, nt, v, blob_len = HEADER.unpack_from(self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a catalog snapshot")
+        view, off = memoryview(self._mm), HEADER.size
+
+        def section(fmt: str, count: int):
+            nonlocal off
+            start, off = off, off + 8 * count
+            return view[start:off].cast(fmt)
+
+        self.ids = section("q", n)
+        self.created = section("d", n)
+        self.newest_order = section("q", n)
+        self.kw_offsets = section("q", n + 1)
+        self.kw_terms = section("q", nk)
+        self.title_offsets = section("q", n + 1)
+        self.title_terms = section("q", nt)
+        term_offsets = section("q", v + 1)
+        blob = view[off:off + blob_len]
+        self.terms = [bytes(blob[term_offsets[i]:term_offsets[i + 1]]).decode("utf-8") for i in range(v)]
+        self.term_ids = {t: i for i, t in enumerate(self.terms)}
+        self.form_ids = {}
+        for tid, term in enumerate(self.terms):
+            self._index_forms(tid, term)
+        self._presence = {}
+
+    def _row(self, job_id: int) -> Optional[int]:
+        i = bisect_left(self.ids, job_id)
+        return i if i < len(self.ids) and self.ids[i] == job_id else None
+
+    def newest(self, limit: int) -> List[int]:
+        return [self.ids[r] for r in self.newest_order[:limit]]
+
+    def is_current(self) -> bool:
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return True  # keep serving the mapping we have
+        return (st.st_ino, st.st_mtime_ns, st.st_size) == self.stamp
+
+# ---------- Loading ----------
+
+def _load_rows(snap: CatalogSnapshot, qs):
+    # Keywords come from the job <-> Keyword links, like the stored MatchScores
+    from .vocabulary import Vocabulary, job_terms
+    qs = qs.order_by("id").values_list("id", "created_at", "title")
+    forms: Dict[int, str] = {}  # Keyword id -> its term
+    last_id = 0
+    while True:
+        page = list(qs.filter(id__gt=last_id)[:5000])
+        if not page:
+            return
+        terms = job_terms(job_id for job_id, _, _ in page)
+        missing = {kid for kids in terms.values() for kid in kids} - forms.keys()
+        if missing:
+            forms.update((kid, FORM_SEP.join(f)) for kid, f in Vocabulary.load(missing).forms.items())
+        for job_id, created_at, title in page:
+            snap.append(job_id, created_at, title, [forms[kid] for kid in terms.get(job_id, ()) if kid in forms])
+        last_id = page[-1][0]
+
+def _stamps():
+    got = cache.get_many([VERSION_KEY, GENERATION_KEY])
+    return got.get(VERSION_KEY, 0), got.get(GENERATION_KEY, 0)
+
+def build_snapshot() -> CatalogSnapshot:
+    from .models import JobListing
+    version, generation = _stamps()
+    snap = CatalogSnapshot(version, generation)
+    _load_rows(snap, JobListing.objects.active())
+    return snap
+
+_lock = threading.Lock()
+_snapshot: Optional[_CatalogBase] = None
+_checked_at = 0.0
+
+_file_problem = ""  # why CATALOG_SNAPSHOT_PATH can't be mapped; "" while it can
+
+def _file_unusable(problem: str):
+    """Log changes in the snapshot file's state once, and ask for a rewrite when it goes bad."""
+    global _file_problem
+    if problem == _file_problem:
+        return
+    _file_problem = problem
+    if not problem:
+        logger.info("catalog snapshot file mapped again")
+        return
+    logger.warning("catalog snapshot file unusable (%s); loading from the database until it is rebuilt", problem)
+    if cache.add(REBUILD_PENDING_KEY, 1, 300):
+        from .tasks import rebuild_catalog_snapshot
+        rebuild_catalog_snapshot.delay()
+
+def _refresh(snap: Optional[_CatalogBase]) -> _CatalogBase:
+    path = getattr(settings, "CATALOG_SNAPSHOT_PATH", "")
+    if path:
+        if isinstance(snap, MappedCatalog) and snap.is_current():
+            return snap
+        try:
+            mapped = MappedCatalog(path)
+        except (OSError, ValueError) as e:
+            _file_unusable(str(e))
+            if isinstance(snap, MappedCatalog):
+                return snap
+        else:
+            _file_unusable("")
+            return mapped
+
+    from .models import JobListing
+    version, generation = _stamps()
+    if not isinstance(snap, CatalogSnapshot) or generation != snap.generation:
+        return build_snapshot()
+    if version != snap.version:
+        _load_rows(snap, JobListing.objects.active().filter(id__gt=snap.max_id - APPEND_LOOKBACK))
+        snap.version = version
+    return snap
+
+def get_snapshot() -> _CatalogBase:
+    """
+    Return this process's catalog view, re-checking for changes at most once
+    per CATALOG_REFRESH_INTERVAL seconds. With CATALOG_SNAPSHOT_PATH set the
+    view is the mmapped file (remapped when a new one is renamed into place);
+    otherwise new jobs are appended in place and any update or delete
+    triggers a full rebuild.
+    """
+    global _snapshot, _checked_at
+    interval = getattr(settings, "CATALOG_REFRESH_INTERVAL", 1.0)
+    if _snapshot is not None and time.monotonic() - _checked_at < interval:
+        return _snapshot
+    with _lock, primary():  # a lagging replica would pin stale rows to the new stamps
+        _snapshot, _checked_at = _refresh(_snapshot), time.monotonic()
+        return _snapshot
+
+def _bump(key: str):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 1, None) or cache.incr(key)
+
+def job_created():
+    _bump(VERSION_KEY)
+
+def job_changed():
+    _bump(GENERATION_KEY)
+    _bump(VERSION_KEY)
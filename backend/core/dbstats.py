@@ -0,0 +1,35 @@
+from django.db import connections
+
+def connection_stats(alias: str = "default") -> dict:
+    """
+    Connection-reuse metrics for one database alias: psycopg pool counters
+    (size, idle, waiting requests, cumulative wait time) when pooling is on,
+    otherwise the persistent-connection settings.
+    """
+    conn = connections[alias]
+    pool = getattr(conn, "pool", None)  # postgres backend with OPTIONS["pool"] only
+    if pool is None:
+        return {
+            "alias": alias,
+            "mode": "persistent",
+            "conn_max_age": conn.settings_dict.get("CONN_MAX_AGE"),
+            "health_checks": conn.settings_dict.get("CONN_HEALTH_CHECKS"),
+        }
+    stats = pool.get_stats()
+    queued = stats.get("requests_queued", 0)
+    return {
+        "alias": alias,
+        "mode": "pool",
+        "pool_min": stats.get("pool_min"),
+        "pool_max": stats.get("pool_max"),
+        "pool_size": stats.get("pool_size"),
+        "pool_available": stats.get("pool_available"),
+        "requests_waiting": stats.get("requests_waiting", 0),
+        "requests_num": stats.get("requests_num", 0),
+        "requests_queued": queued,
+        "requests_wait_ms": stats.get("requests_wait_ms", 0),
+        "avg_wait_ms": round(stats.get("requests_wait_ms", 0) / queued, 2) if queued else 0.0,
+        "requests_errors": stats.get("requests_errors", 0),
+        "connections_num": stats.get("connections_num", 0),
+        "connections_lost": stats.get("connections_lost", 0),
+    }
@@ -0,0 +1,99 @@
+"""
+Streaming text extraction for .docx resumes.
+
+Reads the WordprocessingML parts straight from the zip with an incremental
+XML parser instead of building python-docx's object model: headers, the
+document body and footers, in that order. Every w:p is yielded as one line,
+including paragraphs inside tables and text boxes (where resumes often keep
+skills), which python-docx's Document.paragraphs leaves out. Elements are
+detached from their parent as they close, so memory stays bounded by the
+nesting depth and the longest paragraph, and both the decompressed XML and
+the returned text are capped.
+"""
+import re
+import zipfile
+from typing import IO, Iterator, List
+from xml.etree.ElementTree import iterparse
+
+W = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+MC_FALLBACK = "{http://schemas.openxmlformats.org/markup-compatibility/2006}Fallback"
+P, T, TAB, BR, CR = W + "p", W + "t", W + "tab", W + "br", W + "cr"
+NO_BREAK_HYPHEN = W + "noBreakHyphen"
+
+# Zip-bomb guard: stop reading a part after this many decompressed bytes
+MAX_XML_BYTES = 64 * 1024 * 1024
+# Longer text is truncated before storage anyway (Resume.text)
+MAX_CHARS = 200_000
+
+_HEADER = re.compile(r"word/header\d*\.xml$")
+_FOOTER = re.compile(r"word/footer\d*\.xml$")
+
+class _Capped:
+    """File wrapper that raises once more than `limit` bytes have been read."""
+
+    def __init__(self, raw: IO[bytes], limit: int):
+        self.raw, self.left = raw, limit
+
+    def read(self, n: int = -1) -> bytes:
+        data = self.raw.read(n if n >= 0 else self.left + 1)
+        self.left -= len(data)
+        if self.left < 0:
+            raise ValueError("docx part too large")
+        return data
+
+def _parts(names: List[str]) -> List[str]:
+    return (sorted(n for n in names if _HEADER.match(n)) + ["word/document.xml"]
+            + sorted(n for n in names if _FOOTER.match(n)))
+
+def _paragraphs(stream: IO[bytes]) -> Iterator[str]:
+    # One buffer per open w:p; a text-box paragraph nested in a run gets its own
+    # line instead of being glued into (or duplicated by) the enclosing one.
+    open_paragraphs: List[List[str]] = []
+    path = []  # open elements, so each one is dropped from its parent once read
+    skip = 0  # depth inside mc:Fallback, the legacy duplicate of a text box
+    for event, elem in iterparse(stream, events=("start", "end")):
+        tag = elem.tag
+        if event == "start":
+            path.append(elem)
+            if tag == MC_FALLBACK:
+                skip += 1
+            elif tag == P and not skip:
+                open_paragraphs.append([])
+            continue
+        if tag == MC_FALLBACK:
+            skip -= 1
+        elif skip or not open_paragraphs:
+            pass
+        elif tag == T:
+            open_paragraphs[-1].append(elem.text or "")
+        elif tag == TAB:
+            open_paragraphs[-1].append("\t")
+        elif tag in (BR, CR):
+            open_paragraphs[-1].append("\n")
+        elif tag == NO_BREAK_HYPHEN:
+            open_paragraphs[-1].append("-")
+        elif tag == P:
+            text = "".join(open_paragraphs.pop()).strip()
+            if text:
+                yield text
+        path.pop()
+        if path:
+            path[-1].remove(elem)  # always its only child by now
+
+def iter_docx_text(path) -> Iterator[str]:
+    """Yield the non-empty paragraphs of the .docx at `path` (headers, body, footers), up to MAX_CHARS."""
+    budget = MAX_CHARS
+    with zipfile.ZipFile(path) as z:
+        names = set(z.namelist())
+        for part in _parts(list(names)):
+            if part not in names:
+                continue
+            with z.open(part) as raw:
+                for text in _paragraphs(_Capped(raw, MAX_XML_BYTES)):
+                    yield text[:budget]
+                    budget -= len(text) + 1
+                    if budget <= 0:
+                        return
+
+def docx_text(path) -> str:
+    return "\n".join(iter_docx_text(path))
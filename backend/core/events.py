@@ -0,0 +1,115 @@
+"""
+Score-progress events for a user's match-score recompute.
+
+Tasks publish() small dicts ({"type": "queued" | "progress" | "ready", ...})
+and the SSE endpoint listens for them. With EVENTS_REDIS_URL set they travel
+over Redis pub/sub, so web and worker processes can live on different hosts;
+without it an in-process broker stands in (eager Celery, tests). The latest
+event is also kept in the cache so late subscribers and the polling fallback
+(/api/scores/status/) see the current state.
+"""
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+from contextlib import asynccontextmanager
+from django.conf import settings
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+STATUS_KEY = "jobhack:scores:status:{}"
+CHANNEL = "jobhack:scores:{}"
+STATUS_TTL = 3600
+
+def _redis_url():
+    return getattr(settings, "EVENTS_REDIS_URL", None)
+
+def current_status(user_id):
+    return cache.get(STATUS_KEY.format(user_id))
+
+def publish(user_id, event: dict):
+    """Record and broadcast `event`; failures are logged, never raised into scoring."""
+    try:
+        cache.set(STATUS_KEY.format(user_id), event, STATUS_TTL)
+        if _redis_url():
+            _redis_publisher().publish(CHANNEL.format(user_id), json.dumps(event))
+        else:
+            _memory.publish(user_id, event)
+    except Exception:
+        logger.warning("could not publish score event for user %s", user_id, exc_info=True)
+
+_publisher = None
+
+def _redis_publisher():
+    global _publisher
+    if _publisher is None:
+        import redis
+        _publisher = redis.Redis.from_url(_redis_url())
+    return _publisher
+
+class _MemoryBroker:
+    """Process-local pub/sub: publish() may run on any thread, listeners are asyncio queues."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._listeners = defaultdict(set)
+
+    def publish(self, user_id, event: dict):
+        with self._lock:
+            listeners = list(self._listeners.get(user_id, ()))
+        for loop, queue in listeners:
+            loop.call_soon_threadsafe(queue.put_nowait, event)
+
+    @asynccontextmanager
+    async def listen(self, user_id):
+        entry = (asyncio.get_running_loop(), asyncio.Queue())
+
+        async def next_event(timeout: float):
+            try:
+                return await asyncio.wait_for(entry[1].get(), timeout)
+            except asyncio.TimeoutError:
+                return None
+
+        with self._lock:
+            self._listeners[user_id].add(entry)
+        try:
+            yield next_event
+        finally:
+            with self._lock:
+                self._listeners[user_id].discard(entry)
+                if not self._listeners[user_id]:
+                    del self._listeners[user_id]
+
+_memory = _MemoryBroker()
+
+@asynccontextmanager
+async def _redis_listen(user_id):
+    import redis.asyncio as aioredis
+    client = aioredis.Redis.from_url(_redis_url())
+    pubsub = client.pubsub()
+    await pubsub.subscribe(CHANNEL.format(user_id))
+
+    async def next_event(timeout: float):
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (remaining := deadline - loop.time()) > 0:
+            message = await pubsub.get_message(ignore_subscribe_messages=True, timeout=remaining)
+            if message:
+                return json.loads(message["data"])
+        return None
+
+    try:
+        yield next_event
+    finally:
+        await pubsub.aclose()
+        await client.aclose()
+
+def listen(user_id):
+    """
+    Async context manager yielding `next_event(timeout)`, which returns the
+    next event for `user_id` or None after `timeout` seconds. Subscribe before
+    reading current_status() so nothing published in between is missed.
+    """
+    return _redis_listen(user_id) if _redis_url() else _memory.listen(user_id)
@@ -0,0 +1,121 @@
+"""
+Facet counts for filter chips: jobs per location, company and keyword.
+
+FacetCount rows are adjusted by the JobListing signals inside the same
+transaction as the job write, always in (facet, value) order so concurrent
+saves lock rows in the same order. rebuild() recomputes them from scratch
+while holding a table lock those updates wait on, so no delta is lost to the
+swap; it runs periodically (FACET_REBUILD_INTERVAL) and after imports that
+bypass signals (bulk_create). Unfiltered facets are an index range read per facet.
+Filtered ones count over at most FACET_SCAN_LIMIT matching rows and report
+"approximate" when the match set was larger.
+"""
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import JobListing, FacetCount
+
+FACETS = ("location", "company", "keyword")
+VALUE_MAX = FacetCount._meta.get_field("value").max_length
+
+_local = threading.local()
+
+@contextmanager
+def deferred():
+    """Skip per-job count updates for a bulk write; call rebuild() afterwards."""
+    _local.deferred = True
+    try:
+        yield
+    finally:
+        _local.deferred = False
+
+def is_deferred() -> bool:
+    return getattr(_local, "deferred", False)
+
+def _clean(value) -> str:
+    return (value or "").strip()[:VALUE_MAX]
+
+def values_for(location, company, keywords) -> Counter:
+    """The (facet, value) pairs one job contributes."""
+    values = Counter()
+    for facet, value in (("location", _clean(location)), ("company", _clean(company))):
+        if value:
+            values[facet, value] += 1
+    for kw in {_clean(k).lower() for k in keywords or []}:
+        if kw:
+            values["keyword", kw] += 1
+    return values
+
+def job_values(job) -> Counter:
+    if not job.is_active:
+        return Counter()  # expired jobs don't count
+    return values_for(job.location, job.company, job.keywords)
+
+def apply(before: Counter, after: Counter):
+    """Move the counts from a job's old (facet, value) pairs to its new ones."""
+    if is_deferred():
+        return
+    delta = Counter(after)
+    delta.subtract(before)
+    delta = sorted((key, d) for key, d in delta.items() if d)
+    if not delta:
+        return
+    FacetCount.objects.bulk_create(
+        [FacetCount(facet=f, value=v) for (f, v), d in delta if d > 0], ignore_conflicts=True,
+    )
+    for (facet, value), d in delta:
+        FacetCount.objects.filter(facet=facet, value=value).update(count=F("count") + d)
+
+def rebuild():
+    with transaction.atomic():
+        conn = transaction.get_connection()
+        if conn.vendor == "postgresql":
+            with conn.cursor() as cur:  # reads continue; apply() waits, then adds its delta to the new counts
+                cur.execute(f"LOCK TABLE {FacetCount._meta.db_table} IN EXCLUSIVE MODE")
+        counts = _count_active()
+        FacetCount.objects.all().delete()
+        FacetCount.objects.bulk_create(
+            [FacetCount(facet=f, value=v, count=n) for (f, v), n in counts.items()], batch_size=5000,
+        )
+
+def _count_active() -> Counter:
+    counts = Counter()
+    for facet in ("location", "company"):
+        for value, n in JobListing.objects.active().values_list(facet).annotate(n=Count("id")).order_by():
+            if _clean(value):
+                counts[facet, _clean(value)] += n
+    qs, last_id = JobListing.objects.active().order_by("id").values_list("id", "keywords"), 0
+    while True:
+        page = list(qs.filter(id__gt=last_id)[:5000])
+        if not page:
+            break
+        for _, keywords in page:
+            counts.update(values_for(None, None, keywords))
+        last_id = page[-1][0]
+    return counts
+
+def top(limit: int = 10) -> dict:
+    return {
+        facet: [{"value": v, "count": n} for v, n in
+                FacetCount.objects.filter(facet=facet, count__gt=0).order_by("-count", "value")
+                .values_list("value", "count")[:limit]]
+        for facet in FACETS
+    }
+
+def count_matching(qs, limit: int = 10) -> dict:
+    """Facets over the jobs in `qs`, counting at most FACET_SCAN_LIMIT rows."""
+    scan = getattr(settings, "FACET_SCAN_LIMIT", 5000)
+    rows = list(qs.order_by().values_list("location", "company", "keywords")[:scan + 1])
+    counts = Counter()
+    for location, company, keywords in rows[:scan]:
+        counts.update(values_for(location, company, keywords))
+    out = {facet: [] for facet in FACETS}
+    for (facet, value), n in sorted(counts.items(), key=lambda kv: (-kv[1], kv[0][1])):
+        if len(out[facet]) < limit:
+            out[facet].append({"value": value, "count": n})
+    out["approximate"] = len(rows) > scan
+    return out
@@ -0,0 +1,220 @@
+"""
+Per-endpoint and per-task performance accounting.
+
+QueryMetricsMiddleware and the Celery task hooks below count SQL queries,
+SQL time, the remaining Python time and (for HTTP) response bytes, keep
+running totals per endpoint/task in this process, and log one JSON line
+per request/task on the "jobhack.perf" logger. metrics_text() renders the
+totals in Prometheus text format for /api/metrics/. Totals are per process;
+scrape each worker or aggregate in Prometheus.
+
+Every database connection carries one long-lived execute_wrapper that charges
+each query to the QueryCounter in the _current context variable. Requests and
+tasks set their own counter there, so concurrent ASGI requests sharing the
+thread-sensitive executor thread (and its connections) never count each
+other's queries.
+"""
+import json
+import logging
+import threading
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+from typing import Optional
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from celery.signals import task_prerun, task_postrun
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+logger = logging.getLogger("jobhack.perf")
+
+def query_budget(max_queries: int):
+    """Declare the most SQL queries a view may run; apply outermost (above @api_view)."""
+    def decorator(view):
+        view.query_budget = max_queries
+        return view
+    return decorator
+
+class QueryCounter:
+    """Tallies query count and time for one request or task."""
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        t0 = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.seconds += time.perf_counter() - t0
+            self.queries += 1
+
+_current: ContextVar[Optional[QueryCounter]] = ContextVar("query_counter", default=None)
+
+def _count_query(execute, sql, params, many, context):
+    counter = _current.get()
+    if counter is None:
+        return execute(sql, params, many, context)
+    return counter(execute, sql, params, many, context)
+
+def _install(conn):
+    # First in the list: execute_wrapper() blocks pop the last entry, so one
+    # entered before this connection opened must not pop ours on exit.
+    if _count_query not in conn.execute_wrappers:
+        conn.execute_wrappers.insert(0, _count_query)
+
+@receiver(connection_created)
+def _connection_created(sender, connection, **kwargs):
+    _install(connection)
+
+for _conn in connections.all(initialized_only=True):  # opened before this module loaded
+    _install(_conn)
+
+class _Totals:
+    __slots__ = ("count", "queries", "sql_seconds", "python_seconds", "response_bytes", "max_queries", "over_budget")
+
+    def __init__(self):
+        self.count = self.queries = self.response_bytes = self.max_queries = self.over_budget = 0
+        self.sql_seconds = self.python_seconds = 0.0
+
+_lock = threading.Lock()
+_totals = {"http": defaultdict(_Totals), "task": defaultdict(_Totals)}
+
+def record(kind: str, name: str, counter: QueryCounter, elapsed: float, size: int = 0, budget: int = None, **extra):
+    python_seconds = max(0.0, elapsed - counter.seconds)
+    over = budget is not None and counter.queries > budget
+    with _lock:
+        t = _totals[kind][name]
+        t.count += 1
+        t.queries += counter.queries
+        t.sql_seconds += counter.seconds
+        t.python_seconds += python_seconds
+        t.response_bytes += size
+        t.max_queries = max(t.max_queries, counter.queries)
+        t.over_budget += over
+    entry = {
+        "kind": kind, "name": name, "queries": counter.queries,
+        "sql_ms": round(counter.seconds * 1000, 2), "python_ms": round(python_seconds * 1000, 2),
+        **extra,
+    }
+    if kind == "http":
+        entry["bytes"] = size
+    if over:
+        entry["query_budget"] = budget
+        logger.warning(json.dumps(entry))
+    else:
+        logger.info(json.dumps(entry))
+
+def _endpoint(request) -> str:
+    match = getattr(request, "resolver_match", None)
+    return f"{request.method} /{match.route}" if match else f"{request.method} <unmatched>"
+
+def _view_budget(request):
+    match = getattr(request, "resolver_match", None)
+    return getattr(match.func, "query_budget", None) if match else None
+
+def _response_size(response) -> int:
+    return 0 if getattr(response, "streaming", False) else len(response.content)
+
+class QueryMetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        counter = QueryCounter()
+        token = _current.set(counter)
+        t0 = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._record(request, response, counter, time.perf_counter() - t0)
+        return response
+
+    async def __acall__(self, request):
+        # sync_to_async copies this context into the executor thread, so the
+        # async ORM's queries are charged to this request's counter
+        counter = QueryCounter()
+        token = _current.set(counter)
+        t0 = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        self._record(request, response, counter, time.perf_counter() - t0)
+        return response
+
+    def _record(self, request, response, counter, elapsed):
+        record("http", _endpoint(request), counter, elapsed, _response_size(response),
+               _view_budget(request), status=response.status_code)
+
+# ---------- Celery ----------
+_running = {}
+
+@task_prerun.connect
+def _task_started(task_id=None, task=None, **kwargs):
+    counter = QueryCounter()
+    _running[task_id] = (counter, _current.set(counter), time.perf_counter())
+
+@task_postrun.connect
+def _task_finished(task_id=None, task=None, state=None, **kwargs):
+    started = _running.pop(task_id, None)
+    if started is None:
+        return
+    counter, token, t0 = started
+    _current.reset(token)
+    record("task", task.name, counter, time.perf_counter() - t0, state=state)
+
+# ---------- Prometheus ----------
+_FAMILIES = (
+    ("count", "total", "counter", "Requests/runs handled"),
+    ("queries", "sql_queries_total", "counter", "SQL queries executed"),
+    ("sql_seconds", "sql_seconds_total", "counter", "Time spent in SQL"),
+    ("python_seconds", "python_seconds_total", "counter", "Time spent outside SQL"),
+    ("max_queries", "max_sql_queries", "gauge", "Most SQL queries in a single request/run"),
+    ("over_budget", "query_budget_exceeded_total", "counter", "Requests over their declared query budget"),
+)
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"')
+
+def metrics_text(extra_gauges=None) -> str:
+    """Prometheus text exposition of the totals, plus optional {name: [(labels, value)]} gauges."""
+    with _lock:
+        snapshot = {kind: {name: _copy(t) for name, t in rows.items()} for kind, rows in _totals.items()}
+    lines = []
+    for kind, label in (("http", "endpoint"), ("task", "task")):
+        families = _FAMILIES + ((("response_bytes", "response_bytes_total", "counter", "Response body bytes"),)
+                                if kind == "http" else ())
+        for attr, suffix, mtype, help_text in families:
+            metric = f"jobhack_{kind}_{suffix}"
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} {mtype}")
+            for name, t in sorted(snapshot[kind].items()):
+                lines.append(f'{metric}{{{label}="{_escape(name)}"}} {getattr(t, attr)}')
+    for metric, samples in (extra_gauges or {}).items():
+        lines.append(f"# TYPE {metric} gauge")
+        for labels, value in samples:
+            rendered = ",".join(f'{k}="{_escape(str(v))}"' for k, v in labels.items())
+            lines.append(f"{metric}{{{rendered}}} {value}")
+    return "\n".join(lines) + "\n"
+
+def _copy(t: _Totals) -> _Totals:
+    c = _Totals()
+    for slot in _Totals.__slots__:
+        setattr(c, slot, getattr(t, slot))
+    return c
+
+def reset():
+    with _lock:
+        for rows in _totals.values():
+            rows.clear()
@@ -0,0 +1,79 @@
+"""
+Job listing lifecycle: active -> expired -> archived.
+
+A job expires at its feed-supplied `expires_at`, or JOB_MAX_AGE_DAYS after
+it was posted when the feed gave none (0 disables the age policy). expire()
+clears is_active, which takes the job out of every hot path at once (listing,
+detail, catalog snapshot, suggestions, facets, scoring); they all read
+JobListing.objects.active(), backed by partial indexes on active rows.
+Saving an expired job with expires_at moved into the future reactivates it
+(JobListing.save). archive() then copies expired jobs to ArchivedJob in batches, deletes their
+MatchScore rows in small chunks (each its own short transaction), and
+finally deletes the job rows.
+"""
+import logging
+from datetime import timedelta
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from . import catalog, facets
+from .models import ArchivedJob, JobListing, MatchScore
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_FIELDS = ("id", "title", "company", "location", "description", "keywords", "created_at", "expires_at")
+
+def _batch_size() -> int:
+    return getattr(settings, "JOB_ARCHIVE_BATCH_SIZE", 500)
+
+def _due(now) -> Q:
+    due = Q(expires_at__lte=now)
+    max_age = getattr(settings, "JOB_MAX_AGE_DAYS", 0)
+    if max_age:
+        due |= Q(expires_at__isnull=True, created_at__lte=now - timedelta(days=max_age))
+    return due
+
+def expire(now=None) -> int:
+    """Mark due jobs inactive, a batch per UPDATE; returns how many expired."""
+    now, size, expired = now or timezone.now(), _batch_size(), 0
+    while True:
+        ids = list(JobListing.objects.active().filter(_due(now)).values_list("id", flat=True)[:size])
+        if not ids:
+            break
+        expired += JobListing.objects.filter(id__in=ids).update(is_active=False)
+    if expired:
+        catalog.job_changed()  # snapshots and suggestion indexes reload without them
+        facets.rebuild()
+    return expired
+
+def purge_scores(job_ids) -> int:
+    """Delete MatchScore rows for `job_ids` a chunk at a time, so no statement holds locks for long."""
+    chunk, purged = getattr(settings, "SCORE_PURGE_CHUNK", 5000), 0
+    while True:
+        pks = list(MatchScore.objects.filter(job_id__in=job_ids).values_list("pk", flat=True)[:chunk])
+        if not pks:
+            return purged
+        purged += MatchScore.objects.filter(pk__in=pks).delete()[0]
+
+def archive() -> dict:
+    """Move inactive jobs to ArchivedJob; returns counts."""
+    size, jobs_moved, scores = _batch_size(), 0, 0
+    while True:
+        batch = list(JobListing.objects.filter(is_active=False).order_by("id").values(*ARCHIVED_FIELDS)[:size])
+        if not batch:
+            break
+        ids = [row["id"] for row in batch]
+        scores += purge_scores(ids)
+        with transaction.atomic(), facets.deferred():  # counts already dropped when they expired
+            # jobs reactivated since the batch was read stay where they are
+            still = set(JobListing.objects.select_for_update().filter(id__in=ids, is_active=False)
+                        .values_list("id", flat=True))
+            ArchivedJob.objects.bulk_create([ArchivedJob(**row) for row in batch if row["id"] in still],
+                                            ignore_conflicts=True)
+            JobListing.objects.filter(id__in=still).delete()
+        jobs_moved += len(still)
+    if jobs_moved:
+        logger.info("archived %d jobs, purged %d match scores", jobs_moved, scores)
+    return {"archived": jobs_moved, "scores_purged": scores}
@@ -0,0 +1,91 @@
+"""
+Location normalization for job listings.
+
+parse_location() splits free-text locations ("San Francisco, CA", "Remote -
+US", "London, United Kingdom") into city, region, country and a remote flag.
+JobListing stores the parts in indexed columns at ingestion, and
+location_filter() turns a ?location= query into equality/prefix lookups on
+them, so "CA" means California rather than any location containing "ca".
+"""
+import re
+from typing import NamedTuple, Optional
+from django.db.models import Q
+
+US_STATES = {
+    "AL": "alabama", "AK": "alaska", "AZ": "arizona", "AR": "arkansas", "CA": "california",
+    "CO": "colorado", "CT": "connecticut", "DE": "delaware", "FL": "florida", "GA": "georgia",
+    "HI": "hawaii", "ID": "idaho", "IL": "illinois", "IN": "indiana", "IA": "iowa", "KS": "kansas",
+    "KY": "kentucky", "LA": "louisiana", "ME": "maine", "MD": "maryland", "MA": "massachusetts",
+    "MI": "michigan", "MN": "minnesota", "MS": "mississippi", "MO": "missouri", "MT": "montana",
+    "NE": "nebraska", "NV": "nevada", "NH": "new hampshire", "NJ": "new jersey", "NM": "new mexico",
+    "NY": "new york", "NC": "north carolina", "ND": "north dakota", "OH": "ohio", "OK": "oklahoma",
+    "OR": "oregon", "PA": "pennsylvania", "RI": "rhode island", "SC": "south carolina",
+    "SD": "south dakota", "TN": "tennessee", "TX": "texas", "UT": "utah", "VT": "vermont",
+    "VA": "virginia", "WA": "washington", "WV": "west virginia", "WI": "wisconsin", "WY": "wyoming",
+    "DC": "district of columbia",
+}
+STATE_CODES = {name: code for code, name in US_STATES.items()}
+COUNTRIES = {
+    "us": "US", "usa": "US", "united states": "US", "united states of america": "US",
+    "uk": "GB", "gb": "GB", "united kingdom": "GB", "england": "GB", "scotland": "GB",
+    "canada": "CA", "germany": "DE", "france": "FR", "spain": "ES", "italy": "IT",
+    "netherlands": "NL", "ireland": "IE", "poland": "PL", "portugal": "PT", "sweden": "SE",
+    "switzerland": "CH", "india": "IN", "australia": "AU", "singapore": "SG", "japan": "JP",
+    "brazil": "BR", "mexico": "MX", "israel": "IL",
+}
+BROAD_REGIONS = {"europe", "emea", "apac", "asia", "americas", "north america", "latam", "worldwide", "global"}
+REMOTE_WORDS = re.compile(r"\b(remote|anywhere|work from home|wfh)\b", re.I)
+
+class ParsedLocation(NamedTuple):
+    city: str = ""
+    region: str = ""    # US state code, else the region as written (lowercased)
+    country: str = ""   # ISO 3166 alpha-2
+    remote: bool = False
+
+def parse_location(raw: Optional[str]) -> ParsedLocation:
+    text = (raw or "").strip()
+    remote = bool(REMOTE_WORDS.search(text))
+    text = REMOTE_WORDS.sub(" ", text)
+    parts = [p.strip().lower() for p in re.split(r"[,;/()|]|\s+-\s+", text)]
+    parts = [p for p in parts if p and p not in ("-", "hybrid", "onsite", "on-site")]
+
+    city = region = country = ""
+    if parts and parts[-1] in COUNTRIES:
+        country = COUNTRIES[parts.pop()]
+    if parts and (country in ("", "US")):
+        last = parts[-1]
+        if last.upper() in US_STATES and (len(parts) > 1 or country == "US" or len(last) == 2):
+            region, country = last.upper(), "US"
+            parts.pop()
+        elif last in STATE_CODES and (len(parts) > 1 or not country):
+            region, country = STATE_CODES[last], "US"
+            parts.pop()
+    if parts and not region and (len(parts) > 1 or parts[-1] in BROAD_REGIONS):
+        region = parts.pop()
+    if parts:
+        city = parts[0]
+    return ParsedLocation(city[:100], region[:100], country, remote)
+
+def normalized_fields(raw: Optional[str]) -> dict:
+    """JobListing column values for a raw location string."""
+    p = parse_location(raw)
+    return {"location_city": p.city, "location_region": p.region,
+            "location_country": p.country, "is_remote": p.remote}
+
+def location_filter(query: str) -> Q:
+    """
+    Q for a ?location= query: every part it names must match (remote flag,
+    country, region exactly; city by prefix). A query naming nothing we can
+    parse matches no rows.
+    """
+    p = parse_location(query)
+    q = Q()
+    if p.remote:
+        q &= Q(is_remote=True)
+    if p.country:
+        q &= Q(location_country=p.country)
+    if p.region:
+        q &= Q(location_region=p.region)
+    if p.city:
+        q &= Q(location_city__startswith=p.city)
+    return q if q else Q(pk__in=[])
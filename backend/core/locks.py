@@ -0,0 +1,71 @@
+import threading
+import uuid
+from contextlib import contextmanager
+from typing import Callable
+from django.conf import settings
+from django.core.cache import cache
+
+LOCK_PREFIX = "jobhack:lock:"
+RERUN_PREFIX = "jobhack:rerun:"
+
+def single_flight(key: str, fn: Callable[[], None], ttl: int = None) -> bool:
+    """
+    Run fn() unless another worker already holds the lock for `key`.
+
+    A caller that finds the lock held leaves a rerun marker and returns False;
+    the holder picks the marker up when it finishes and runs fn() once more,
+    so any number of enqueues during a run collapse into a single re-run.
+    The lock is re-extended while fn() runs, so the TTL only bounds how long
+    a crashed worker can keep it.
+    """
+    ttl = ttl or getattr(settings, "TASK_LOCK_TTL", 900)
+    lock_key, rerun_key = LOCK_PREFIX + key, RERUN_PREFIX + key
+    token = uuid.uuid4().hex
+    if not cache.add(lock_key, token, ttl):
+        cache.set(rerun_key, 1, ttl)
+        # The holder may have let go before it could see the marker: then the run is ours
+        if not cache.add(lock_key, token, ttl):
+            return False
+        cache.delete(rerun_key)
+    while True:
+        try:
+            with _kept(lock_key, token, ttl):
+                fn()
+        except BaseException:
+            _release(lock_key, token)
+            raise
+        if cache.get(rerun_key):
+            cache.delete(rerun_key)
+            continue  # go again without letting go of the lock
+        _release(lock_key, token)
+        # A caller that saw the lock held may have left a marker after the check
+        # above; take the lock back for it, unless someone else got there first.
+        if not cache.get(rerun_key) or not cache.add(lock_key, token, ttl):
+            return True
+        cache.delete(rerun_key)
+
+def _release(lock_key: str, token: str):
+    if cache.get(lock_key) == token:
+        cache.delete(lock_key)
+
+@contextmanager
+def _kept(lock_key: str, token: str, ttl: int):
+    """Re-extend the lock every ttl/3 seconds while the block runs."""
+    stop = threading.Event()
+
+    def beat():
+        while not stop.wait(ttl / 3):
+            if cache.get(lock_key) == token:
+                cache.touch(lock_key, ttl)
+
+    thread = threading.Thread(target=beat, name=f"lock-heartbeat:{lock_key}", daemon=True)
+    thread.start()
+    try:
+        yield
+    finally:
+        stop.set()
+        thread.join()
+
+def rerun_pending(key: str) -> bool:
+    """True while a caller has asked the current holder of `key` for another run."""
+    return bool(cache.get(RERUN_PREFIX + key))
@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from core.catalog import build_snapshot, write_snapshot_file
+
+class Command(BaseCommand):
+    help = 'Write the job catalog snapshot file that web and worker processes mmap'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--path', default=None, help='Output file (defaults to CATALOG_SNAPSHOT_PATH)')
+
+    def handle(self, *args, **options):
+        path = options['path'] or settings.CATALOG_SNAPSHOT_PATH
+        if not path:
+            raise CommandError('Set CATALOG_SNAPSHOT_PATH or pass --path')
+        snap = build_snapshot()
+        write_snapshot_file(snap, path)
+        self.stdout.write(
+            self.style.SUCCESS(f'Wrote {len(snap)} jobs, {len(snap.terms)} terms to {path}')
+        )
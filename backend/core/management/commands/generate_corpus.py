@@ -0,0 +1,94 @@
+import random
+from collections import Counter
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from core import catalog, facets, vocabulary
+from core.models import User, Resume, JobListing
+from .seed_jobs import SEED_JOBS
+
+LEVELS = ['', '', 'Senior ', 'Junior ', 'Lead ', 'Staff ', 'Principal ']
+COMPANY_SUFFIXES = ['', ' Labs', ' Systems', ' Group', ' Technologies', ' Partners', ' Cloud', ' Digital']
+FILLER = (
+    'Delivered projects end to end with cross-functional teams. Mentored engineers and ran code reviews. '
+    'Improved reliability and cut costs through automation. Communicated status to stakeholders. '
+)
+
+def _keyword_pool():
+    """Every seed keyword, weighted by how many seed jobs use it (common skills stay common)."""
+    counts = Counter(k for job in SEED_JOBS for k in job['keywords'])
+    return list(counts), list(counts.values())
+
+class Command(BaseCommand):
+    help = 'Generate a reproducible synthetic corpus of jobs, users and resumes for benchmarking'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--jobs', type=int, default=10000)
+        parser.add_argument('--users', type=int, default=1000)
+        parser.add_argument('--premium-ratio', type=float, default=0.2)
+        parser.add_argument('--resume-words', type=int, default=400, help='Approximate resume length')
+        parser.add_argument('--seed', type=int, default=42, help='Same seed, same corpus')
+        parser.add_argument('--prefix', default='synthetic', help='Username prefix of generated users')
+        parser.add_argument('--replace', action='store_true',
+                            help='Delete ALL jobs and previously generated users first')
+        parser.add_argument('--batch-size', type=int, default=5000)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        prefix, batch = options['prefix'], options['batch_size']
+        pool, weights = _keyword_pool()
+
+        if options['replace']:
+            with facets.deferred():  # recounted below
+                JobListing.objects.all().delete()
+            User.objects.filter(username__startswith=f'{prefix}-').delete()
+
+        # bulk_create skips post_save: no per-row scoring fan-out
+        for start in range(0, options['jobs'], batch):
+            vocabulary.link_jobs(JobListing.objects.bulk_create([
+                self._job(rng, pool, weights) for _ in range(start, min(options['jobs'], start + batch))
+            ]))
+        catalog.job_changed()
+        facets.rebuild()
+
+        password = make_password(None)
+        offset = User.objects.filter(username__startswith=f'{prefix}-').count()
+        for start in range(0, options['users'], batch):
+            users = User.objects.bulk_create([
+                User(username=f'{prefix}-{offset + i}', email=f'{prefix}-{offset + i}@example.com',
+                     password=password, is_premium=rng.random() < options['premium_ratio'])
+                for i in range(start, min(options['users'], start + batch))
+            ])
+            Resume.objects.bulk_create([
+                Resume(user_id=u.id, file='resumes/synthetic.pdf', file_format='pdf',
+                       text=self._resume_text(rng, pool, weights, options['resume_words']))
+                for u in users
+            ])
+
+        self.stdout.write(
+            self.style.SUCCESS(f"Generated {options['jobs']} jobs and {options['users']} users with resumes")
+        )
+
+    def _job(self, rng, pool, weights):
+        tpl = rng.choice(SEED_JOBS)
+        keywords = rng.sample(tpl['keywords'], rng.randint(4, len(tpl['keywords'])))
+        keywords = list(dict.fromkeys(keywords + rng.choices(pool, weights, k=rng.randint(0, 3))))
+        job = JobListing(
+            title=rng.choice(LEVELS) + tpl['title'],
+            company=rng.choice(SEED_JOBS)['company'] + rng.choice(COMPANY_SUFFIXES),
+            location=rng.choice(SEED_JOBS)['location'],
+            description=tpl['description'],
+            keywords=keywords,
+        )
+        job.normalize_location()  # bulk_create skips save()
+        return job
+
+    def _resume_text(self, rng, pool, weights, words):
+        profile = rng.choice(SEED_JOBS)
+        skills = [k for k in profile['keywords'] if rng.random() < 0.75]
+        skills += rng.choices(pool, weights, k=rng.randint(2, 8))
+        parts = [f"{profile['title']} with {rng.randint(1, 15)} years of experience.",
+                 'Skills: ' + ', '.join(dict.fromkeys(skills)) + '.']
+        while sum(len(p.split()) for p in parts) < words:
+            parts.append(f"Worked on {rng.choice(skills)} and {rng.choice(pool)} at "
+                         f"{rng.choice(SEED_JOBS)['company']}. " + FILLER)
+        return '\n'.join(parts)
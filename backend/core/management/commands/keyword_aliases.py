@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from core import vocabulary
+from core.models import Resume
+from core.tasks import compute_match_scores_for_user, rebuild_catalog_snapshot
+
+class Command(BaseCommand):
+    help = 'Add alias spellings to a keyword, merging keywords stored under those spellings into it'
+
+    def add_arguments(self, parser):
+        parser.add_argument('name', help='Canonical keyword, e.g. javascript')
+        parser.add_argument('aliases', nargs='*', help='Other spellings, e.g. js ecmascript')
+        parser.add_argument('--rescore', action='store_true',
+                            help='Queue a match-score recompute for every user with a resume')
+
+    def handle(self, *args, **options):
+        keyword = vocabulary.add_aliases(options['name'], options['aliases'])
+        rebuild_catalog_snapshot.delay()  # the snapshot file holds each keyword's forms; no-op without one
+        self.stdout.write(self.style.SUCCESS(
+            f'{keyword.name}: aliases {", ".join(keyword.aliases) or "(none)"}; {keyword.jobs.count()} jobs'
+        ))
+        if options['rescore']:
+            users = Resume.objects.values_list('user_id', flat=True).distinct().order_by()
+            for user_id in users:
+                compute_match_scores_for_user.delay(user_id)
+            self.stdout.write(f'Queued score recomputes for {len(users)} users')
@@ -0,0 +1,33 @@
+import json
+from django.core.management.base import BaseCommand, CommandError
+from core import partitions
+from core.tasks import rebuild_score_partition
+
+class Command(BaseCommand):
+    help = 'Hash-partition MatchScore by user (PostgreSQL), rebuild partitions, or report table/index sizes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--partitions', type=int, help='Convert core_matchscore into this many partitions')
+        parser.add_argument('--rebuild', type=int, action='append', metavar='REMAINDER',
+                            help='Queue a recompute-and-swap of this partition (repeatable)')
+        parser.add_argument('--rebuild-all', action='store_true', help='Queue a rebuild of every partition')
+        parser.add_argument('--sizes', action='store_true', help='Print table/index bytes per partition')
+
+    def handle(self, *args, **options):
+        try:
+            if options['partitions']:
+                partitions.partition(options['partitions'])
+                self.stdout.write(self.style.SUCCESS(f"core_matchscore now has {options['partitions']} partitions"))
+        except (RuntimeError, ValueError) as e:
+            raise CommandError(str(e))
+
+        count = partitions.partition_count()
+        remainders = range(count) if options['rebuild_all'] else options['rebuild'] or []
+        for r in remainders:
+            if not 0 <= r < count:
+                raise CommandError(f'No partition {r} (core_matchscore has {count})')
+            rebuild_score_partition.delay(r)
+            self.stdout.write(f'Queued rebuild of partition {r}')
+
+        if options['sizes']:
+            self.stdout.write(json.dumps(partitions.sizes(), indent=2))
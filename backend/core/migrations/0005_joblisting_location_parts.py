@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:42
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    from core.locations import normalized_fields
+    JobListing = apps.get_model('core', 'JobListing')
+    # One UPDATE per distinct location string
+    for location in JobListing.objects.values_list('location', flat=True).distinct().order_by():
+        JobListing.objects.filter(location=location).update(**normalized_fields(location))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_facetcount'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='is_remote',
+            field=models.BooleanField(db_index=True, default=False),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='location_city',
+            field=models.CharField(blank=True, default='', max_length=100),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='location_country',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=2),
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='location_region',
+            field=models.CharField(blank=True, db_index=True, default='', max_length=100),
+        ),
+        migrations.AddIndex(
+            model_name='joblisting',
+            index=models.Index(fields=['location_city'], name='job_location_city_idx', opclasses=['varchar_pattern_ops']),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
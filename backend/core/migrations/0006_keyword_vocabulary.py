@@ -0,0 +1,48 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:44
+
+from django.db import migrations, models
+
+
+def backfill(apps, schema_editor):
+    JobListing = apps.get_model('core', 'JobListing')
+    Keyword = apps.get_model('core', 'Keyword')
+    Link = JobListing.terms.through
+    canonical = lambda k: ' '.join(str(k or '').lower().split())[:100]
+    last_id = 0
+    while True:
+        page = list(JobListing.objects.filter(id__gt=last_id).order_by('id').values_list('id', 'keywords')[:2000])
+        if not page:
+            return
+        names = {canonical(k) for _, keywords in page for k in keywords or []} - {''}
+        Keyword.objects.bulk_create([Keyword(name=n) for n in names], ignore_conflicts=True)
+        ids = dict(Keyword.objects.filter(name__in=names).values_list('name', 'id'))
+        Link.objects.bulk_create([
+            Link(joblisting_id=job_id, keyword_id=kid)
+            for job_id, keywords in page
+            for kid in {ids[canonical(k)] for k in keywords or [] if canonical(k)}
+        ], ignore_conflicts=True)
+        last_id = page[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_joblisting_location_parts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Keyword',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('aliases', models.JSONField(blank=True, default=list)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='joblisting',
+            name='terms',
+            field=models.ManyToManyField(blank=True, related_name='jobs', to='core.keyword'),
+        ),
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-19 16:50
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_keyword_vocabulary'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='matchscore',
+            name='core_matchs_user_id_02f3eb_idx',
+        ),
+        migrations.AlterField(
+            model_name='matchscore',
+            name='user',
+            field=models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, to=settings.AUTH_USER_MODEL),
+        ),
+    ]
@@ -0,0 +1,23 @@
+from django.conf import settings
+from django.db import migrations
+
+
+def partition(apps, schema_editor):
+    # Opt-in: MATCHSCORE_PARTITIONS=N at migrate time, or later with
+    # `manage.py partition_matchscores --partitions N`
+    from core import partitions
+    n = getattr(settings, 'MATCHSCORE_PARTITIONS', 0)
+    conn = schema_editor.connection
+    if n and conn.vendor == 'postgresql' and not partitions.partition_count(conn):
+        partitions.partition(n, conn)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_matchscore_drop_duplicate_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition, migrations.RunPython.noop),
+    ]
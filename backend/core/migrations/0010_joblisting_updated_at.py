@@ -0,0 +1,18 @@
+# Generated by Django 5.2.18 on 2026-10-19 17:09
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0009_job_expiry_archive'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblisting',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.18 on 2026-10-19 18:02
+
+from collections import Counter
+
+from django.db import migrations
+
+
+def backfill(apps, schema_editor):
+    # FacetCount was only kept up by signals from 0004 on; count existing jobs once
+    from core.facets import values_for
+    JobListing = apps.get_model('core', 'JobListing')
+    FacetCount = apps.get_model('core', 'FacetCount')
+    jobs = JobListing.objects.filter(is_active=True).order_by('id').values_list('id', 'location', 'company', 'keywords')
+    counts, last_id = Counter(), 0
+    while True:
+        page = list(jobs.filter(id__gt=last_id)[:5000])
+        if not page:
+            break
+        for _, location, company, keywords in page:
+            counts.update(values_for(location, company, keywords))
+        last_id = page[-1][0]
+    FacetCount.objects.all().delete()
+    FacetCount.objects.bulk_create(
+        [FacetCount(facet=f, value=v, count=n) for (f, v), n in counts.items()], batch_size=5000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0010_joblisting_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill, migrations.RunPython.noop),
+    ]
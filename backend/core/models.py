@@ -1,10 +1,14 @@
 from django.db import models
 from django.contrib.auth.models import AbstractUser
 from django.conf import settings
+from django.utils import timezone
+from .locations import normalized_fields
 
 class User(AbstractUser):
     is_premium = models.BooleanField(default=False)
     email = models.EmailField(unique=True)
+    # Bumped when premium status changes so JWTs carrying old claims are rejected
+    token_version = models.PositiveIntegerField(default=0)
 
 class Resume(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -13,20 +17,113 @@ class Resume(models.Model):
     text = models.TextField(blank=True)
     uploaded_at = models.DateTimeField(auto_now_add=True)
 
+class Keyword(models.Model):
+    """Canonical (lowercased) skill name; `aliases` are other spellings that resolve to it."""
+    name = models.CharField(max_length=100, unique=True)
+    aliases = models.JSONField(default=list, blank=True)
+
+class JobListingQuerySet(models.QuerySet):
+    def active(self):
+        """Jobs still open; expired ones wait here until core.lifecycle archives them."""
+        return self.filter(is_active=True)
+
 class JobListing(models.Model):
     title = models.CharField(max_length=200, db_index=True)
     company = models.CharField(max_length=200, db_index=True)
     location = models.CharField(max_length=200, db_index=True)
+    # Parsed from `location` on save (core.locations); what ?location= filters on
+    location_city = models.CharField(max_length=100, blank=True, default="")
+    location_region = models.CharField(max_length=100, blank=True, default="", db_index=True)
+    location_country = models.CharField(max_length=2, blank=True, default="", db_index=True)
+    is_remote = models.BooleanField(default=False, db_index=True)
     description = models.TextField()
     keywords = models.JSONField(default=list, blank=True)
+    # `keywords` resolved to Keyword rows at save time (core.vocabulary); what scoring and ?skill= use
+    terms = models.ManyToManyField(Keyword, related_name="jobs", blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    # Lets a MatchScore partition rebuild find jobs edited while it ran
+    updated_at = models.DateTimeField(auto_now=True)
+    # Set by the feed, or left empty for the JOB_MAX_AGE_DAYS policy; the
+    # expiry sweep clears is_active and archival moves the row to ArchivedJob.
+    # Moving it into the future before archival makes the job active again.
+    expires_at = models.DateTimeField(null=True, blank=True)
+    is_active = models.BooleanField(default=True)
+
+    objects = JobListingQuerySet.as_manager()
+
+    class Meta:
+        indexes = [
+            # pattern_ops so `LIKE 'prefix%'` can use it under any collation (PostgreSQL; ignored elsewhere)
+            models.Index(fields=["location_city"], name="job_location_city_idx", opclasses=["varchar_pattern_ops"]),
+            # Partial: the listing order and the expiry sweep only ever look at active rows
+            models.Index(fields=["-created_at"], name="job_active_created_idx", condition=models.Q(is_active=True)),
+            models.Index(fields=["expires_at"], name="job_active_expires_idx", condition=models.Q(is_active=True)),
+        ]
+
+    def normalize_location(self):
+        """Fill the location_* columns from `location`; bulk_create callers must call this themselves."""
+        for field, value in normalized_fields(self.location).items():
+            setattr(self, field, value)
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        job = super().from_db(db, field_names, values)
+        job._loaded_expires_at = job.__dict__.get("expires_at")
+        return job
+
+    def reactivate_if_extended(self) -> bool:
+        """Make an expired job active again when its expires_at was moved into the future."""
+        extended = (not self.is_active and self.expires_at is not None and self.expires_at > timezone.now()
+                    and self.expires_at != getattr(self, "_loaded_expires_at", None))
+        if extended:
+            self.is_active = True
+        return extended
+
+    def save(self, *args, **kwargs):
+        self.normalize_location()
+        self._reactivated = self.reactivate_if_extended()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            extra = {"updated_at", *(normalized_fields(None) if "location" in update_fields else ())}
+            if self._reactivated:
+                extra.add("is_active")
+            kwargs["update_fields"] = {*update_fields, *extra}
+        super().save(*args, **kwargs)
+        self._loaded_expires_at = self.expires_at
+
+class ArchivedJob(models.Model):
+    """Cold copy of an expired JobListing (same id), kept out of every hot path."""
+    id = models.BigIntegerField(primary_key=True)
+    title = models.CharField(max_length=200)
+    company = models.CharField(max_length=200)
+    location = models.CharField(max_length=200)
+    description = models.TextField()
+    keywords = models.JSONField(default=list, blank=True)
+    created_at = models.DateTimeField()
+    expires_at = models.DateTimeField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True)
 
 class MatchScore(models.Model):
-    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
+    """
+    One row per (user, job). The (user, job) unique index serves every
+    per-user lookup, so `user` has no index of its own. On PostgreSQL the
+    table can be hash-partitioned by user (core.partitions); schema changes
+    to it then need hand-written SQL.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, db_index=False)
     job = models.ForeignKey(JobListing, on_delete=models.CASCADE)
     score_percentage = models.PositiveSmallIntegerField()
     updated_at = models.DateTimeField(auto_now=True)
 
     class Meta:
         unique_together = (("user", "job"),)
-        indexes = [models.Index(fields=["user", "job"])]
+
+class FacetCount(models.Model):
+    """Jobs per location/company/keyword value, maintained by core.facets."""
+    facet = models.CharField(max_length=16)
+    value = models.CharField(max_length=200)
+    count = models.IntegerField(default=0)
+
+    class Meta:
+        unique_together = (("facet", "value"),)
+        indexes = [models.Index(fields=["facet", "-count", "value"])]
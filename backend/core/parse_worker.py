@@ -0,0 +1,36 @@
+"""
+Document parsing worker, run by core.parsing as `python -m core.parse_worker`.
+
+Writes {"status": "ready"} once the parsers are imported, then reads one JSON
+request per line on stdin ({"path": ..., "format": ...}) and answers each
+with one JSON line on stdout ({"status": "ok"|"error"|"memory", "text": ...,
+"pages": [[chars, images], ...], "detail": ...}). Imports no Django, so it starts quickly and a
+parser that hangs or leaks can be killed without touching the web or Celery
+process.
+"""
+import json
+import sys
+
+MAX_CHARS = 200_000  # Resume.text is truncated to this anyway
+
+def main():
+    import PyPDF2, core.docx_text  # noqa: F401  (extract_document imports them lazily; load before "ready")
+    from core.scoring import extract_document
+    out = sys.stdout
+    sys.stdout = sys.stderr  # stray prints from a parser must not corrupt the protocol
+    out.write(json.dumps({"status": "ready"}) + "\n")  # imports done; parse timings start from here
+    out.flush()
+    for line in sys.stdin:
+        req = json.loads(line)
+        try:
+            text, pages = extract_document(req["path"], req["format"])
+            reply = {"status": "ok", "text": text[:MAX_CHARS], "pages": pages}
+        except MemoryError:
+            reply = {"status": "memory", "text": "", "detail": "MemoryError"}
+        except Exception as e:
+            reply = {"status": "error", "text": "", "detail": f"{type(e).__name__}: {e}"[:500]}
+        out.write(json.dumps(reply) + "\n")
+        out.flush()
+
+if __name__ == "__main__":
+    main()
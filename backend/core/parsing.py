@@ -0,0 +1,257 @@
+"""
+Resume parsing service: extract_document runs in a small pool of worker processes.
+
+PyPDF2 is pure Python and CPU-bound, and some malformed files make it spin or
+balloon. parse() hands each document to an idle worker (core.parse_worker,
+a plain subprocess so it also works inside daemonic Celery pool processes)
+and waits at most PARSER_TIMEOUT_SECONDS, checking the worker's RSS against
+PARSER_MAX_RSS_MB while it waits. A worker that overruns either limit is
+killed and replaced; every worker is also recycled after
+PARSER_MAX_DOCS_PER_WORKER documents so slow leaks never accumulate. The
+caller always gets a ParseResult, never an exception.
+
+Each process has its own pool, so PARSER_WORKERS bounds parsers per web or
+Celery process, not per host. PARSER_WORKERS=0 parses in-process with no
+limits (local development, eager Celery). Per-format totals (documents by status, seconds, bytes) are kept
+per process and exported on /api/metrics/.
+"""
+import json
+import logging
+import os
+import queue
+import select
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import NamedTuple, Optional, Tuple
+from django.conf import settings
+
+from .scoring import extract_document
+
+logger = logging.getLogger(__name__)
+
+STATUSES = ("ok", "error", "timeout", "memory", "crashed")
+ISSUES = {
+    "timeout": "Parsing timed out after {seconds:.0f}s (malformed or unusually complex file).",
+    "memory": "Parsing exceeded the memory limit (malformed or unusually complex file).",
+    "crashed": "The parser crashed on this file (corrupt or unsupported file).",
+    "error": "File could not be parsed (corrupt or unsupported file).",
+}
+_PAGE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+class ParseResult(NamedTuple):
+    text: str
+    status: str  # one of STATUSES
+    seconds: float
+    detail: str = ""
+    pages: Tuple[Tuple[int, int], ...] = ()  # (characters, images) per PDF page, for core.ats
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+    @property
+    def issue(self) -> str:
+        """User-facing message for ats.analyze; "" when parsing succeeded."""
+        return "" if self.ok else ISSUES[self.status].format(seconds=self.seconds)
+
+def _setting(name, default):
+    return getattr(settings, name, default)
+
+def _rss(pid: int) -> Optional[int]:
+    try:
+        with open(f"/proc/{pid}/statm") as f:
+            return int(f.read().split()[1]) * _PAGE
+    except (OSError, ValueError, IndexError):
+        return None  # no procfs: only the wall-time limit applies
+
+class _Worker:
+    def __init__(self, timeout: float):
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "core.parse_worker"],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, cwd=settings.BASE_DIR, text=True,
+        )
+        self.done = 0
+        if not select.select([self.proc.stdout.fileno()], [], [], timeout)[0]:
+            self.kill()
+            raise RuntimeError(f"parse worker not ready after {timeout:g}s")
+        if json.loads(self.proc.stdout.readline() or "{}").get("status") != "ready":
+            self.kill()
+            raise RuntimeError("parse worker failed to start")
+
+    def parse(self, path: str, file_format: str, timeout: float, max_rss: int) -> ParseResult:
+        t0 = time.perf_counter()
+        try:
+            self.proc.stdin.write(json.dumps({"path": path, "format": file_format}) + "\n")
+            self.proc.stdin.flush()
+        except OSError as e:
+            return ParseResult("", "crashed", 0.0, str(e))
+        self.done += 1
+        fd = self.proc.stdout.fileno()
+        while True:
+            elapsed = time.perf_counter() - t0
+            if elapsed >= timeout:
+                self.kill()
+                return ParseResult("", "timeout", elapsed)
+            if select.select([fd], [], [], min(0.05, timeout - elapsed))[0]:
+                break
+            rss = _rss(self.proc.pid)
+            if rss is not None and rss > max_rss:
+                self.kill()
+                return ParseResult("", "memory", time.perf_counter() - t0, f"rss {rss // 2**20} MB")
+        line = self.proc.stdout.readline()
+        elapsed = time.perf_counter() - t0
+        try:
+            reply = json.loads(line)
+        except ValueError:
+            self.kill()
+            return ParseResult("", "crashed", elapsed, f"exit code {self.proc.poll()}")
+        rss = _rss(self.proc.pid)
+        if rss is not None and rss > max_rss:
+            self.stop()  # finished, but left too big to keep
+        return ParseResult(reply["text"], reply["status"], elapsed, reply.get("detail", ""),
+                           tuple(map(tuple, reply.get("pages", ()))))
+
+    @property
+    def alive(self) -> bool:
+        return self.proc.poll() is None
+
+    def kill(self):
+        self.proc.kill()
+        self.proc.wait()
+        for pipe in (self.proc.stdin, self.proc.stdout):
+            try:
+                pipe.close()
+            except OSError:
+                pass
+
+    def stop(self):
+        try:
+            self.proc.stdin.close()  # EOF ends the worker's read loop
+            self.proc.wait(timeout=1)
+        except (OSError, subprocess.TimeoutExpired):
+            self.kill()
+
+class ParserPool:
+    """
+    At most `size` workers. The queue holds idle workers and None for each free
+    slot, so a caller either reuses a worker, starts one in a free slot, or
+    waits (up to PARSER_TIMEOUT_SECONDS) for one to be checked back in.
+    """
+
+    def __init__(self, size: int):
+        self._idle = queue.LifoQueue()
+        for _ in range(size):
+            self._idle.put(None)
+
+    def parse(self, path: str, file_format: str) -> ParseResult:
+        timeout, t0 = _setting("PARSER_TIMEOUT_SECONDS", 20), time.perf_counter()
+        try:
+            worker = self._idle.get(timeout=timeout)
+        except queue.Empty:
+            return ParseResult("", "timeout", time.perf_counter() - t0, "no parser worker free")
+        try:
+            if worker is None:
+                worker = _Worker(timeout)
+            result = worker.parse(path, file_format, timeout, _setting("PARSER_MAX_RSS_MB", 512) * 2**20)
+        except BaseException:
+            if worker is not None:
+                worker.kill()
+            self._idle.put(None)
+            raise
+        if worker.alive and worker.done < _setting("PARSER_MAX_DOCS_PER_WORKER", 50):
+            self._idle.put(worker)
+        else:
+            if worker.alive:
+                worker.stop()
+            self._idle.put(None)
+        return result
+
+    def close(self):
+        while True:
+            try:
+                worker = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            if worker is not None:
+                worker.stop()
+
+_pool: Optional[ParserPool] = None
+_pool_lock = threading.Lock()
+
+def _get_pool() -> Optional[ParserPool]:
+    global _pool
+    size = _setting("PARSER_WORKERS", 2)
+    if size <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = ParserPool(size)
+        return _pool
+
+def _parse_in_process(path: str, file_format: str) -> ParseResult:
+    t0 = time.perf_counter()
+    try:
+        (text, pages), status, detail = extract_document(path, file_format), "ok", ""
+    except MemoryError:
+        text, pages, status, detail = "", [], "memory", "MemoryError"
+    except Exception as e:
+        text, pages, status, detail = "", [], "error", f"{type(e).__name__}: {e}"
+    return ParseResult(text, status, time.perf_counter() - t0, detail, tuple(pages))
+
+def parse(path: str, file_format: str) -> ParseResult:
+    """Extract text from an upload within the configured limits; never raises."""
+    pool = _get_pool()
+    if pool is None:
+        result = _parse_in_process(path, file_format)
+    else:
+        try:
+            result = pool.parse(path, file_format)
+        except (OSError, RuntimeError) as e:  # worker could not be started
+            result = ParseResult("", "crashed", 0.0, str(e))
+    _record(file_format.lower(), path, result)
+    if not result.ok:
+        logger.warning("parse %s %s: %s %s (%.2fs)", file_format, path, result.status, result.detail, result.seconds)
+    return result
+
+# ---------- metrics ----------
+_lock = threading.Lock()
+_totals = defaultdict(lambda: {"documents": defaultdict(int), "seconds": 0.0, "bytes": 0})
+
+def _record(file_format: str, path: str, result: ParseResult):
+    try:
+        size = os.path.getsize(path)
+    except OSError:
+        size = 0
+    with _lock:
+        t = _totals[file_format]
+        t["documents"][result.status] += 1
+        t["seconds"] += result.seconds
+        t["bytes"] += size
+
+def stats() -> dict:
+    """Per-format totals for this process: documents by status, seconds, bytes and derived throughput."""
+    with _lock:
+        out = {}
+        for fmt, t in _totals.items():
+            n = sum(t["documents"].values())
+            out[fmt] = {
+                "documents": dict(t["documents"]),
+                "seconds": round(t["seconds"], 3),
+                "bytes": t["bytes"],
+                "docs_per_second": round(n / t["seconds"], 2) if t["seconds"] else 0.0,
+                "mb_per_second": round(t["bytes"] / 2**20 / t["seconds"], 2) if t["seconds"] else 0.0,
+            }
+        return out
+
+def metric_gauges() -> dict:
+    """stats() as {name: [(labels, value)]} for instrumentation.metrics_text."""
+    gauges = defaultdict(list)
+    for fmt, s in stats().items():
+        for status, n in s["documents"].items():
+            gauges["jobhack_parse_documents_total"].append(({"format": fmt, "status": status}, n))
+        gauges["jobhack_parse_seconds_total"].append(({"format": fmt}, s["seconds"]))
+        gauges["jobhack_parse_bytes_total"].append(({"format": fmt}, s["bytes"]))
+    return dict(gauges)
@@ -0,0 +1,164 @@
+"""
+Optional hash partitioning of MatchScore by user_id (PostgreSQL only).
+
+    python manage.py partition_matchscores --partitions 16
+
+partition(n) rewrites core_matchscore as a table PARTITION BY HASH (user_id)
+with n partitions core_matchscore_p0..p{n-1}. Every row of one user lands in
+the same partition, so a per-user recompute's upserts, index updates and
+dead tuples stay in one small table that vacuums on its own. The primary key
+becomes (user_id, id) because PostgreSQL requires the partition key in every
+unique constraint; Django still treats `id` as the key, and the (user, job)
+unique constraint the upserts conflict on is unchanged.
+
+rebuild(remainder) recomputes one whole partition into a staging table and
+swaps it in with DETACH/ATTACH, instead of updating every row in place. All
+validation happens on the staging table first, so the swap transaction only
+holds its locks for catalog updates.
+"""
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from django.db import connection, transaction
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+TABLE = "core_matchscore"
+FOREIGN_KEYS = (("user_id", "core_user"), ("job_id", "core_joblisting"))
+
+def _partition_name(remainder: int) -> str:
+    return f"{TABLE}_p{remainder}"
+
+def partition_count(conn=connection) -> int:
+    """Number of hash partitions of core_matchscore; 0 when it is a plain table (or not PostgreSQL)."""
+    if conn.vendor != "postgresql":
+        return 0
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT (SELECT count(*) FROM pg_inherits WHERE inhparent = p.partrelid) "
+            "FROM pg_partitioned_table p WHERE p.partrelid = to_regclass(%s)",
+            [TABLE],
+        )
+        row = cur.fetchone()
+        return row[0] if row else 0
+
+def partition(n: int, conn=connection):
+    """Rewrite core_matchscore as n hash partitions, copying existing rows (one transaction)."""
+    if conn.vendor != "postgresql":
+        raise RuntimeError("MatchScore partitioning needs PostgreSQL")
+    if n < 2:
+        raise ValueError("use at least 2 partitions")
+    if partition_count(conn):
+        raise RuntimeError(f"{TABLE} is already partitioned")
+    new = f"{TABLE}_partitioned"
+    with transaction.atomic(using=conn.alias), conn.cursor() as cur:
+        cur.execute(f"LOCK TABLE {TABLE} IN EXCLUSIVE MODE")  # reads continue, writers wait for the swap
+        cur.execute(f"CREATE SEQUENCE {new}_id_seq")
+        cur.execute(f"""
+            CREATE TABLE {new} (
+                id bigint NOT NULL DEFAULT nextval('{new}_id_seq'),
+                score_percentage smallint NOT NULL CHECK (score_percentage >= 0),
+                updated_at timestamp with time zone NOT NULL,
+                job_id bigint NOT NULL REFERENCES core_joblisting (id) DEFERRABLE INITIALLY DEFERRED,
+                user_id bigint NOT NULL REFERENCES core_user (id) DEFERRABLE INITIALLY DEFERRED,
+                PRIMARY KEY (user_id, id),
+                CONSTRAINT {TABLE}_user_job_uniq UNIQUE (user_id, job_id)
+            ) PARTITION BY HASH (user_id)
+        """)
+        cur.execute(f"CREATE INDEX {TABLE}_job_idx ON {new} (job_id)")
+        for r in range(n):
+            cur.execute(f"CREATE TABLE {_partition_name(r)} PARTITION OF {new} "
+                        f"FOR VALUES WITH (MODULUS {n}, REMAINDER {r})")
+        cur.execute(f"INSERT INTO {new} (id, score_percentage, updated_at, job_id, user_id) "
+                    f"SELECT id, score_percentage, updated_at, job_id, user_id FROM {TABLE}")
+        cur.execute(f"SELECT setval('{new}_id_seq', COALESCE((SELECT max(id) FROM {new}), 0) + 1, false)")
+        cur.execute(f"DROP TABLE {TABLE}")
+        cur.execute(f"ALTER TABLE {new} RENAME TO {TABLE}")
+        cur.execute(f"ALTER SEQUENCE {new}_id_seq RENAME TO {TABLE}_id_seq")
+        cur.execute(f"ALTER SEQUENCE {TABLE}_id_seq OWNED BY {TABLE}.id")
+    logger.info("partitioned %s into %d partitions", TABLE, n)
+
+def users_in(remainder: int, conn=connection) -> List[int]:
+    """Ids of the users whose scores live in partition `remainder`."""
+    n = partition_count(conn)
+    with conn.cursor() as cur:
+        cur.execute("SELECT id FROM core_user WHERE satisfies_hash_partition(%s::regclass, %s, %s, id) ORDER BY id",
+                    [TABLE, n, remainder])
+        return [row[0] for row in cur.fetchall()]
+
+def rebuild(remainder: int, score_pages: Callable[[List[int]], Iterable[List[Tuple[int, int, int]]]],
+            conn=connection) -> Dict[str, int]:
+    """
+    Recompute partition `remainder` into a staging table and swap it in.
+
+    `score_pages(user_ids)` yields lists of (user_id, job_id, score). Scores
+    written to the live partition while the staging table fills are lost in
+    the swap; the caller re-queues the user and job passes that may have
+    written them (see tasks.rebuild_score_partition).
+    """
+    n = partition_count(conn)
+    if not n:
+        raise RuntimeError(f"{TABLE} is not partitioned")
+    live, staging = _partition_name(remainder), f"{_partition_name(remainder)}_staging"
+    users = users_in(remainder, conn)
+    now, rows = timezone.now(), 0
+    with conn.cursor() as cur:
+        cur.execute(f"DROP TABLE IF EXISTS {staging}")
+        # No indexes while loading; ATTACH builds them to match the parent's
+        cur.execute(f"CREATE TABLE {staging} (LIKE {TABLE} INCLUDING DEFAULTS INCLUDING CONSTRAINTS)")
+        for page in score_pages(users):
+            cur.executemany(
+                f"INSERT INTO {staging} (score_percentage, updated_at, job_id, user_id) VALUES (%s, %s, %s, %s)",
+                [(score, now, job_id, user_id) for user_id, job_id, score in page],
+            )
+            rows += len(page)
+        cur.execute(f"ALTER TABLE {staging} ADD PRIMARY KEY (user_id, id)")
+        cur.execute(f"ALTER TABLE {staging} ADD UNIQUE (user_id, job_id)")
+        cur.execute(f"CREATE INDEX ON {staging} (job_id)")
+        # ATTACH skips its own scans when staging already has a valid CHECK
+        # implying the partition bound and validated copies of the parent's
+        # foreign keys. Validating here only locks staging (and ROW SHARE on
+        # the referenced tables), so the swap below touches catalogs only.
+        bound = f"{live}_bound"
+        cur.execute(f"ALTER TABLE {staging} ADD CONSTRAINT {bound} "
+                    f"CHECK (satisfies_hash_partition('{TABLE}'::regclass, {n}, {remainder}, user_id)) NOT VALID")
+        cur.execute(f"ALTER TABLE {staging} VALIDATE CONSTRAINT {bound}")
+        for column, parent in FOREIGN_KEYS:
+            cur.execute(f"ALTER TABLE {staging} ADD CONSTRAINT {live}_{column}_fk FOREIGN KEY ({column}) "
+                        f"REFERENCES {parent} (id) DEFERRABLE INITIALLY DEFERRED NOT VALID")
+        # The keys now refuse new orphans (a user or job delete that would
+        # leave one fails until the swap); drop those from deletes during the fill
+        cur.execute(f"DELETE FROM {staging} s WHERE NOT EXISTS (SELECT 1 FROM core_user u WHERE u.id = s.user_id) "
+                    f"OR NOT EXISTS (SELECT 1 FROM core_joblisting j WHERE j.id = s.job_id)")
+        for column, _ in FOREIGN_KEYS:
+            cur.execute(f"ALTER TABLE {staging} VALIDATE CONSTRAINT {live}_{column}_fk")
+    with transaction.atomic(using=conn.alias), conn.cursor() as cur:
+        # ATTACH locks the referenced tables too; take those locks before
+        # core_matchscore's, in the order a delete does (user/job row, then its
+        # scores), so the swap can't deadlock with one
+        cur.execute("LOCK TABLE core_user, core_joblisting IN SHARE ROW EXCLUSIVE MODE")
+        cur.execute(f"ALTER TABLE {TABLE} DETACH PARTITION {live}")
+        cur.execute(f"ALTER TABLE {TABLE} ATTACH PARTITION {staging} "
+                    f"FOR VALUES WITH (MODULUS {n}, REMAINDER {remainder})")
+        cur.execute(f"ALTER TABLE {staging} DROP CONSTRAINT {bound}")  # the partition bound says the same
+        cur.execute(f"DROP TABLE {live}")
+        cur.execute(f"ALTER TABLE {staging} RENAME TO {live}")
+    logger.info("rebuilt %s: %d users, %d rows", live, len(users), rows)
+    return {"partition": remainder, "users": len(users), "rows": rows}
+
+def sizes(conn=connection) -> Optional[dict]:
+    """Table/index bytes for core_matchscore and each partition (PostgreSQL only)."""
+    if conn.vendor != "postgresql":
+        return None
+    names = [TABLE] + [_partition_name(r) for r in range(partition_count(conn))]
+    out = {}
+    with conn.cursor() as cur:
+        for name in names:
+            cur.execute(
+                "SELECT coalesce(sum(pg_table_size(c.oid)), 0), coalesce(sum(pg_indexes_size(c.oid)), 0) "
+                "FROM pg_partition_tree(%s::regclass) t JOIN pg_class c ON c.oid = t.relid",
+                [name],
+            )
+            table, indexes = cur.fetchone()
+            out[name] = {"table_bytes": int(table), "index_bytes": int(indexes)}
+    return out
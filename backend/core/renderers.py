@@ -0,0 +1,44 @@
+"""
+orjson-backed JSON renderer/parser (FAST_JSON=1).
+
+Drop-in replacements for DRF's JSONRenderer/JSONParser that produce the same
+bytes for API responses, several times faster on large listings. Anything
+orjson can't encode (Decimal, lazy translation strings, querysets...) goes
+through DRF's own encoder. Without orjson installed, or when the client asks
+for indented output or non-compact/ASCII settings are on, they behave exactly
+like the DRF classes they extend.
+"""
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser, get_encoding
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if (orjson is None or self.ensure_ascii or not self.compact
+                or self.get_indent(accepted_media_type, renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        if data is None:
+            return b''
+        ret = orjson.dumps(data, default=self.encoder_class().default,
+                           option=orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS)
+        # Same strict-javascript-subset escaping as JSONRenderer
+        if b'\xe2\x80\xa8' in ret or b'\xe2\x80\xa9' in ret:
+            ret = ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+        return ret
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if (orjson is None or not self.strict
+                or get_encoding(parser_context or {}).lower().replace('-', '').replace('_', '') != 'utf8'):
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
@@ -0,0 +1,75 @@
+"""
+Read-replica routing.
+
+ReplicaRouter sends reads to one of DATABASE_REPLICAS only inside an explicit
+read scope: views decorated with @replica_reads (listing, detail, batch,
+facets) and the bulk scans in core.tasks wrapped in `with replica():`.
+Everything else, and every write, stays on "default". With no replicas
+configured the router is a no-op.
+
+Read-your-writes: pin(user_id) after a write the user will look for (resume
+upload, upgrade, scores ready) keeps that user's reads on the primary for
+DB_REPLICA_STICKY_SECONDS, longer than the replicas are expected to lag.
+"""
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from django.conf import settings
+from django.core.cache import cache
+
+STICKY_KEY = "jobhack:db:sticky:{}"
+
+_reads: ContextVar = ContextVar("replica_reads", default=None)
+
+def replicas():
+    return getattr(settings, "DATABASE_REPLICAS", [])
+
+def pin(user_id):
+    """Keep `user_id`'s reads on the primary for a while (read-your-writes)."""
+    if user_id and replicas():
+        cache.set(STICKY_KEY.format(user_id), 1, getattr(settings, "DB_REPLICA_STICKY_SECONDS", 15))
+
+def is_pinned(user_id) -> bool:
+    return bool(user_id) and bool(cache.get(STICKY_KEY.format(user_id)))
+
+@contextmanager
+def replica(user_id=None):
+    """Route reads in this block to a replica, unless `user_id` is pinned to the primary."""
+    alias = None
+    if replicas() and not is_pinned(user_id):
+        alias = random.choice(replicas())
+    token = _reads.set(alias)
+    try:
+        yield alias or "default"
+    finally:
+        _reads.reset(token)
+
+@contextmanager
+def primary():
+    """Force reads in this block back to the primary, e.g. inside a replica-scoped view."""
+    token = _reads.set(None)
+    try:
+        yield
+    finally:
+        _reads.reset(token)
+
+def replica_reads(view):
+    """For DRF function views (apply under @api_view): the view's reads go to a replica."""
+    @wraps(view)
+    def wrapped(request, *args, **kwargs):
+        user = request.user
+        with replica(user.id if user.is_authenticated else None):
+            return view(request, *args, **kwargs)
+    return wrapped
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        # "default" outside a read scope, even for objects that were loaded from a replica
+        return _reads.get() or "default"
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # replicas hold the same data as the primary
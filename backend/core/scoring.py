@@ -1,42 +1,66 @@
 import re
-from typing import Dict, List, Tuple
-from PyPDF2 import PdfReader
-from docx import Document
+from typing import List, Set, Tuple
+
+def _image_count(page) -> int:
+    try:
+        xobjects = page["/Resources"]["/XObject"].get_object()
+        return sum(1 for x in xobjects.values() if x.get_object().get("/Subtype") == "/Image")
+    except Exception:
+        return 0
+
+def extract_document(path: str, file_format: str) -> Tuple[str, List[Tuple[int, int]]]:
+    """Text of a PDF or DOCX upload plus (characters, images) per PDF page; parser errors propagate."""
+    # Parsers are imported here, not at module load: web processes import this
+    # module for keyword_score but parse in core.parse_worker subprocesses
+    fmt = file_format.lower()
+    if fmt == "pdf":
+        from PyPDF2 import PdfReader
+        texts, pages = [], []
+        for p in PdfReader(path).pages:
+            t = p.extract_text() or ""
+            texts.append(t)
+            pages.append((len(t.strip()), _image_count(p)))
+        return "".join(texts), pages
+    if fmt in {"docx", "doc"}:
+        from .docx_text import docx_text
+        return docx_text(path), []
+    return "", []
+
+def extract_text(path: str, file_format: str) -> str:
+    """Text of a PDF or DOCX upload; "" for other formats. Parser errors propagate."""
+    return extract_document(path, file_format)[0]
 
 def extract_text_from_upload(path: str, file_format: str) -> str:
-    text = ""
     try:
-        if file_format.lower() == "pdf":
-            reader = PdfReader(path)
-            for p in reader.pages:
-                text += p.extract_text() or ""
-        elif file_format.lower() in {"docx", "doc"}:
-            doc = Document(path)
-            text = "\n".join(p.text for p in doc.paragraphs)
-        else:
-            return ""
+        return extract_text(path, file_format)
     except Exception:
         return ""
-    return text
 
-def ats_friendly_heuristics(text: str, file_format: str) -> Tuple[bool, List[str]]:
-    issues = []
-    if not text.strip():
-        issues.append("Text not extractable (scanned image or unsupported PDF).")
-    if file_format.lower() == "pdf" and len(re.findall(r"\s{3,}", text)) > 50:
-        issues.append("Irregular spacing detected (possible multi-column/table layout).")
-    ok = len(issues) == 0
-    return ok, issues
+def title_tokens(title: str) -> List[str]:
+    return [t for t in re.split(r"[^a-zA-Z0-9]+", title.lower()) if t]
 
-def keyword_score(resume_text: str, title: str, keywords: List[str]) -> int:
-    rt = resume_text.lower()
+def _percent(hit: int, n_keywords: int, rt: str, title: str) -> int:
     score = 0
-    total = max(1, len(keywords) + 2)  # 2 for title weight
-    hit = sum(1 for k in keywords if k.lower() in rt)
+    total = max(1, n_keywords + 2)  # 2 for title weight
     score += hit
     # title boost if resume mentions title words
-    title_tokens = [t for t in re.split(r"[^a-zA-Z0-9]+", title.lower()) if t]
-    title_hits = sum(1 for t in title_tokens if t in rt)
+    title_hits = sum(1 for t in title_tokens(title) if t in rt)
     score += min(2, title_hits)  # cap title bonus at 2
     pct = int(round(100 * score / total))
     return min(100, max(0, pct))
+
+def keyword_score(resume_text: str, title: str, keywords: List[str]) -> int:
+    rt = resume_text.lower()
+    keywords = {k.lower() for k in keywords}  # a repeated keyword counts once, as with Keyword ids
+    hit = sum(1 for k in keywords if k in rt)
+    return _percent(hit, len(keywords), rt, title)
+
+def keyword_score_forms(resume_text: str, title: str, forms: List[Tuple[str, ...]]) -> int:
+    """keyword_score_ids without ids, for lowercased text; `forms` is vocabulary.keyword_forms(...)."""
+    hit = sum(1 for group in forms if any(f in resume_text for f in group))
+    return _percent(hit, len(forms), resume_text, title)
+
+def keyword_score_ids(resume_text: str, title: str, keyword_ids: List[int], present: Set[int]) -> int:
+    """keyword_score on Keyword ids, for lowercased text; `present` is Vocabulary.present(resume_text)."""
+    hit = sum(1 for k in keyword_ids if k in present)
+    return _percent(hit, len(keyword_ids), resume_text, title)
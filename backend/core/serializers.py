@@ -19,7 +19,13 @@ class JobListingSerializer(serializers.ModelSerializer):
     match_score = serializers.IntegerField(read_only=True, required=False)
     class Meta:
         model = JobListing
-        fields = ("id","title","company","location","description","keywords","match_score","created_at")
+        fields = ("id","title","company","location","description","keywords","match_score","created_at","expires_at")
+    def __init__(self, *args, fields=None, **kwargs):
+        # fields: optional subset to serialize (sparse fieldsets)
+        super().__init__(*args, **kwargs)
+        if fields is not None:
+            for name in set(self.fields) - set(fields):
+                self.fields.pop(name)
 
 class ResumeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -1,10 +1,40 @@
-from django.db.models.signals import post_save
+from collections import Counter
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
+from . import catalog, facets, vocabulary
 from .models import JobListing
-from .tasks import compute_match_scores_for_job
+from .tasks import compute_match_scores_for_job, rebuild_catalog_snapshot
+
+@receiver(pre_save, sender=JobListing)
+def _job_saving(sender, instance, **kwargs):
+    # Facet values as stored, so post_save can move the counts
+    instance._facets_before = Counter()
+    if not instance._state.adding and not facets.is_deferred():
+        old = (JobListing.objects.filter(pk=instance.pk)
+               .values_list("location", "company", "keywords", "is_active").first())
+        if old and old[3]:
+            instance._facets_before = facets.values_for(*old[:3])
 
 @receiver(post_save, sender=JobListing)
-def _job_saved(sender, instance, created, **kwargs):
-    if created:
+def _job_saved(sender, instance, created, update_fields=None, **kwargs):
+    if created or update_fields is None or "keywords" in update_fields:
+        vocabulary.link_jobs([instance])  # before the score fan-out reads the links
+    facets.apply(getattr(instance, "_facets_before", Counter()), facets.job_values(instance))
+    if created or getattr(instance, "_reactivated", False):  # archival may have purged its scores
         compute_match_scores_for_job.delay(instance.id)
+    transaction.on_commit(catalog.job_created if created else catalog.job_changed)
+    _schedule_snapshot_rebuild()
+
+@receiver(post_delete, sender=JobListing)
+def _job_deleted(sender, instance, **kwargs):
+    facets.apply(facets.job_values(instance), Counter())
+    transaction.on_commit(catalog.job_changed)
+    _schedule_snapshot_rebuild()
 
+def _schedule_snapshot_rebuild():
+    # One delayed rebuild covers a burst of writes (e.g. a bulk import)
+    if getattr(settings, "CATALOG_SNAPSHOT_PATH", "") and cache.add(catalog.REBUILD_PENDING_KEY, 1, 300):
+        transaction.on_commit(lambda: rebuild_catalog_snapshot.apply_async(countdown=5))
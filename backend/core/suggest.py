@@ -0,0 +1,136 @@
+"""
+Search-as-you-type suggestions for job titles, companies and locations.
+
+Each process keeps a sorted term dictionary per field: every distinct value
+is indexed under each of its word starts ("San Francisco, CA" under "san
+francisco, ca", "francisco, ca" and "ca"), so a prefix lookup is a bisect
+plus a scan of the matching range, ranked by how many jobs use the value.
+It follows the catalog's version stamps: new jobs are folded in
+incrementally, updates/deletes trigger a rebuild from GROUP BY counts.
+"""
+import heapq
+import re
+import threading
+import time
+from bisect import bisect_left, insort
+from typing import Dict, List, Optional, Tuple
+from django.conf import settings
+from django.db.models import Count
+
+from .catalog import APPEND_LOOKBACK, _stamps
+from .routing import primary
+
+FIELDS = ("title", "company", "location")
+_WORD = re.compile(r"\w+")
+# Answers for prefixes this short are memoized: their ranges are the widest
+MEMO_PREFIX_LEN = 2
+
+class _FieldIndex:
+    def __init__(self):
+        self.counts: Dict[str, List] = {}  # lowercased value -> [display value, job count]
+        self.keys: List[Tuple[str, str]] = []  # (word-start suffix, lowercased value), sorted
+
+    def add(self, value: str, n: int = 1, sort: bool = True):
+        """Count `value`; new keys are insorted, or just appended with sort=False (call finish() after)."""
+        value = (value or "").strip()
+        low = value.lower()
+        if not low:
+            return
+        entry = self.counts.get(low)
+        if entry:
+            entry[1] += n
+            return
+        self.counts[low] = [value, n]
+        add = insort if sort else list.append
+        for m in _WORD.finditer(low):
+            add(self.keys, (low[m.start():], low))
+
+    def finish(self):
+        self.keys.sort()
+
+    def top(self, prefix: str, limit: int) -> List[Tuple[str, int]]:
+        seen = set()
+        i = bisect_left(self.keys, (prefix,))
+        while i < len(self.keys) and self.keys[i][0].startswith(prefix):
+            seen.add(self.keys[i][1])
+            i += 1
+        best = heapq.nlargest(limit, seen, key=lambda low: (self.counts[low][1], low))
+        return [tuple(self.counts[low]) for low in best]
+
+class SuggestIndex:
+    def __init__(self, version: int = 0, generation: int = 0):
+        self.version = version
+        self.generation = generation
+        self.fields = {f: _FieldIndex() for f in FIELDS}
+        self.max_id = 0
+        self._recent = set()  # ids within APPEND_LOOKBACK of max_id, to skip re-reads
+        self._memo = {}
+
+    def add_job(self, job_id: int, **values):
+        if job_id in self._recent or job_id <= self.max_id - APPEND_LOOKBACK:
+            return
+        for f in FIELDS:
+            self.fields[f].add(values[f])
+        self._recent.add(job_id)
+        if job_id > self.max_id:
+            self.max_id = job_id
+            floor = job_id - APPEND_LOOKBACK
+            self._recent = {i for i in self._recent if i > floor}
+        self._memo.clear()
+
+    def suggest(self, q: str, fields=FIELDS, limit: int = 10) -> Dict[str, List[dict]]:
+        prefix = " ".join(q.lower().split())
+        out = {}
+        for f in fields:
+            key = (f, prefix, limit)
+            hits = self._memo.get(key) if len(prefix) <= MEMO_PREFIX_LEN else None
+            if hits is None:
+                hits = self.fields[f].top(prefix, limit) if prefix else []
+                if len(prefix) <= MEMO_PREFIX_LEN:
+                    if len(self._memo) > 10000:
+                        self._memo.clear()
+                    self._memo[key] = hits
+            out[f] = [{"value": value, "count": n} for value, n in hits]
+        return out
+
+def build_index() -> SuggestIndex:
+    from .models import JobListing
+    version, generation = _stamps()
+    index = SuggestIndex(version, generation)
+    active = JobListing.objects.active()
+    index.max_id = active.order_by("-id").values_list("id", flat=True).first() or 0
+    index._recent = set(active.filter(id__gt=index.max_id - APPEND_LOOKBACK).values_list("id", flat=True))
+    # Count only up to max_id; later rows arrive through the incremental path
+    jobs = active.filter(id__lte=index.max_id)
+    for f in FIELDS:
+        for value, n in jobs.values_list(f).annotate(n=Count("id")).order_by():
+            index.fields[f].add(value, n, sort=False)
+        index.fields[f].finish()
+    return index
+
+def _refresh(index: Optional[SuggestIndex]) -> SuggestIndex:
+    from .models import JobListing
+    version, generation = _stamps()
+    if index is None or generation != index.generation:
+        return build_index()
+    if version != index.version:
+        rows = (JobListing.objects.active().filter(id__gt=index.max_id - APPEND_LOOKBACK).order_by("id")
+                .values_list("id", *FIELDS))
+        for job_id, *values in rows:
+            index.add_job(job_id, **dict(zip(FIELDS, values)))
+        index.version = version
+    return index
+
+_lock = threading.Lock()
+_index: Optional[SuggestIndex] = None
+_checked_at = 0.0
+
+def get_index() -> SuggestIndex:
+    """This process's suggestion index, re-checked like the catalog snapshot (CATALOG_REFRESH_INTERVAL)."""
+    global _index, _checked_at
+    interval = getattr(settings, "CATALOG_REFRESH_INTERVAL", 1.0)
+    if _index is not None and time.monotonic() - _checked_at < interval:
+        return _index
+    with _lock, primary():
+        _index, _checked_at = _refresh(_index), time.monotonic()
+        return _index
@@ -1,10 +1,77 @@
 from typing import List
 from celery import shared_task
-from django.contrib.auth import get_user_model
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Max, Q
+from django.utils import timezone
+from . import catalog, events, facets, instrumentation, lifecycle, parsing, partitions, vocabulary  # noqa: F401  (instrumentation registers task hooks)
+from .locks import rerun_pending, single_flight
+from .routing import pin, replica
 from .models import Resume, JobListing, MatchScore
-from .scoring import extract_text_from_upload, keyword_score
+from .scoring import keyword_score_ids
 
-User = get_user_model()
+def _page_size() -> int:
+    return getattr(settings, "SCORING_PAGE_SIZE", 2000)
+
+def _iter_job_pages():
+    """Yield (id, title, keyword ids) tuples in id-keyset pages; memory stays bounded by one page."""
+    last_id, size = 0, _page_size()
+    while True:
+        with replica():  # scoped per page: a generator must not hold the read scope across yields
+            page = list(
+                JobListing.objects.active().filter(id__gt=last_id).order_by("id")
+                .values_list("id", "title")[:size]
+            )
+            terms = vocabulary.job_terms(job_id for job_id, _ in page)
+        if not page:
+            return
+        yield [(job_id, title, terms.get(job_id, [])) for job_id, title in page]
+        last_id = page[-1][0]
+
+def _text_chunk() -> int:
+    return getattr(settings, "SCORING_TEXT_CHUNK", 100)
+
+def _iter_latest_resume_pages():
+    """Yield (user_id, resume_id) for each user's latest resume, keyset-paged by user_id; no texts."""
+    last_user, size = 0, _page_size()
+    while True:
+        with replica():
+            page = list(
+                Resume.objects.filter(user_id__gt=last_user)
+                .order_by("user_id", "-uploaded_at").distinct("user_id")
+                .values_list("user_id", "id")[:size]
+            )
+        if not page:
+            return
+        yield page
+        last_user = page[-1][0]
+
+def _resume_texts(latest):
+    """Yield (user_id, lowercased text) for (user_id, resume_id) pairs, loading SCORING_TEXT_CHUNK texts at a time."""
+    chunk = _text_chunk()
+    for i in range(0, len(latest), chunk):
+        part = latest[i:i + chunk]
+        with replica():
+            texts = dict(Resume.objects.filter(id__in=[resume_id for _, resume_id in part]).values_list("id", "text"))
+        for user_id, resume_id in part:
+            text = texts.get(resume_id)
+            if not text:
+                parse_resume_if_needed(resume_id)
+                text = Resume.objects.filter(id=resume_id).values_list("text", flat=True).first()
+            yield user_id, (text or "").lower()
+
+def _upsert_scores(rows: List[MatchScore]):
+    """
+    Insert-or-update in one statement; concurrent writers can't collide on (user, job).
+    Rows go in (user, job) order: per-user and per-job passes then lock rows in the
+    same order (no deadlocks), and with partitioning a user's rows form one run.
+    """
+    if rows:
+        rows.sort(key=lambda r: (r.user_id, r.job_id))
+        MatchScore.objects.bulk_create(
+            rows, update_conflicts=True, unique_fields=["user", "job"],
+            update_fields=["score_percentage", "updated_at"],
+        )
 
 @shared_task
 def parse_resume_if_needed(resume_id: int):
@@ -24,47 +91,113 @@ def parse_resume_if_needed(resume_id: int):
             tmp.write(chunk)
         tmp.close()
         path = tmp.name
-    text = extract_text_from_upload(path, res.file_format or "pdf")
-    res.text = (text or "")[:200000]
+    text = parsing.parse(path, res.file_format or "pdf").text
+    res.text = text[:200000]
     res.save(update_fields=["text"])
 
 @shared_task
 def compute_match_scores_for_user(user_id: int):
     """Precompute MatchScore for all jobs for a user (uses latest resume)."""
-    try:
-        user = User.objects.get(id=user_id)
-    except User.DoesNotExist:
-        return
-    resume = Resume.objects.filter(user=user).order_by("-uploaded_at").first()
+    single_flight(_user_key(user_id), lambda: _compute_for_user(user_id))
+
+def _user_key(user_id: int) -> str:
+    return f"scores:user:{user_id}"
+
+def _compute_for_user(user_id: int):
+    resume = Resume.objects.filter(user_id=user_id).order_by("-uploaded_at").only("id", "text").first()
     if not resume:
+        events.publish(user_id, {"type": "ready", "scored": 0})
         return
     if not resume.text:
         parse_resume_if_needed(resume.id)
+        resume.refresh_from_db(fields=["text"])
 
     rt = (resume.text or "").lower()
-    jobs: List[JobListing] = list(JobListing.objects.all().only("id","title","keywords"))
-    for job in jobs:
-        score = keyword_score(rt, job.title, job.keywords or [])
-        obj, _ = MatchScore.objects.get_or_create(user=user, job=job, defaults={"score_percentage": score})
-        if obj.score_percentage != score:
-            obj.score_percentage = score
-            obj.save(update_fields=["score_percentage"])
+    present = vocabulary.Vocabulary.load().present(rt)
+    total, done = JobListing.objects.active().count(), 0
+    for page in _iter_job_pages():
+        _upsert_scores([
+            MatchScore(user_id=user_id, job_id=job_id, score_percentage=keyword_score_ids(rt, title, terms, present))
+            for job_id, title, terms in page
+        ])
+        done += len(page)
+        events.publish(user_id, {"type": "progress", "scored": done, "total": max(total, done)})
+    if rerun_pending(_user_key(user_id)):
+        return  # a newer upload arrived mid-pass; the rerun scores it and sends "ready"
+    pin(user_id)  # the client refetches on "ready"; read the new scores from the primary
+    events.publish(user_id, {"type": "ready", "scored": done})
 
 @shared_task
 def compute_match_scores_for_job(job_id: int):
     """When a new job is created, precompute for all users who have a resume."""
-    try:
-        job = JobListing.objects.get(id=job_id)
-    except JobListing.DoesNotExist:
+    single_flight(f"scores:job:{job_id}", lambda: _compute_for_job(job_id))
+
+def _compute_for_job(job_id: int):
+    title = JobListing.objects.active().filter(id=job_id).values_list("title", flat=True).first()
+    if title is None:
         return
-    resumes = Resume.objects.select_related("user").order_by("-uploaded_at").distinct("user")
-    for res in resumes:
-        if not res.text:
-            parse_resume_if_needed(res.id)
-        rt = (res.text or "").lower()
-        score = keyword_score(rt, job.title, job.keywords or [])
-        obj, _ = MatchScore.objects.get_or_create(user=res.user, job=job, defaults={"score_percentage": score})
-        if obj.score_percentage != score:
-            obj.score_percentage = score
-            obj.save(update_fields=["score_percentage"])
+    terms = vocabulary.job_terms([job_id]).get(job_id, [])
+    vocab = vocabulary.Vocabulary.load(terms)  # only this job's keywords need checking
+    for page in _iter_latest_resume_pages():
+        _upsert_scores([
+            MatchScore(user_id=user_id, job_id=job_id,
+                       score_percentage=keyword_score_ids(rt, title, terms, vocab.present(rt)))
+            for user_id, rt in _resume_texts(page)
+        ])
 
+def _partition_score_pages(user_ids):
+    """(user_id, job_id, score) pages covering `user_ids` x all jobs, for partitions.rebuild()."""
+    latest = list(Resume.objects.filter(user_id__in=user_ids).order_by("user_id", "-uploaded_at")
+                  .distinct("user_id").values_list("user_id", "id"))
+    vocab = vocabulary.Vocabulary.load()
+    chunk = _text_chunk()
+    # Resumes outer, a chunk of texts at a time; the job pages are re-read per chunk
+    for c in range(0, len(latest), chunk):
+        resumes = [(user_id, rt, vocab.present(rt)) for user_id, rt in _resume_texts(latest[c:c + chunk])]
+        for page in _iter_job_pages():
+            step = max(1, _page_size() * 10 // len(page))  # bound each yielded list to ~10 pages of rows
+            for i in range(0, len(resumes), step):
+                yield [(user_id, job_id, keyword_score_ids(rt, title, terms, present))
+                       for user_id, rt, present in resumes[i:i + step] for job_id, title, terms in page]
+
+@shared_task
+def rebuild_score_partition(remainder: int):
+    """Recompute one MatchScore hash partition and swap it in (partitioned PostgreSQL only)."""
+    def run():
+        started = timezone.now()
+        last_job = JobListing.objects.aggregate(last=Max("id"))["last"] or 0
+        partitions.rebuild(remainder, _partition_score_pages)
+        # Passes that ran during the rebuild wrote into the detached partition, and
+        # the rebuild's own scan may have missed new jobs or read edited ones stale
+        changed = (Resume.objects.filter(user_id__in=partitions.users_in(remainder), uploaded_at__gte=started)
+                   .values_list("user_id", flat=True).distinct())
+        for user_id in changed:
+            compute_match_scores_for_user.delay(user_id)
+        jobs = (JobListing.objects.active().filter(Q(id__gt=last_job) | Q(updated_at__gte=started))
+                .values_list("id", flat=True))
+        for job_id in jobs:
+            compute_match_scores_for_job.delay(job_id)
+    single_flight(f"scores:partition:{remainder}", run)
+
+@shared_task
+def archive_expired_jobs():
+    """Expire due jobs, then move expired ones to ArchivedJob (periodic, JOB_ARCHIVE_INTERVAL)."""
+    def run():
+        if lifecycle.expire():
+            rebuild_catalog_snapshot.delay()  # no-op without CATALOG_SNAPSHOT_PATH
+        lifecycle.archive()
+    single_flight("jobs:archive", run)
+
+@shared_task
+def rebuild_catalog_snapshot():
+    """Rewrite the mmapped catalog file after job changes (no-op without CATALOG_SNAPSHOT_PATH)."""
+    path = getattr(settings, "CATALOG_SNAPSHOT_PATH", "")
+    if not path:
+        return
+    cache.delete(catalog.REBUILD_PENDING_KEY)
+    single_flight("catalog:rebuild", lambda: catalog.write_snapshot_file(catalog.build_snapshot(), path))
+
+@shared_task
+def rebuild_facet_counts():
+    """Recompute FacetCount from the jobs table (periodic; also after bulk imports)."""
+    single_flight("facets:rebuild", facets.rebuild)
@@ -0,0 +1,51 @@
+import zipfile
+from contextlib import ExitStack
+from urllib.parse import urlsplit
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import resolve
+
+def make_job(**fields):
+    """A saved JobListing with sensible defaults for tests; `fields` override them."""
+    from .models import JobListing
+    return JobListing.objects.create(**{"title": "Python Developer", "company": "Acme", "location": "Remote",
+                                        "description": "d", "keywords": ["python", "django"], **fields})
+
+def assert_query_budget(client, path: str, method: str = "get", warm: bool = True, **kwargs):
+    """
+    Request `path` with a Django test client and fail if it runs more SQL
+    queries than its view declares with @query_budget. `warm` issues the
+    request once first so one-off work (catalog snapshot load, token
+    version cache fill) isn't charged to the endpoint. Returns the response.
+    """
+    view = resolve(urlsplit(path).path).func
+    budget = getattr(view, "query_budget", None)
+    if budget is None:
+        raise AssertionError(f"{path} declares no query budget")
+    send = getattr(client, method.lower())
+    if warm:
+        send(path, **kwargs)
+    with ExitStack() as stack:
+        captured = [stack.enter_context(CaptureQueriesContext(conn)) for conn in connections.all()]
+        response = send(path, **kwargs)
+    queries = [q["sql"] for ctx in captured for q in ctx.captured_queries]
+    if len(queries) > budget:
+        raise AssertionError(
+            f"{method.upper()} {path} ran {len(queries)} queries, budget is {budget}:\n" + "\n".join(queries)
+        )
+    return response
+
+DOCX_NS = ('xmlns:w="http://schemas.openxmlformats.org/wordprocessingml/2006/main" '
+           'xmlns:mc="http://schemas.openxmlformats.org/markup-compatibility/2006"')
+
+def docx_paragraph(text: str) -> str:
+    return f"<w:p><w:r><w:t>{text}</w:t></w:r></w:p>"
+
+def write_docx(path, body: str, header: str = None, footer: str = None):
+    """Write a minimal .docx whose document body is the WordprocessingML `body`."""
+    with zipfile.ZipFile(path, "w") as z:
+        z.writestr("word/document.xml", f"<w:document {DOCX_NS}><w:body>{body}</w:body></w:document>")
+        if header:
+            z.writestr("word/header1.xml", f"<w:hdr {DOCX_NS}>{docx_paragraph(header)}</w:hdr>")
+        if footer:
+            z.writestr("word/footer1.xml", f"<w:ftr {DOCX_NS}>{docx_paragraph(footer)}</w:ftr>")
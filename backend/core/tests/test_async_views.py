@@ -0,0 +1,22 @@
+import json
+from django.core.cache import cache
+from django.test import AsyncRequestFactory, TestCase
+
+from core import async_views, vocabulary
+from core.testing import make_job
+
+class AsyncJobsListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.python = make_job(title="Backend Engineer", keywords=["Python"])
+        make_job(title="Frontend Engineer", keywords=["TypeScript"])
+        vocabulary.add_aliases("python", ["py"])
+
+    async def test_skill_filter_with_a_cold_alias_cache(self):
+        for skill in ("python", "py"):
+            with self.subTest(skill=skill):
+                cache.delete(vocabulary.ALIASES_KEY)  # resolving the alias now needs a query
+                response = await async_views.jobs_list(AsyncRequestFactory().get("/api/jobs/", {"skill": skill}))
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual([job["id"] for job in json.loads(response.content)], [self.python.id])
+
@@ -0,0 +1,52 @@
+from django.test import SimpleTestCase
+
+from core import ats
+
+RESUME = """Jane Doe
+jane@example.com | {phone}
+
+Experience
+Engineer, Acme 2015-2019 2020-2022
+
+Education
+BSc Computer Science
+
+Skills
+Python, Django
+"""
+
+class AtsTests(SimpleTestCase):
+    def check(self, text, file_format="docx", **kwargs):
+        return {c.name: c for c in ats.analyze(text, file_format, **kwargs).checks}
+
+    def test_clean_resume_passes(self):
+        report = ats.analyze(RESUME.format(phone="(555) 123-4567"), "pdf", pages=((900, 0),))
+        self.assertTrue(report.ok, report.issues)
+        self.assertEqual([c.name for c in report.checks],
+                         ["extractable", "image_pages", "spacing", "columns", "sections", "contact"])
+
+    def test_phone_formats(self):
+        for phone in ("(555) 123-4567", "+1 555.123.4567", "+44 20 7946 0958", "5551234567"):
+            with self.subTest(phone=phone):
+                self.assertTrue(self.check(RESUME.format(phone=phone))["contact"].passed)
+
+    def test_year_ranges_are_not_a_phone(self):
+        contact = self.check(RESUME.format(phone="Berlin"))["contact"]
+        self.assertFalse(contact.passed)
+        self.assertEqual(contact.message, "No phone number found.")
+
+    def test_unextractable(self):
+        self.assertEqual(ats.analyze("  \n", "pdf").issues, ["Text not extractable (scanned image or unsupported PDF)."])
+        self.assertEqual(ats.analyze("", "pdf", parse_issue="timed out").issues, ["timed out"])
+
+    def test_layout_checks_pdf_only(self):
+        columns = "\n".join("Python     Django     AWS" for _ in range(ats.COLUMN_LINES))
+        text = RESUME.format(phone="555-123-4567") + columns
+        checks = self.check(text, "pdf", pages=((10, 1), (10, 1), (900, 0)))
+        self.assertFalse(checks["columns"].passed)
+        self.assertFalse(checks["image_pages"].passed)
+        self.assertNotIn("columns", self.check(text, "docx"))
+
+    def test_missing_sections(self):
+        sections = self.check("jane@example.com 555-123-4567\nSkills\nPython")["sections"]
+        self.assertEqual(sections.message, "Missing section headings: experience, education.")
@@ -0,0 +1,30 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+from django.test import SimpleTestCase
+
+from core.docx_text import docx_text
+from core.testing import docx_paragraph as p, write_docx
+
+class DocxTextTests(SimpleTestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.path = os.path.join(self.dir, "cv.docx")
+
+    def test_tables_and_text_boxes(self):
+        table = f"<w:tbl><w:tr><w:tc>{p('Python')}</w:tc><w:tc>{p('Django')}</w:tc></w:tr></w:tbl>"
+        text_box = ("<w:p><w:r><w:t>Skills:</w:t></w:r><w:r><mc:AlternateContent>"
+                    f"<mc:Choice><w:txbxContent>{p('Kubernetes')}</w:txbxContent></mc:Choice>"
+                    f"<mc:Fallback><w:txbxContent>{p('Kubernetes')}</w:txbxContent></mc:Fallback>"
+                    "</mc:AlternateContent></w:r></w:p>")
+        tabs = "<w:p><w:r><w:t>A</w:t><w:tab/><w:t>B</w:t><w:br/><w:t>C</w:t><w:noBreakHyphen/><w:t>D</w:t></w:r></w:p>"
+        write_docx(self.path, p("Jane Doe") + table + text_box + "<w:p/>" + tabs, header="Header", footer="Footer")
+        self.assertEqual(docx_text(self.path).split("\n"),
+                         ["Header", "Jane Doe", "Python", "Django", "Kubernetes", "Skills:", "A\tB", "C-D", "Footer"])
+
+    def test_oversized_part_rejected(self):
+        write_docx(self.path, p("x" * 5000))
+        with mock.patch("core.docx_text.MAX_XML_BYTES", 1000), self.assertRaises(ValueError):
+            docx_text(self.path)
@@ -0,0 +1,50 @@
+import asyncio
+import json
+import uuid
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+
+from core import events
+from core.async_views import _score_stream
+from core.models import User
+from core.tokens import access_token_for
+
+def _frame(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event)}\n\n".encode()
+
+class ScoreStreamTests(SimpleTestCase):
+    def setUp(self):
+        self.user_id = f"test-{uuid.uuid4().hex}"  # stands in for a user id; keeps the status keys apart
+
+    async def test_current_status_first_then_events_until_ready(self):
+        queued = {"type": "queued"}
+        events.publish(self.user_id, queued)
+        stream = _score_stream(self.user_id)
+        self.assertEqual(await stream.__anext__(), _frame(queued))
+
+        following = asyncio.ensure_future(stream.__anext__())
+        while self.user_id not in events._memory._listeners:
+            await asyncio.sleep(0.01)
+        progress, ready = {"type": "progress", "scored": 5, "total": 10}, {"type": "ready", "scored": 10}
+        events.publish(self.user_id, progress)
+        self.assertEqual(await following, _frame(progress))
+        events.publish(self.user_id, ready)
+        self.assertEqual(await stream.__anext__(), _frame(ready))
+        with self.assertRaises(StopAsyncIteration):
+            await stream.__anext__()
+        self.assertNotIn(self.user_id, events._memory._listeners)
+
+    async def test_ready_status_ends_the_stream_at_once(self):
+        events.publish(self.user_id, {"type": "ready", "scored": 3})
+        self.assertEqual([chunk async for chunk in _score_stream(self.user_id)],
+                         [_frame({"type": "ready", "scored": 3})])
+
+class ScoreStatusTests(TestCase):
+    def test_polling_fallback(self):
+        user = User.objects.create(username="u", email="u@example.com")
+        client = self.client_class(HTTP_AUTHORIZATION=f"Bearer {access_token_for(user.id)}")
+        cache.delete(events.STATUS_KEY.format(user.id))  # the cache outlives earlier tests' users
+        self.assertEqual(client.get("/api/scores/status/").json(), {"type": "idle"})
+        events.publish(user.id, {"type": "progress", "scored": 1, "total": 2})
+        self.assertEqual(client.get("/api/scores/status/").json(), {"type": "progress", "scored": 1, "total": 2})
+        self.assertEqual(self.client.get("/api/scores/status/").status_code, 401)
@@ -0,0 +1,67 @@
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import facets, lifecycle
+from core.models import FacetCount
+from core.testing import make_job
+
+class FacetCountTests(TestCase):
+    def counts(self):
+        return {(f, v): n for f, v, n in FacetCount.objects.filter(count__gt=0).values_list("facet", "value", "count")}
+
+    def assertMatchesRebuild(self):
+        before = self.counts()
+        facets.rebuild()
+        self.assertEqual(self.counts(), before)
+
+    def test_signals_keep_counts_in_step(self):
+        job = make_job(location="Berlin", keywords=["Python", "python", "Go"])
+        make_job(location="Berlin", company="Initech")
+        self.assertEqual(self.counts(), {
+            ("location", "Berlin"): 2, ("company", "Acme"): 1, ("company", "Initech"): 1,
+            ("keyword", "python"): 2, ("keyword", "go"): 1, ("keyword", "django"): 1,
+        })
+        self.assertMatchesRebuild()
+
+        job.location, job.keywords = "Paris", ["Go"]
+        job.save()
+        self.assertEqual(self.counts()["location", "Paris"], 1)
+        self.assertEqual(self.counts()["keyword", "python"], 1)
+        self.assertMatchesRebuild()
+
+        job.delete()
+        self.assertNotIn(("location", "Paris"), self.counts())
+        self.assertMatchesRebuild()
+
+    def test_expired_jobs_drop_out(self):
+        make_job(company="Initech", expires_at=timezone.now() - timedelta(hours=1))
+        self.assertEqual(self.counts()["company", "Initech"], 1)
+        lifecycle.expire()  # a bulk update, so it rebuilds the counts itself
+        self.assertNotIn(("company", "Initech"), self.counts())
+
+    def test_deferred_writes_need_a_rebuild(self):
+        with facets.deferred():
+            make_job(company="Initech")
+        self.assertNotIn(("company", "Initech"), self.counts())
+        facets.rebuild()
+        self.assertEqual(self.counts()["company", "Initech"], 1)
+
+class FacetEndpointTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        for i in range(3):
+            make_job(location="Remote" if i else "Berlin", keywords=["python", f"skill{i}"])
+
+    def test_unfiltered_reads_the_counts(self):
+        body = self.client.get("/api/jobs/facets/?limit=1").json()
+        self.assertEqual(body, {"location": [{"value": "Remote", "count": 2}],
+                                "company": [{"value": "Acme", "count": 3}],
+                                "keyword": [{"value": "python", "count": 3}], "approximate": False})
+
+    def test_filtered_counts_the_matches(self):
+        body = self.client.get("/api/jobs/facets/?location=remote").json()
+        self.assertEqual(body["location"], [{"value": "Remote", "count": 2}])
+        self.assertFalse(body["approximate"])
+        with override_settings(FACET_SCAN_LIMIT=1):
+            self.assertTrue(self.client.get("/api/jobs/facets/?location=remote").json()["approximate"])
@@ -0,0 +1,61 @@
+from datetime import timedelta
+from unittest import mock
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from core import lifecycle
+from core.models import ArchivedJob, JobListing, MatchScore, User
+from core.testing import make_job
+
+class LifecycleTests(TestCase):
+    def setUp(self):
+        now = timezone.now()
+        self.due = make_job(title="Due", expires_at=now - timedelta(hours=1))
+        self.later = make_job(title="Later", expires_at=now + timedelta(days=1))
+        self.old = make_job(title="Old")
+        JobListing.objects.filter(pk=self.old.pk).update(created_at=now - timedelta(days=90))
+        self.user = User.objects.create(username="u", email="u@example.com")
+        MatchScore.objects.bulk_create([MatchScore(user=self.user, job=self.due, score_percentage=40)],
+                                       ignore_conflicts=True)
+
+    def active(self):
+        return set(JobListing.objects.active().values_list("title", flat=True))
+
+    def test_expire_by_date_and_age(self):
+        self.assertEqual(lifecycle.expire(), 1)
+        self.assertEqual(self.active(), {"Later", "Old"})
+        with override_settings(JOB_MAX_AGE_DAYS=30):
+            self.assertEqual(lifecycle.expire(), 1)
+        self.assertEqual(self.active(), {"Later"})
+        self.assertEqual(lifecycle.expire(), 0)
+
+    def test_archive_moves_rows_and_purges_scores(self):
+        lifecycle.expire()
+        self.assertEqual(lifecycle.archive(), {"archived": 1, "scores_purged": 1})
+        self.assertFalse(JobListing.objects.filter(pk=self.due.pk).exists())
+        archived = ArchivedJob.objects.get(pk=self.due.pk)
+        self.assertEqual((archived.title, archived.expires_at), ("Due", self.due.expires_at))
+        self.assertEqual(lifecycle.archive(), {"archived": 0, "scores_purged": 0})
+
+    def test_job_reactivated_mid_batch_stays_and_is_not_counted(self):
+        lifecycle.expire()
+        purge = lifecycle.purge_scores
+
+        def reactivate_then_purge(ids):
+            JobListing.objects.filter(pk=self.due.pk).update(is_active=True)
+            return purge(ids)
+
+        with mock.patch("core.lifecycle.purge_scores", reactivate_then_purge):
+            self.assertEqual(lifecycle.archive()["archived"], 0)
+        self.assertTrue(JobListing.objects.filter(pk=self.due.pk).exists())
+        self.assertFalse(ArchivedJob.objects.exists())
+
+    def test_extended_expiry_reactivates(self):
+        lifecycle.expire()
+        job = JobListing.objects.get(pk=self.due.pk)
+        job.save(update_fields=["title"])
+        self.assertFalse(JobListing.objects.get(pk=job.pk).is_active)
+        job.expires_at = timezone.now() + timedelta(days=7)
+        job.save(update_fields=["expires_at"])
+        self.assertTrue(JobListing.objects.get(pk=job.pk).is_active)
+        self.assertEqual(lifecycle.archive()["archived"], 0)
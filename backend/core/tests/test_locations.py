@@ -0,0 +1,28 @@
+from django.db.models import Q
+from django.test import SimpleTestCase
+
+from core.locations import ParsedLocation, location_filter, parse_location
+
+class LocationTests(SimpleTestCase):
+    def test_parse_location(self):
+        cases = {
+            "San Francisco, CA": ParsedLocation("san francisco", "CA", "US", False),
+            "Portland, Oregon": ParsedLocation("portland", "OR", "US", False),
+            "New York, NY (Hybrid)": ParsedLocation("new york", "NY", "US", False),
+            "Texas": ParsedLocation("", "TX", "US", False),
+            "Remote - US": ParsedLocation("", "", "US", True),
+            "Remote": ParsedLocation("", "", "", True),
+            "London, United Kingdom": ParsedLocation("london", "", "GB", False),
+            "Toronto, Canada": ParsedLocation("toronto", "", "CA", False),
+            "Remote, Europe": ParsedLocation("", "europe", "", True),
+            "": ParsedLocation(),
+            None: ParsedLocation(),
+        }
+        for raw, expected in cases.items():
+            with self.subTest(raw=raw):
+                self.assertEqual(parse_location(raw), expected)
+
+    def test_filter(self):
+        self.assertEqual(location_filter("CA"), Q(location_country="US") & Q(location_region="CA"))
+        self.assertEqual(location_filter("remote"), Q(is_remote=True))
+        self.assertEqual(location_filter(""), Q(pk__in=[]))  # names nothing: matches nothing
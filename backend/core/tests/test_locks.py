@@ -0,0 +1,76 @@
+import time
+import uuid
+from unittest import mock
+from django.core.cache import cache
+from django.test import SimpleTestCase
+
+from core.locks import LOCK_PREFIX, RERUN_PREFIX, rerun_pending, single_flight
+
+class SingleFlightTests(SimpleTestCase):
+    def setUp(self):
+        self.key = f"test:{uuid.uuid4().hex}"
+
+    def test_runs_and_releases(self):
+        calls = []
+        self.assertTrue(single_flight(self.key, lambda: calls.append(1)))
+        self.assertEqual(calls, [1])
+        self.assertIsNone(cache.get(LOCK_PREFIX + self.key))
+
+    def test_calls_during_a_run_collapse_into_one_rerun(self):
+        runs, seen = [], []
+
+        def fn():
+            runs.append(1)
+            if len(runs) == 1:
+                seen.append([single_flight(self.key, fn) for _ in range(3)])
+                seen.append(rerun_pending(self.key))
+
+        self.assertTrue(single_flight(self.key, fn))
+        self.assertEqual(seen, [[False, False, False], True])
+        self.assertEqual(len(runs), 2)
+        self.assertFalse(rerun_pending(self.key))
+
+    def test_lock_released_when_fn_raises(self):
+        def fail():
+            raise ValueError("boom")
+        with self.assertRaises(ValueError):
+            single_flight(self.key, fail)
+        self.assertIsNone(cache.get(LOCK_PREFIX + self.key))
+
+    def test_lock_kept_past_its_ttl_while_fn_runs(self):
+        held = []
+
+        def fn():
+            time.sleep(1.5)
+            held.append(cache.get(LOCK_PREFIX + self.key) is not None)
+
+        self.assertTrue(single_flight(self.key, fn, ttl=1))
+        self.assertEqual(held, [True])
+
+    def test_marker_left_as_the_holder_lets_go_still_runs(self):
+        runs, real_delete = [], cache.delete
+
+        def delete(key, *args, **kwargs):
+            real_delete(key, *args, **kwargs)
+            if key == LOCK_PREFIX + self.key and len(runs) == 1:
+                cache.set(RERUN_PREFIX + self.key, 1)  # a caller that found the lock still held
+
+        with mock.patch("core.locks.cache", wraps=cache) as patched:
+            patched.delete.side_effect = delete
+            self.assertTrue(single_flight(self.key, lambda: runs.append(1)))
+        self.assertEqual(len(runs), 2)
+        self.assertFalse(rerun_pending(self.key))
+
+    def test_caller_whose_holder_let_go_runs_itself(self):
+        cache.add(LOCK_PREFIX + self.key, "holder")
+        runs, real_set = [], cache.set
+
+        def set_(key, *args, **kwargs):
+            cache.delete(LOCK_PREFIX + self.key)  # the holder finished before the marker landed
+            real_set(key, *args, **kwargs)
+
+        with mock.patch("core.locks.cache", wraps=cache) as patched:
+            patched.set.side_effect = set_
+            self.assertTrue(single_flight(self.key, lambda: runs.append(1)))
+        self.assertEqual(len(runs), 1)
+        self.assertFalse(rerun_pending(self.key))
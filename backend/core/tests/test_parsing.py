@@ -0,0 +1,53 @@
+import os
+import shutil
+import subprocess
+import tempfile
+from unittest import mock, skipUnless
+from django.test import SimpleTestCase, override_settings
+
+from core import parsing
+from core.testing import docx_paragraph, write_docx
+
+@skipUnless(hasattr(os, "mkfifo"), "needs named pipes")
+@override_settings(PARSER_TIMEOUT_SECONDS=3, PARSER_MAX_RSS_MB=1024)
+class ParserPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.dir)
+        self.pool = parsing.ParserPool(1)
+        self.addCleanup(self.pool.close)
+        self.docx = os.path.join(self.dir, "cv.docx")
+        write_docx(self.docx, docx_paragraph("Python developer"))
+
+    def test_parses_in_worker(self):
+        result = self.pool.parse(self.docx, "docx")
+        self.assertTrue(result.ok, result)
+        self.assertEqual(result.text, "Python developer")
+
+    def test_hung_parse_is_killed_and_replaced(self):
+        fifo = os.path.join(self.dir, "hang.pdf")
+        os.mkfifo(fifo)  # opening it for reading blocks until a writer shows up, i.e. forever
+        with override_settings(PARSER_TIMEOUT_SECONDS=1):
+            result = self.pool.parse(fifo, "pdf")
+        self.assertEqual(result.status, "timeout")
+        self.assertTrue(result.issue.startswith("Parsing timed out"))
+        self.assertIsNone(self.pool._idle.get_nowait())  # the slot is free again, the worker gone
+        self.pool._idle.put(None)
+        self.assertTrue(self.pool.parse(self.docx, "docx").ok)
+
+    def test_no_free_worker_times_out(self):
+        self.pool._idle.get()  # the only slot is taken
+        self.addCleanup(self.pool._idle.put, None)
+        with override_settings(PARSER_TIMEOUT_SECONDS=0.2):
+            result = self.pool.parse(self.docx, "docx")
+        self.assertEqual((result.status, result.detail), ("timeout", "no parser worker free"))
+
+    def test_worker_that_never_gets_ready_is_killed(self):
+        popen = subprocess.Popen
+        procs = []
+        def sleeper(args, **kwargs):
+            procs.append(popen(["sleep", "30"], **kwargs))
+            return procs[-1]
+        with mock.patch("core.parsing.subprocess.Popen", sleeper), self.assertRaises(RuntimeError):
+            parsing._Worker(0.2)
+        self.assertIsNotNone(procs[0].poll())
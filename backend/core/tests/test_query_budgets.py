@@ -0,0 +1,51 @@
+from django.test import TestCase, override_settings
+
+from core import catalog
+from core.models import MatchScore, Resume, User
+from core.testing import assert_query_budget, make_job
+from core.tokens import access_token_for
+
+@override_settings(CATALOG_REFRESH_INTERVAL=0)
+class QueryBudgetTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.jobs = [make_job(title=f"Python Developer {i}", location="San Francisco, CA") for i in range(5)]
+        catalog.job_changed()
+        cls.premium = User.objects.create(username="premium", email="premium@example.com", is_premium=True)
+        cls.free = User.objects.create(username="free", email="free@example.com")
+        for user in (cls.premium, cls.free):
+            Resume.objects.create(user=user, file="resumes/cv.pdf", file_format="pdf", text="python and django")
+        MatchScore.objects.bulk_create([MatchScore(user=cls.premium, job=job, score_percentage=50) for job in cls.jobs])
+
+    def clients(self):
+        yield "anonymous", self.client_class()
+        for user in (self.premium, self.free):
+            yield user.username, self.client_class(HTTP_AUTHORIZATION=f"Bearer {access_token_for(user.id)}")
+
+    def test_listing(self):
+        for who, client in self.clients():
+            for path in ("/api/jobs/", "/api/jobs/?keyword=python", "/api/jobs/?location=CA&sort=match",
+                         "/api/jobs/?fields=title,match_score"):
+                with self.subTest(who=who, path=path):
+                    self.assertEqual(assert_query_budget(client, path).status_code, 200)
+
+    def test_batch(self):
+        ids = ",".join(str(job.id) for job in self.jobs[:3])
+        for who, client in self.clients():
+            with self.subTest(who=who):
+                response = assert_query_budget(client, f"/api/jobs/batch/?ids={ids},0")
+                self.assertEqual([r["id"] for r in response.json()["results"]], [job.id for job in self.jobs[:3]])
+                self.assertEqual(response.json()["missing"], [0])
+
+    def test_detail(self):
+        for who, client in self.clients():
+            with self.subTest(who=who):
+                self.assertEqual(assert_query_budget(client, f"/api/jobs/{self.jobs[0].id}/").status_code, 200)
+
+    def test_sort_warning_at_top_level(self):
+        ids = ",".join(str(job.id) for job in self.jobs)
+        body = self.client.get(f"/api/jobs/batch/?ids={ids}&sort=match").json()
+        self.assertEqual(body["warning"], "Premium required for sort=match")
+        self.assertIsInstance(body["results"], list)
+        self.assertEqual(self.client.get("/api/jobs/?sort=match").json()["warning"], body["warning"])
@@ -0,0 +1,16 @@
+from django.test import SimpleTestCase
+
+from api.celery import BULK_QUEUE, INTERACTIVE_QUEUE, app
+
+class QueueRoutingTests(SimpleTestCase):
+    def route(self, name):
+        options = app.amqp.router.route({}, name)
+        return options["queue"].name, options.get("priority")
+
+    def test_interactive_work_jumps_the_bulk_queue(self):
+        for name in ("core.tasks.parse_resume_if_needed", "core.tasks.compute_match_scores_for_user"):
+            with self.subTest(name=name):
+                self.assertEqual(self.route(name), (INTERACTIVE_QUEUE, 0))
+        for name in ("core.tasks.compute_match_scores_for_job", "core.tasks.rebuild_facet_counts"):
+            with self.subTest(name=name):
+                self.assertEqual(self.route(name)[0], BULK_QUEUE)
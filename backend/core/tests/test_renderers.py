@@ -0,0 +1,27 @@
+from decimal import Decimal
+from unittest import skipUnless
+from django.test import SimpleTestCase
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from core import renderers
+
+@skipUnless(renderers.orjson, "orjson not installed")
+class RendererParityTests(SimpleTestCase):
+    def test_same_bytes_as_drf(self):
+        now = timezone.now().replace(microsecond=123456)
+        data = [
+            {"id": 1, "title": "Développeur \u2028 \u2029 ✓", "match_score": None, "locked": True,
+             "keywords": ["python", "c++"], "created_at": now, "naive": now.replace(tzinfo=None),
+             "salary": Decimal("12.50"), "ratio": 0.5, "nested": {"a": [1, 2, {"b": ""}]}},
+            {"warning": "Premium required for sort=match", "results": []},
+            [], {}, "plain", 0, None,
+        ]
+        for value in data:
+            with self.subTest(value=value):
+                self.assertEqual(renderers.ORJSONRenderer().render(value), JSONRenderer().render(value))
+
+    def test_indent_falls_back(self):
+        ctx = {"indent": 2}
+        self.assertEqual(renderers.ORJSONRenderer().render({"a": [1]}, renderer_context=ctx),
+                         JSONRenderer().render({"a": [1]}, renderer_context=ctx))
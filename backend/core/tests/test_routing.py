@@ -0,0 +1,52 @@
+from types import SimpleNamespace
+from django.core.cache import cache
+from django.db import router
+from django.test import SimpleTestCase, override_settings
+
+from core.models import JobListing
+from core.routing import STICKY_KEY, pin, primary, replica, replica_reads
+
+@override_settings(DATABASE_REPLICAS=["replica"], DB_REPLICA_STICKY_SECONDS=60)
+class ReplicaRouterTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(cache.delete_many, [STICKY_KEY.format(user_id) for user_id in range(1001, 1005)])
+
+    def test_reads_go_to_the_replica_only_in_a_read_scope(self):
+        self.assertEqual(JobListing.objects.all().db, "default")
+        with replica() as alias:
+            self.assertEqual(alias, "replica")
+            self.assertEqual(JobListing.objects.all().db, "replica")
+            with primary():
+                self.assertEqual(JobListing.objects.all().db, "default")
+        self.assertEqual(JobListing.objects.all().db, "default")
+
+    def test_writes_go_to_the_primary(self):
+        loaded = JobListing(pk=1)
+        loaded._state.db = "replica"  # as if read inside a replica scope
+        with replica():
+            self.assertEqual(router.db_for_write(JobListing), "default")
+            self.assertEqual(router.db_for_write(JobListing, instance=loaded), "default")
+        self.assertEqual(router.db_for_read(JobListing, instance=loaded), "default")
+
+    def test_pinned_user_reads_from_the_primary(self):
+        with replica(1001):
+            self.assertEqual(JobListing.objects.all().db, "replica")
+        pin(1001)
+        with replica(1001) as alias:
+            self.assertEqual(alias, "default")
+            self.assertEqual(JobListing.objects.all().db, "default")
+        with replica(1002):
+            self.assertEqual(JobListing.objects.all().db, "replica")  # other users are unaffected
+
+    def test_replica_reads_view(self):
+        view = replica_reads(lambda request: JobListing.objects.all().db)
+        user = SimpleNamespace(id=1003, is_authenticated=True)
+        self.assertEqual(view(SimpleNamespace(user=user)), "replica")
+        pin(1003)
+        self.assertEqual(view(SimpleNamespace(user=user)), "default")
+
+    @override_settings(DATABASE_REPLICAS=[])
+    def test_no_replicas_no_routing(self):
+        pin(1004)
+        with replica(1004) as alias:
+            self.assertEqual((alias, JobListing.objects.all().db), ("default", "default"))
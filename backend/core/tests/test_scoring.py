@@ -0,0 +1,58 @@
+import os
+import shutil
+import tempfile
+from unittest import mock
+from django.test import TestCase, override_settings
+
+from core import catalog, vocabulary
+from core.models import MatchScore, Resume, User
+from core.scoring import keyword_score_ids
+from core.testing import make_job
+from core.tokens import access_token_for
+
+RESUME_TEXT = "Python and JS"
+
+@override_settings(CATALOG_REFRESH_INTERVAL=0)
+class AliasScoringTests(TestCase):
+    """Every scoring path agrees with the stored scores, which match keywords by id (so by alias too)."""
+
+    @classmethod
+    def setUpTestData(cls):
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.job = make_job(title="Backend Engineer", keywords=["Python", "JavaScript", "Go"])
+            vocabulary.add_aliases("javascript", ["js"])
+        cls.user = User.objects.create(username="premium", email="premium@example.com", is_premium=True)
+        Resume.objects.create(user=cls.user, file="resumes/cv.pdf", file_format="pdf", text=RESUME_TEXT)
+        MatchScore.objects.all().delete()  # score on the fly
+
+        text = RESUME_TEXT.lower()
+        kids = vocabulary.job_terms([cls.job.id])[cls.job.id]
+        cls.expected = keyword_score_ids(text, cls.job.title, kids, vocabulary.Vocabulary.load(kids).present(text))
+
+    def setUp(self):
+        self.client = self.client_class(HTTP_AUTHORIZATION=f"Bearer {access_token_for(self.user.id)}")
+
+    def assertScored(self, item):
+        self.assertEqual(self.expected, 40)  # python and js (javascript) of 3 keywords + 2 title slots
+        self.assertEqual((item["match_score"], item["matched_keywords"]), (40, ["Python", "JavaScript"]))
+
+    def test_listing_from_the_snapshot(self):
+        self.assertScored(self.client.get("/api/jobs/").json()[0])
+
+    def test_listing_for_jobs_newer_than_the_snapshot(self):
+        with mock.patch("core.views.catalog.get_snapshot", return_value=catalog.CatalogSnapshot()):
+            self.assertScored(self.client.get("/api/jobs/?keyword=backend").json()[0])
+
+    def test_detail(self):
+        self.assertScored(self.client.get(f"/api/jobs/{self.job.id}/").json())
+
+    def test_snapshot_file(self):
+        tmp = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, tmp)
+        path = os.path.join(tmp, "catalog.bin")
+        catalog.write_snapshot_file(catalog.build_snapshot(), path)
+        snap = catalog.MappedCatalog(path)
+        present = snap.present_terms(RESUME_TEXT.lower(), [self.job.id])
+        self.assertEqual(snap.score(self.job.id, present), self.expected)
+        self.assertEqual([f for f in ("python", "javascript", "js", "go") if snap.has_term(f, present)],
+                         ["python", "javascript", "js"])
@@ -0,0 +1,42 @@
+from django.test import SimpleTestCase, TestCase, override_settings
+
+from core import suggest
+from core.testing import make_job
+
+class SuggestIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = suggest.SuggestIndex()
+        jobs = [("Python Developer", "Acme", "San Francisco, CA"), ("Senior Python Engineer", "Acme", "Remote"),
+                ("Data Engineer", "Pyramid Labs", "San Francisco, CA")]
+        for job_id, (title, company, location) in enumerate(jobs, 1):
+            self.index.add_job(job_id, title=title, company=company, location=location)
+
+    def test_matches_any_word_start_most_jobs_first(self):
+        self.assertEqual(self.index.suggest("fran", ("location",)),
+                         {"location": [{"value": "San Francisco, CA", "count": 2}]})
+        self.assertEqual(self.index.suggest("Py"),
+                         {"title": [{"value": "Senior Python Engineer", "count": 1},
+                                    {"value": "Python Developer", "count": 1}],
+                          "company": [{"value": "Pyramid Labs", "count": 1}], "location": []})
+        self.assertEqual(self.index.suggest("engineer", ("title",), limit=1)["title"],
+                         [{"value": "Senior Python Engineer", "count": 1}])
+
+    def test_empty_prefix_and_repeated_ids(self):
+        self.assertEqual(self.index.suggest("  "), {"title": [], "company": [], "location": []})
+        self.index.add_job(1, title="Python Developer", company="Acme", location="San Francisco, CA")
+        self.assertEqual(self.index.suggest("acme", ("company",))["company"], [{"value": "Acme", "count": 2}])
+
+@override_settings(CATALOG_REFRESH_INTERVAL=0)
+class SuggestEndpointTests(TestCase):
+    def test_follows_job_writes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            job = make_job(title="Kotlin Developer")
+        self.assertEqual(self.client.get("/api/jobs/suggest/?q=kot&field=title").json(),
+                         {"title": [{"value": "Kotlin Developer", "count": 1}]})
+        with self.captureOnCommitCallbacks(execute=True):
+            job.delete()
+        self.assertEqual(self.client.get("/api/jobs/suggest/?q=kot&field=title").json(), {"title": []})
+
+    def test_bad_parameters(self):
+        self.assertEqual(self.client.get("/api/jobs/suggest/?q=a&field=salary").status_code, 400)
+        self.assertEqual(self.client.get("/api/jobs/suggest/?q=a&limit=x").status_code, 400)
@@ -0,0 +1,21 @@
+from django.test import TestCase
+
+from core.models import MatchScore, User
+from core.tasks import _upsert_scores
+from core.testing import make_job
+
+class UpsertScoresTests(TestCase):
+    def test_idempotent_and_last_write_wins(self):
+        user = User.objects.create(username="u", email="u@example.com")
+        jobs = [make_job(), make_job(title="Data Engineer")]
+        MatchScore.objects.filter(user=user).delete()
+
+        def rows(score):
+            return [MatchScore(user_id=user.id, job_id=job.id, score_percentage=score) for job in reversed(jobs)]
+
+        _upsert_scores(rows(10))
+        _upsert_scores(rows(10))
+        self.assertEqual(MatchScore.objects.filter(user=user).count(), 2)
+        _upsert_scores(rows(70))
+        self.assertEqual(sorted(MatchScore.objects.filter(user=user).values_list("score_percentage", flat=True)),
+                         [70, 70])
@@ -0,0 +1,42 @@
+from unittest import mock
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+from core.models import User
+from core.tokens import PREMIUM_CLAIM, VERSION_KEY, access_token_for
+
+@override_settings(JWT_PREMIUM_CLAIMS=True)
+class TokenVersionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create(username="u", email="u@example.com")
+        cache.delete(VERSION_KEY.format(self.user.id))  # the cache outlives the rollback of an earlier test's user
+        self.token = access_token_for(self.user.id)
+
+    def get_status(self, token):
+        return self.client.get("/api/scores/status/", HTTP_AUTHORIZATION=f"Bearer {token}").status_code
+
+    def test_upgrade_makes_older_tokens_stale(self):
+        self.assertEqual(self.get_status(self.token), 200)
+        response = self.client.post("/api/upgrade/", HTTP_AUTHORIZATION=f"Bearer {self.token}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_status(self.token), 401)
+        fresh = response.json()["access"]
+        self.assertEqual(self.get_status(fresh), 200)
+        self.assertTrue(AccessToken(fresh)[PREMIUM_CLAIM])
+
+    def test_stripe_webhook_makes_older_tokens_stale(self):
+        event = {"type": "checkout.session.completed", "data": {"object": {"metadata": {"user_id": str(self.user.id)}}}}
+        with mock.patch("core.views.parse_webhook", return_value=event):
+            response = self.client.post("/api/billing/webhook/", b"{}", content_type="application/json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.get_status(self.token), 401)
+        self.assertTrue(User.objects.get(pk=self.user.pk).is_premium)
+        self.assertEqual(self.get_status(access_token_for(self.user.id)), 200)
+
+    def test_refresh_for_a_deleted_user(self):
+        refresh = str(RefreshToken.for_user(self.user))
+        self.user.delete()
+        for claims in (True, False):
+            with self.subTest(claims=claims), override_settings(JWT_PREMIUM_CLAIMS=claims):
+                self.assertEqual(self.client.post("/api/auth/refresh/", {"refresh": refresh}).status_code, 401)
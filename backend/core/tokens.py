@@ -0,0 +1,109 @@
+"""
+Premium status carried in JWT claims (JWT_PREMIUM_CLAIMS=1).
+
+Access tokens get `is_premium` and a token-version stamp `tv` at login and
+refresh, so authenticated requests no longer load the User row just to gate
+scores. Whenever premium status changes, bump_token_version() increments
+User.token_version; tokens stamped with an older version are rejected and
+the client refreshes to pick up the new claims. The current version is read
+from the shared cache, falling back to one indexed lookup on a miss.
+Changes made outside upgrade/stripe_webhook (e.g. in the admin) must call
+bump_token_version() too, or old claims stay valid until they expire.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db.models import F
+from django.utils.functional import cached_property
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.models import TokenUser
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .routing import pin
+
+User = get_user_model()
+
+PREMIUM_CLAIM = "is_premium"
+VERSION_CLAIM = "tv"
+VERSION_KEY = "jobhack:tv:{}"
+
+def claims_enabled() -> bool:
+    return getattr(settings, "JWT_PREMIUM_CLAIMS", False)
+
+def _stamp(token, user):
+    token[PREMIUM_CLAIM] = bool(user.is_premium)
+    token[VERSION_CLAIM] = user.token_version
+
+def current_token_version(user_id) -> int:
+    key = VERSION_KEY.format(user_id)
+    version = cache.get(key)
+    if version is None:
+        version = User.objects.filter(pk=user_id).values_list("token_version", flat=True).first()
+        if version is None:
+            return -1  # user gone: no version matches
+        cache.set(key, version, None)
+    return version
+
+def bump_token_version(user_id, **changes) -> int:
+    """Apply `changes` to the user and invalidate every token issued before them."""
+    User.objects.filter(pk=user_id).update(token_version=F("token_version") + 1, **changes)
+    cache.delete(VERSION_KEY.format(user_id))
+    pin(user_id)  # the new claims must not meet a replica that hasn't seen the change
+    return current_token_version(user_id)
+
+class ClaimsUser(TokenUser):
+    """Stateless request.user built from a claims-stamped access token."""
+
+    @cached_property
+    def is_premium(self) -> bool:
+        return bool(self.token.get(PREMIUM_CLAIM, False))
+
+class PremiumClaimsJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that trusts premium claims instead of loading the user when enabled."""
+
+    def get_user(self, validated_token):
+        if not (claims_enabled() and VERSION_CLAIM in validated_token):
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken("Token contained no recognizable user identification")
+        if validated_token[VERSION_CLAIM] != current_token_version(user_id):
+            raise InvalidToken("Token is stale, refresh it")
+        return ClaimsUser(validated_token)
+
+class PremiumTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        if claims_enabled():
+            _stamp(token, user)
+        return token
+
+class PremiumTokenRefreshSerializer(TokenRefreshSerializer):
+    def validate(self, attrs):
+        try:
+            return self._validate(attrs)
+        except User.DoesNotExist:  # deleted since the refresh token was issued: 401, not 500
+            raise InvalidToken("No active account found for the given token")
+
+    def _validate(self, attrs):
+        data = super().validate(attrs)
+        if claims_enabled():
+            # Re-stamp from the current row; the refresh token's claims may be stale
+            access = AccessToken(data["access"])
+            user = User.objects.only("is_premium", "token_version").get(pk=access[api_settings.USER_ID_CLAIM])
+            _stamp(access, user)
+            data["access"] = str(access)
+        return data
+
+def access_token_for(user_id) -> str:
+    """Fresh claims-stamped access token, handed back right after a premium change."""
+    user = User.objects.get(pk=user_id)
+    token = AccessToken.for_user(user)
+    if claims_enabled():
+        _stamp(token, user)
+    return str(token)
@@ -1,23 +1,28 @@
-import os, mimetypes
-from django.contrib.auth import get_user_model
+import hmac, os, mimetypes
 from django.db.models import Q
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
 from rest_framework import status
+from rest_framework.exceptions import ValidationError
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
+from django.http import HttpResponse, JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 from django.conf import settings
 
-from .models import Resume, JobListing
+from . import ats, catalog, events, facets, parsing, suggest, vocabulary
+from .dbstats import connection_stats
+from .locations import location_filter
+from .routing import pin, replica_reads
+from .tokens import bump_token_version, access_token_for
+from .instrumentation import query_budget, metrics_text
+from .models import Resume, JobListing, MatchScore
 from .serializers import RegisterSerializer, JobListingSerializer, ResumeSerializer
 from .permissions import IsPremium
-from .scoring import extract_text_from_upload, ats_friendly_heuristics, keyword_score
+from .scoring import keyword_score_forms
 from .tasks import compute_match_scores_for_user
 from .billing import create_checkout_session, parse_webhook
 
-User = get_user_model()
-
 def _apply_visibility_gate(request, item_or_dict):
     """
     Mutates item_or_dict (dict) to enforce premium visibility:
@@ -46,11 +51,39 @@ def _apply_visibility_gate(request, item_or_dict):
     # Also hide detailed matches
     item_or_dict["matched_keywords"] = []
 
+@query_budget(0)
 @api_view(["GET"])
 @permission_classes([AllowAny])
 def health(_):
     return Response({"ok": True, "status": "healthy"})
 
+def _ops_allowed(request) -> bool:
+    """Operator endpoints need "Authorization: Bearer <METRICS_TOKEN>"; with no token set, only DEBUG allows them."""
+    token = getattr(settings, "METRICS_TOKEN", "")
+    if not token:
+        return settings.DEBUG
+    return hmac.compare_digest(request.headers.get("Authorization", ""), f"Bearer {token}")
+
+@query_budget(0)
+def db_health(request):
+    """Connection pool / persistent-connection stats for this process; gated like metrics."""
+    if not _ops_allowed(request):
+        return HttpResponse(status=401)
+    return JsonResponse({"ok": True, "databases": [connection_stats(alias) for alias in settings.DATABASES]})
+
+def metrics(request):
+    """Prometheus scrape endpoint: per-endpoint/per-task SQL and timing totals plus pool and parser gauges."""
+    if not _ops_allowed(request):
+        return HttpResponse(status=401)
+    gauges = {}
+    for stats in (connection_stats(alias) for alias in settings.DATABASES):
+        if stats["mode"] != "pool":
+            continue
+        for key in ("pool_size", "pool_available", "requests_waiting", "requests_wait_ms"):
+            gauges.setdefault(f"jobhack_db_{key}", []).append(({"alias": stats["alias"]}, stats[key]))
+    gauges.update(parsing.metric_gauges())
+    return HttpResponse(metrics_text(gauges), content_type="text/plain; version=0.0.4")
+
 @api_view(["POST"])
 @permission_classes([AllowAny])
 def register(request):
@@ -63,10 +96,8 @@ def register(request):
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
 def upgrade(request):
-    user = request.user
-    user.is_premium = True
-    user.save(update_fields=["is_premium"])
-    return Response({"is_premium": True})
+    bump_token_version(request.user.id, is_premium=True)
+    return Response({"is_premium": True, "access": access_token_for(request.user.id)})
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
@@ -82,7 +113,8 @@ def resume_upload(request):
         elif name.endswith(".docx"): file_format = "docx"
         else: file_format = "bin"
 
-    res = Resume.objects.create(user=request.user, file=f, file_format=file_format)
+    res = Resume.objects.create(user_id=request.user.id, file=f, file_format=file_format)
+    pin(request.user.id)
     # Local temp path (works for S3 too via storage's path or temporary file)
     path = res.file.path if hasattr(res.file, "path") else None
     if not path:
@@ -92,33 +124,73 @@ def resume_upload(request):
         tmp.write(res.file.read()); tmp.close()
         path = tmp.name
 
-    text = extract_text_from_upload(path, file_format)
-    ok, issues = ats_friendly_heuristics(text, file_format)
+    parsed = parsing.parse(path, file_format)
+    text = parsed.text
+    report = ats.analyze(text, file_format, parsed.pages, parsed.issue)
 
     res.text = text[:200000]  # avoid extreme size
     res.save(update_fields=["text"])
 
-    # Queue background task to compute match scores
+    # Queue background task to compute match scores; clients follow it on
+    # /api/events/scores/ (or /api/scores/status/) instead of polling the listing
+    events.publish(request.user.id, {"type": "queued"})
     compute_match_scores_for_user.delay(request.user.id)
 
     return Response({
         "resume_id": res.id,
-        "ats_friendly": ok,
-        "issues": issues,
+        "ats_friendly": report.ok,
+        "issues": report.issues,
+        "checks": [c.as_dict() for c in report.checks],
         "chars": len(text),
     }, status=201)
 
-@api_view(["GET"])
-@permission_classes([AllowAny])  # listing visible to all; scores depend on auth/premium
-def jobs_list(request):
-    from .models import Resume, JobListing
-    from .serializers import JobListingSerializer
-    from .scoring import keyword_score
+LISTING_LIMIT = 200
 
-    qs = JobListing.objects.all().order_by("-created_at")
+# Keys a client can ask for with ?fields=a,b (id is always sent)
+JOB_FIELDS = JobListingSerializer.Meta.fields + ("matched_keywords", "score_hint", "locked")
+SCORE_FIELDS = {"match_score", "matched_keywords", "score_hint", "locked"}
+JOB_COLUMNS = {f.name for f in JobListing._meta.concrete_fields}
+
+class Projection:
+    """What a ?fields= request needs: output keys, columns to load, whether to score."""
+
+    def __init__(self, params):
+        raw = params.get("fields")
+        self.fields = None
+        if raw:
+            self.fields = {f.strip() for f in raw.split(",") if f.strip()} | {"id"}
+            unknown = self.fields - set(JOB_FIELDS)
+            if unknown:
+                raise ValidationError({"fields": [f"Unknown field(s): {', '.join(sorted(unknown))}"]})
+        self.scoring = self.fields is None or bool(self.fields & SCORE_FIELDS) or params.get("sort") == "match"
+
+    def jobs(self):
+        """JobListing queryset loading only the needed columns (scoring reads title/keywords)."""
+        if self.fields is None:
+            return JobListing.objects.active()
+        columns = self.fields & JOB_COLUMNS
+        if self.scoring:
+            columns |= {"title", "keywords"}
+        return JobListing.objects.active().only(*columns)
+
+    def trim(self, data: dict) -> dict:
+        return data if self.fields is None else {k: v for k, v in data.items() if k in self.fields}
+
+def _resolve_skill(params):
+    """(canonical ?skill=, its Keyword id or None); reads the alias map, so async callers wrap it in sync_to_async."""
+    skill = vocabulary.canonical(params.get("skill"))
+    return skill, vocabulary.alias_map().get(skill) if skill else None
+
+def _listing_queryset(params, projection: Projection, skill=None):
+    """
+    Newest-first jobs matching the keyword/location/skill filters; also says
+    whether any filter applied. `skill` is a _resolve_skill result, resolved
+    here when not given.
+    """
+    qs = projection.jobs().order_by("-created_at")
 
-    keyword = request.GET.get("keyword")
-    location = request.GET.get("location")
+    keyword = params.get("keyword")
+    location = params.get("location")
     if keyword:
         qs = qs.filter(
             Q(title__icontains=keyword) |
@@ -126,68 +198,210 @@ def jobs_list(request):
             Q(description__icontains=keyword)
         )
     if location:
-        qs = qs.filter(location__icontains=location)
+        qs = qs.filter(location_filter(location))
+    skill, kid = skill or _resolve_skill(params)
+    if skill:
+        qs = qs.filter(terms=kid) if kid else qs.filter(terms__name=skill)
+    return qs, bool(keyword or location or skill)
 
-    items = []
+def _wants_stored_scores(user) -> bool:
+    return bool(user and (user.is_premium or getattr(settings, "SHOW_MATCH_TO_FREE", False)))
+
+def _score_queries(user, page, projection: Projection):
+    """
+    Unevaluated queries behind a page's scores: (stored MatchScore rows, latest
+    resume), either None when not needed. Sync and async views evaluate them
+    their own way and hand the stored scores to _fallback_resume.
+    """
+    if not (projection.scoring and user):
+        return None, None
+    stored = None
+    if _wants_stored_scores(user):
+        stored = (MatchScore.objects.filter(user_id=user.id, job_id__in=[job.id for job in page])
+                  .values_list("job_id", "score_percentage"))
+    return stored, Resume.objects.filter(user_id=user.id).order_by("-uploaded_at")
+
+def _fallback_resume(resume_query, stored: dict):
+    """The latest-resume query if the page must be scored on the fly (no stored scores), else None."""
+    return None if stored else resume_query
+
+def _page_scores(request, page, projection: Projection):
+    """(stored scores by job id, latest resume for the fallback) for a page of jobs: at most two queries."""
     user = request.user if request.user.is_authenticated else None
+    stored_query, resume_query = _score_queries(user, page, projection)
+    stored = dict(stored_query) if stored_query is not None else {}
+    resume_query = _fallback_resume(resume_query, stored)
+    return stored, resume_query.first() if resume_query is not None else None
 
-    if user and (user.is_premium or getattr(settings, "SHOW_MATCH_TO_FREE", False)):
-        # Prefetch stored scores in a single query
-        from .models import MatchScore
-        ms = MatchScore.objects.filter(user=user, job_id__in=qs.values_list("id", flat=True))
-        stored = {m.job_id: m.score_percentage for m in ms}
-    else:
-        stored = {}
+def _scored_off_snapshot(page, snap, latest_resume) -> bool:
+    """Whether _listing_body scores a job from its display keywords, and so needs vocabulary.alias_forms()."""
+    return bool(latest_resume) and any(job.id not in snap for job in page)
+
+def _fresh_match(job, resume_text: str, groups):
+    """(score, matched keywords) from a job's display keywords, alias-aware like the stored scores."""
+    keywords = job.keywords or []
+    score = keyword_score_forms(resume_text, job.title, vocabulary.keyword_forms(keywords, groups))
+    return score, [k for k in keywords if any(f in resume_text for f in vocabulary.forms_of(k, groups))]
 
-    latest_resume = None
+def _listing_body(request, page, stored, latest_resume, snap, projection: Projection, groups):
+    """
+    Serialize a page of jobs with scores: stored MatchScores first, else the
+    latest resume scored against the catalog snapshot (or, for jobs newer than
+    it, against `groups`, the vocabulary.alias_forms()). No database access, so
+    sync and async views share it. Returns (items, warning); warning is "" unless
+    the requested sort was refused.
+    """
+    user = request.user if request.user.is_authenticated else None
     resume_text = ""
-    if user and not stored:  # fallback compute if no precomputed
-        latest_resume = Resume.objects.filter(user=user).order_by("-uploaded_at").first()
-        if latest_resume:
-            resume_text = (latest_resume.text or "").lower()
+    present = set()
+    if latest_resume:
+        resume_text = (latest_resume.text or "").lower()
+        # text goes from "" to parsed once, so length tells the two apart
+        present = snap.present_terms(resume_text, [job.id for job in page],
+                                     key=(latest_resume.id, len(resume_text)))
 
-    for job in qs[:200]:
+    items = []
+    for job in page:
+        in_snapshot = job.id in snap
+        fresh = _fresh_match(job, resume_text, groups) if latest_resume and not in_snapshot else None
         match_score = stored.get(job.id)
         if match_score is None and latest_resume:
-            match_score = keyword_score(resume_text, job.title, job.keywords or [])
-        data = JobListingSerializer(job).data
+            match_score = snap.score(job.id, present) if in_snapshot else fresh[0]
+        data = JobListingSerializer(job, fields=projection.fields).data
         data["match_score"] = match_score
         data["matched_keywords"] = []
         if match_score is not None and resume_text:
-            data["matched_keywords"] = [k for k in (job.keywords or []) if k.lower() in resume_text]
+            if in_snapshot:
+                data["matched_keywords"] = [k for k in (job.keywords or [])
+                                            if snap.has_term(vocabulary.canonical(k), present)]
+            else:
+                data["matched_keywords"] = fresh[1]
         _apply_visibility_gate(request, data)
         items.append(data)
 
     sort = request.GET.get("sort")
     if sort == "match":
         if not (user and user.is_premium):
-            return Response({"warning": "Premium required for sort=match", "results": items})
+            return [projection.trim(d) for d in items], "Premium required for sort=match"
         items.sort(key=lambda x: (x.get("match_score") or 0), reverse=True)
+    return [projection.trim(d) for d in items], ""
 
-    return Response(items)
+def _listing_response(items, warning):
+    """The listing's body: the bare list, or {"warning", "results"} when a warning applies."""
+    return {"warning": warning, "results": items} if warning else items
 
+def _detail_body(request, job, resume, projection: Projection, groups):
+    data = JobListingSerializer(job, fields=projection.fields).data
+    if resume:
+        data["match_score"], data["matched_keywords"] = _fresh_match(job, (resume.text or "").lower(), groups)
+    _apply_visibility_gate(request, data)
+    return projection.trim(data)
+
+@query_budget(5)
+@api_view(["GET"])
+@permission_classes([AllowAny])  # listing visible to all; scores depend on auth/premium
+@replica_reads
+def jobs_list(request):
+    projection = Projection(request.GET)
+    qs, filtered = _listing_queryset(request.GET, projection)
+    snap = catalog.get_snapshot()
+    if filtered:
+        page = list(qs[:LISTING_LIMIT])
+    else:
+        # Default listing: take the newest ids from the in-process snapshot
+        # and fetch just those rows by primary key.
+        ids = snap.newest(LISTING_LIMIT)
+        by_id = projection.jobs().in_bulk(ids)
+        page = [by_id[i] for i in ids if i in by_id]
+
+    stored, latest_resume = _page_scores(request, page, projection)
+    groups = vocabulary.alias_forms() if _scored_off_snapshot(page, snap, latest_resume) else {}
+    return Response(_listing_response(*_listing_body(request, page, stored, latest_resume, snap, projection, groups)))
+
+BATCH_LIMIT = 50
+
+@query_budget(4)
 @api_view(["GET"])
 @permission_classes([AllowAny])
-def job_detail(request, pk: int):
-    from .models import Resume, JobListing
-    from .serializers import JobListingSerializer
-    from .scoring import keyword_score
+@replica_reads
+def jobs_batch(request):
+    """Several jobs by id (?ids=3,1,2) in one request, in the order asked; scored like the listing."""
+    try:
+        ids = list(dict.fromkeys(int(i) for i in request.GET.get("ids", "").split(",") if i.strip()))
+    except ValueError:
+        raise ValidationError({"ids": ["Expected comma-separated job ids."]})
+    if not ids:
+        raise ValidationError({"ids": ["This parameter is required."]})
+    if len(ids) > BATCH_LIMIT:
+        raise ValidationError({"ids": [f"At most {BATCH_LIMIT} ids per request."]})
+
+    projection = Projection(request.GET)
+    snap = catalog.get_snapshot()
+    by_id = projection.jobs().in_bulk(ids)
+    page = [by_id[i] for i in ids if i in by_id]
+    stored, latest_resume = _page_scores(request, page, projection)
+    groups = vocabulary.alias_forms() if _scored_off_snapshot(page, snap, latest_resume) else {}
+    items, warning = _listing_body(request, page, stored, latest_resume, snap, projection, groups)
+    body = {"results": items, "missing": [i for i in ids if i not in by_id]}
+    if warning:
+        body["warning"] = warning
+    return Response(body)
 
+@query_budget(3)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+@replica_reads
+def jobs_facets(request):
+    """Counts per location/company/keyword for the listing's keyword/location/skill filters."""
     try:
-        job = JobListing.objects.get(pk=pk)
+        limit = max(1, min(50, int(request.GET.get("limit", 10))))
+    except ValueError:
+        raise ValidationError({"limit": ["Expected an integer."]})
+    qs, filtered = _listing_queryset(request.GET, Projection({}))
+    if not filtered:
+        return Response({**facets.top(limit), "approximate": False})
+    return Response(facets.count_matching(qs, limit))
+
+SUGGEST_LIMIT = 20
+
+@query_budget(1)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+def job_suggest(request):
+    """Titles/companies/locations with a word starting with ?q=, most jobs first (?field=, ?limit=)."""
+    field = request.GET.get("field")
+    if field and field not in suggest.FIELDS:
+        raise ValidationError({"field": [f"Expected one of: {', '.join(suggest.FIELDS)}."]})
+    try:
+        limit = max(1, min(SUGGEST_LIMIT, int(request.GET.get("limit", 10))))
+    except ValueError:
+        raise ValidationError({"limit": ["Expected an integer."]})
+    fields = (field,) if field else suggest.FIELDS
+    return Response(suggest.get_index().suggest(request.GET.get("q", ""), fields, limit))
+
+@query_budget(3)
+@api_view(["GET"])
+@permission_classes([AllowAny])
+@replica_reads
+def job_detail(request, pk: int):
+    projection = Projection(request.GET)
+    try:
+        job = projection.jobs().get(pk=pk)
     except JobListing.DoesNotExist:
         return Response({"detail": "Not found"}, status=404)
 
-    data = JobListingSerializer(job).data
-    if request.user.is_authenticated:
-        resume = Resume.objects.filter(user=request.user).order_by("-uploaded_at").first()
-        if resume:
-            rt = (resume.text or "").lower()
-            data["match_score"] = keyword_score(rt, job.title, job.keywords or [])
-            data["matched_keywords"] = [k for k in (job.keywords or []) if k.lower() in rt]
-    
-    _apply_visibility_gate(request, data)
-    return Response(data)
+    resume = None
+    if request.user.is_authenticated and projection.scoring:
+        resume = Resume.objects.filter(user_id=request.user.id).order_by("-uploaded_at").first()
+    groups = vocabulary.alias_forms() if resume else {}
+    return Response(_detail_body(request, job, resume, projection, groups))
+
+@query_budget(1)
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def score_status(request):
+    """Latest score-recompute event for the caller; the polling fallback for the SSE stream."""
+    return Response(events.current_status(request.user.id) or {"type": "idle"})
 
 @api_view(["POST"])
 @permission_classes([IsAuthenticated])
@@ -213,5 +427,5 @@ def stripe_webhook(request):
         data = event["data"]["object"]
         user_id = int(data.get("metadata", {}).get("user_id", "0") or "0")
         if user_id:
-            User.objects.filter(id=user_id).update(is_premium=True)
+            bump_token_version(user_id, is_premium=True)
     return Response({"ok": True})
@@ -0,0 +1,118 @@
+"""
+Keyword vocabulary: one Keyword row per canonical skill ("python", "react"),
+with optional aliases ("js" for "javascript"), and a job <-> keyword relation
+(JobListing.terms) filled at ingestion.
+
+JobListing.keywords stays as the display list in the order the job gave it;
+scoring and "jobs with keyword X" work on Keyword ids: a resume is scanned
+once per vocabulary form instead of once per job keyword, and the relation's
+keyword_id index answers ?skill= without touching the JSON column.
+"""
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from django.core.cache import cache
+
+from . import catalog
+from .models import JobListing, Keyword
+
+NAME_MAX = Keyword._meta.get_field("name").max_length
+Link = JobListing.terms.through
+ALIASES_KEY = "jobhack:keywords:aliases"
+FORMS_KEY = "jobhack:keywords:forms"
+
+def canonical(term) -> str:
+    return " ".join(str(term or "").lower().split())[:NAME_MAX]
+
+def alias_map() -> Dict[str, int]:
+    """Alias -> Keyword id; cached until add_aliases() changes it."""
+    aliases = cache.get(ALIASES_KEY)
+    if aliases is None:
+        aliases = {canonical(a): kid for kid, names in Keyword.objects.exclude(aliases=[]).values_list("id", "aliases")
+                   for a in names}
+        cache.set(ALIASES_KEY, aliases, None)
+    return aliases
+
+def alias_forms() -> Dict[str, Tuple[str, ...]]:
+    """Each form of a keyword that has aliases -> all its forms, name first; cached like alias_map()."""
+    groups = cache.get(FORMS_KEY)
+    if groups is None:
+        groups = {}
+        for name, aliases in Keyword.objects.exclude(aliases=[]).values_list("name", "aliases"):
+            forms = (name, *dict.fromkeys(canonical(a) for a in aliases))
+            groups.update(dict.fromkeys(forms, forms))
+        cache.set(FORMS_KEY, groups, None)
+    return groups
+
+def keyword_forms(keywords: Iterable[str], groups: Dict[str, Tuple[str, ...]]) -> List[Tuple[str, ...]]:
+    """
+    The forms of each Keyword a job's display keywords resolve to, once per
+    keyword, without a query: `groups` is alias_forms(). For jobs whose links
+    may not be loaded yet (e.g. newer than the catalog snapshot).
+    """
+    return list(dict.fromkeys(forms_of(k, groups) for k in keywords if canonical(k)))
+
+def forms_of(keyword: str, groups: Dict[str, Tuple[str, ...]]) -> Tuple[str, ...]:
+    form = canonical(keyword)
+    return groups.get(form, (form,))
+
+def resolve(terms: Iterable[str], create: bool = True) -> Dict[str, int]:
+    """Canonical form -> Keyword id for `terms`, matching aliases and creating unknown keywords."""
+    forms = {canonical(t) for t in terms} - {""}
+    if not forms:
+        return {}
+    aliases = alias_map()
+    ids = {f: aliases[f] for f in forms if f in aliases}
+    names = forms - set(ids)
+    if create and names:
+        Keyword.objects.bulk_create([Keyword(name=n) for n in names], ignore_conflicts=True)
+    ids.update(Keyword.objects.filter(name__in=names).values_list("name", "id"))
+    return ids
+
+def link_jobs(jobs: Iterable[JobListing]):
+    """Point each job's terms at its keywords (replaces existing links); bulk_create callers use this."""
+    jobs = list(jobs)
+    ids = resolve(k for job in jobs for k in job.keywords or [])
+    Link.objects.filter(joblisting_id__in=[job.id for job in jobs]).delete()
+    Link.objects.bulk_create([
+        Link(joblisting_id=job.id, keyword_id=kid)
+        for job in jobs
+        for kid in {ids[f] for f in map(canonical, job.keywords or []) if f in ids}
+    ], ignore_conflicts=True)
+
+def job_terms(job_ids: Iterable[int]) -> Dict[int, List[int]]:
+    """Keyword ids per job id, one query."""
+    out: Dict[int, List[int]] = {}
+    for job_id, kid in Link.objects.filter(joblisting_id__in=list(job_ids)).values_list("joblisting_id", "keyword_id"):
+        out.setdefault(job_id, []).append(kid)
+    return out
+
+class Vocabulary:
+    """Keyword id -> the forms that count as a mention of it (canonical name plus aliases)."""
+
+    def __init__(self, forms: Dict[int, Tuple[str, ...]]):
+        self.forms = forms
+
+    @classmethod
+    def load(cls, ids: Optional[Iterable[int]] = None) -> "Vocabulary":
+        qs = Keyword.objects.all() if ids is None else Keyword.objects.filter(id__in=list(ids))
+        return cls({kid: (name, *(canonical(a) for a in aliases))
+                    for kid, name, aliases in qs.values_list("id", "name", "aliases")})
+
+    def present(self, resume_text: str) -> Set[int]:
+        """Ids of keywords the (lowercased) resume text mentions."""
+        return {kid for kid, forms in self.forms.items() if any(f in resume_text for f in forms)}
+
+def add_aliases(name: str, aliases: Iterable[str]) -> Keyword:
+    """Make `aliases` spellings of `name`, folding any keywords already stored under them into it."""
+    keyword, _ = Keyword.objects.get_or_create(name=canonical(name))
+    forms = {canonical(a) for a in aliases} - {"", keyword.name}
+    keyword.aliases = sorted(set(keyword.aliases) | forms)
+    keyword.save(update_fields=["aliases"])
+    dupes = Keyword.objects.filter(name__in=forms)
+    Link.objects.bulk_create([
+        Link(joblisting_id=job_id, keyword_id=keyword.id)
+        for job_id in Link.objects.filter(keyword__in=dupes).values_list("joblisting_id", flat=True)
+    ], ignore_conflicts=True)
+    dupes.delete()
+    cache.delete_many([ALIASES_KEY, FORMS_KEY])
+    catalog.job_changed()  # snapshots hold each keyword's forms
+    return keyword
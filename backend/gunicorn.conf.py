@@ -0,0 +1,19 @@
+# Read automatically by gunicorn when started from backend/; CLI flags still win.
+import os
+
+if os.getenv("ASGI", "0") == "1":
+    # Event-loop workers: one process multiplexes many concurrent requests
+    worker_class = "uvicorn_worker.UvicornWorker"
+    wsgi_app = "api.asgi:application"
+else:
+    wsgi_app = "api.wsgi:application"
+
+
+def post_worker_init(worker):
+    """Load the in-process job catalog and suggestion index before the worker takes traffic."""
+    from core import catalog, suggest
+    try:
+        catalog.get_snapshot()
+        suggest.get_index()
+    except Exception as e:  # DB not ready yet; first request loads it instead
+        worker.log.warning("catalog warm-up skipped: %s", e)